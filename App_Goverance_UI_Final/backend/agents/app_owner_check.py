@@ -3,6 +3,7 @@ from backend.models.ticket_context import TicketResponse
 from langchain.agents import create_agent
 from langchain_core.tools import Tool
 from langchain_core.messages import ToolMessage
+from backend.core.policy import DEFAULT_POLICIES, PolicyEngine
 
 # ✅ Tool function: check if app owner belongs to our space
 def check_owner_space(tickets, allowed_spaces: list[str]) -> TicketResponse:
@@ -28,8 +29,15 @@ def check_owner_space(tickets, allowed_spaces: list[str]) -> TicketResponse:
     return TicketResponse(tickets=valid_tickets).json()
 
 class AppOwnerCheckerAgent:
-    def __init__(self, llm=None, allowed_spaces=None):
+    def __init__(self, llm=None, allowed_spaces=None, policies: PolicyEngine = None):
         self.llm = llm
+        if allowed_spaces is not None:
+            # Explicit spaces override the configured allowed-space rule
+            rules = [r for r in DEFAULT_POLICIES["owner_space"]["rules"] if r["name"] != "allowed-space"]
+            rules.insert(0, {"name": "allowed-space", "field": "application_owner", "in": list(allowed_spaces)})
+            policies = PolicyEngine({"owner_space": {"rules": rules}})
+        # Selection rules ("owner_space" policy), shared with the orchestrator for hot reload
+        self.policies = policies or PolicyEngine()
         self.allowed_spaces = allowed_spaces or ["IAM-Space", "Security-Space"]
 
         # ✅ Register tool
@@ -53,22 +61,10 @@ class AppOwnerCheckerAgent:
         )
 
     def invoke(self, tickets: TicketResponse) -> TicketResponse:
-        """Filter tickets by owner space using deterministic logic."""
-        try:
-            # Direct python logic
-            valid_tickets = []
-            for t in tickets.tickets:
-                # Accept if matches allowed spaces OR is a valid demo email
-                is_allowed_space = t.application_owner in self.allowed_spaces
-                is_demo_email = t.application_owner and "@example.com" in t.application_owner
-                
-                if t.application_owner and (is_allowed_space or is_demo_email):
-                    print(f"DEBUG: AppOwnerCheck ACCEPT {t.ticket_id} (Owner: {t.application_owner})")
-                    valid_tickets.append(t)
-                else:
-                    print(f"DEBUG: AppOwnerCheck REJECT {t.ticket_id} (Owner: {t.application_owner})")
-            return TicketResponse(tickets=valid_tickets)
+        """Filter tickets by owner space using deterministic logic.
 
-        except Exception as e:
-            print(f"Error checking owner space: {e}")
-            return TicketResponse(tickets=[])
+        Errors propagate so the stage is retried rather than every ticket failing verification.
+        """
+        # Compiled "owner_space" policy: allowed spaces OR demo email, evaluated per batch
+        valid_tickets = self.policies.get("owner_space").select(tickets.tickets)
+        return TicketResponse(tickets=valid_tickets)
@@ -40,13 +40,40 @@ def enrich_tickets_with_apphq(data_file: str, tickets) -> TicketResponse:
 
     return TicketResponse(tickets=enriched_tickets).json()
 
+def apphq_change_token(data_file: str) -> str:
+    """Cheap token that changes whenever the AppHQ file changes."""
+    stat = os.stat(data_file)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+def load_apphq_index(data_file: str) -> dict:
+    """Load AppHQ records keyed by AIT number."""
+    with open(data_file, "r") as f:
+        return {rec["ait_number"]: rec for rec in json.load(f) if rec.get("ait_number")}
+
+def diff_apphq_index(old: dict, new: dict):
+    """Keyed diff between two AppHQ indexes.
+
+    Returns:
+        tuple: (inserted or updated records by AIT, deleted AIT numbers)
+    """
+    upserts = {ait: rec for ait, rec in new.items() if old.get(ait) != rec}
+    deletes = [ait for ait in old if ait not in new]
+    return upserts, deletes
+
 class AppHQResolverAgent:
-    def __init__(self, llm=None, data_file=None):
+    def __init__(self, llm=None, data_file=None, client=None):
         self.llm = llm
         from pathlib import Path
         self.data_file = data_file or str(
             Path(__file__).parent.parent.parent / "data" / "apphq_data.json"
         )
+        self.index = None
+        self.index_token = None
+        # With hot reload the index only changes through swap_index, so it
+        # stays the snapshot the watcher last applied to enriched tickets
+        self.hot_reload = False
+        # Remote AppHQ (core.apphq_client.AppHQLookup); None reads data_file
+        self.client = client
 
         # ✅ Register tool
         tools = [
@@ -67,28 +94,63 @@ class AppHQResolverAgent:
             system_prompt="Enrich tickets with AppHQ ownership details."
         )
 
+    def get_index(self) -> dict:
+        """AppHQ index keyed by AIT number, reloaded if the file changed (unless hot reload owns it)."""
+        if self.hot_reload and self.index is not None:
+            return self.index
+        token = apphq_change_token(self.data_file)
+        if self.index is None or token != self.index_token:
+            self.index = load_apphq_index(self.data_file)
+            self.index_token = token
+        return self.index
+
+    def records(self, ait_numbers) -> dict:
+        """AppHQ records by AIT number (None for unknown AITs), from the service or the local file."""
+        if self.client is not None:
+            return self.client.lookup_sync(ait_numbers)
+        index = self.get_index()
+        return {ait: index.get(ait) for ait in ait_numbers}
+
+    def enable_hot_reload(self):
+        """Load the index now and from then on change it only through swap_index."""
+        self.get_index()
+        self.hot_reload = True
+
+    def diff_index(self):
+        """Parse the AppHQ file and diff it against the last applied index (no swap).
+
+        Returns:
+            tuple: (new index, upserted records by AIT, deleted AITs, change token)
+        """
+        token = apphq_change_token(self.data_file)
+        new_index = load_apphq_index(self.data_file)
+        upserts, deletes = diff_apphq_index(self.index or {}, new_index)
+        return new_index, upserts, deletes, token
+
+    def swap_index(self, index: dict, token: str):
+        """Atomically replace the live index (single reference assignment)."""
+        self.index, self.index_token = index, token
+
     def invoke(self, tickets: TicketResponse) -> TicketResponse:
-        """Enrich tickets using deterministic logic."""
-        try:
-            # Direct python logic
-            with open(self.data_file, "r") as f:
-                sample_data = json.load(f)
-
-            enriched_tickets = []
-            for t in tickets.tickets:
-                if t.ait_number:
-                    # find matching record
-                    details = next((rec for rec in sample_data if rec["ait_number"] == t.ait_number), None)
-                    if details:
-                        # enrich ticket fields
-                        t.application_name = details.get("application_name")
-                        t.application_owner = details.get("application_owner")
-                        t.lob_owner = details.get("lob_owner")
-                        t.ait_owner = details.get("ait_owner")
-                        t.contacts = details.get("contacts", [])
-                        enriched_tickets.append(t)
-            return TicketResponse(tickets=enriched_tickets)
+        """Enrich tickets using deterministic logic.
 
-        except Exception as e:
-            print(f"Error enriching tickets: {e}")
-            return TicketResponse(tickets=[])
+        Errors (including AppHQError when the AppHQ service is unavailable)
+        propagate so the stage is retried rather than every ticket dropped.
+        """
+        # Direct python logic (one batched lookup for the whole batch)
+        records = self.records({t.ait_number for t in tickets.tickets if t.ait_number})
+
+        enriched_tickets = []
+        for t in tickets.tickets:
+            if t.ait_number:
+                # find matching record
+                details = records.get(t.ait_number)
+                if details:
+                    # enrich ticket fields
+                    t.application_name = details.get("application_name")
+                    t.application_owner = details.get("application_owner")
+                    t.lob_owner = details.get("lob_owner")
+                    t.ait_owner = details.get("ait_owner")
+                    t.contacts = details.get("contacts", [])
+                    enriched_tickets.append(t)
+        return TicketResponse(tickets=enriched_tickets)
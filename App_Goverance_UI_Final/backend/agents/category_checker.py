@@ -2,6 +2,7 @@ from backend.models.ticket_context import TicketResponse, Ticket
 from langchain.agents import create_agent
 from langchain_core.tools import Tool
 from langchain_core.messages import ToolMessage
+from backend.core.policy import PolicyEngine
 
 def filter_iam_tickets(tickets) -> TicketResponse:        
     """Tool function to filter IAM tickets and mark deliverableType."""
@@ -37,7 +38,10 @@ def filter_iam_tickets(tickets) -> TicketResponse:
     return TicketResponse(tickets=iam_tickets).json()
 
 class CategoryCheckerAgent:
-    def __init__(self, llm):
+    def __init__(self, llm, policies: PolicyEngine = None):
+        # Selection rules ("category" policy), shared with the orchestrator for hot reload
+        self.policies = policies or PolicyEngine()
+
         # Register the IAM filter tool
         tools = [
             Tool(
@@ -56,22 +60,14 @@ class CategoryCheckerAgent:
         )
 
     def invoke(self, tickets: TicketResponse) -> TicketResponse:
-        """Filter tickets using deterministic logic for reliability."""
+        """Filter tickets using deterministic logic for reliability.
+
+        Errors propagate so the stage is retried (and dead-lettered) rather
+        than every ticket being treated as non-IAM.
+        """
         print(f"DEBUG_AGENT: CategoryChecker invoked with {len(tickets.tickets)} tickets")
-        # Direct call to tool function logic
-        try:
-            # Re-use the filtering logic (extracted from tool) or call tool directly
-            # Since tool logic is simple, implement here:
-            iam_tickets = []
-            for t in tickets.tickets:
-                # Basic check + case insensitivity
-                if t.category and t.category.upper() == "IAM":
-                    t.deliverableType = "IAM Category"
-                    iam_tickets.append(t)
-            
-            print(f"DEBUG_AGENT: Filtered down to {len(iam_tickets)} IAM tickets")
-            return TicketResponse(tickets=iam_tickets)
-            
-        except Exception as e:
-            print(f"DEBUG_AGENT: Error in category check: {e}")
-            return TicketResponse(tickets=[])
+        # Compiled "category" policy, evaluated over the whole batch
+        iam_tickets = self.policies.get("category").select(tickets.tickets)
+
+        print(f"DEBUG_AGENT: Filtered down to {len(iam_tickets)} IAM tickets")
+        return TicketResponse(tickets=iam_tickets)
@@ -49,15 +49,9 @@ class CloserAgent:
         )
 
     def invoke(self, tickets: TicketResponse) -> TicketResponse:
-        """Close tickets using deterministic logic."""
-        try:
-            # Direct python logic
-            updated = []
-            for t in tickets.tickets:
-                t.description = (t.description or "") + " | Evidence attached, ticket closed."
-                updated.append(t)
-            return TicketResponse(tickets=updated)
-
-        except Exception as e:
-            print(f"Error closing tickets: {e}")
-            return TicketResponse(tickets=[])
+        """Close tickets using deterministic logic (errors propagate so the stage is retried)."""
+        updated = []
+        for t in tickets.tickets:
+            t.description = (t.description or "") + " | Evidence attached, ticket closed."
+            updated.append(t)
+        return TicketResponse(tickets=updated)
@@ -17,15 +17,28 @@ class EvidenceCollectorAgent:
             config = json.load(f)
         self.smtp_config = config["smtp"]
 
-    def prepare_email(self, ticket) -> MIMEMultipart:
-        msg = MIMEMultipart()
-        msg["From"] = self.smtp_config["user"]
-        # Determine recipient: prefer application_owner, then first contact, then default
+    @staticmethod
+    def recipient(ticket) -> str:
+        # Prefer application_owner, then first contact, then default
         recipient = ticket.application_owner
         if not recipient and ticket.contacts:
             recipient = ticket.contacts[0]
-        
-        msg["To"] = recipient or "app_owner@example.com"
+        return recipient or "app_owner@example.com"
+
+    @staticmethod
+    def digest_item(ticket) -> dict:
+        """The fields of a ticket a digest lists"""
+        return {
+            "ticket_id": ticket.ticket_id,
+            "description": ticket.description,
+            "sla_deadline": ticket.sla_deadline,
+            "risk_level": ticket.risk_level,
+        }
+
+    def prepare_email(self, ticket) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg["From"] = self.smtp_config["user"]
+        msg["To"] = self.recipient(ticket)
         msg["Subject"] = f"IAM Deliverable {ticket.ticket_id} – Evidence Required"
 
         body = f"""
@@ -41,29 +54,114 @@ class EvidenceCollectorAgent:
         msg.attach(MIMEText(body, "plain"))
         return msg
 
+    def message(self, email: dict) -> MIMEMultipart:
+        """Rebuild a prepared email ({"to", "subject", "body"}, as returned by invoke(send=False))"""
+        msg = MIMEMultipart()
+        msg["From"] = self.smtp_config["user"]
+        msg["To"] = ", ".join(email["to"])
+        msg["Subject"] = email["subject"]
+        msg.attach(MIMEText(email["body"], "plain"))
+        return msg
+
+    @staticmethod
+    def body(msg: MIMEMultipart) -> str:
+        part = msg.get_payload()[0]
+        return part.get_payload(decode=True).decode(part.get_content_charset() or "utf-8")
+
+    def prepare_digest(self, recipient: str, items: list) -> MIMEMultipart:
+        """One evidence request covering several deliverables (dicts from digest_item)"""
+        if len(items) == 1:
+            subject = f"IAM Deliverable {items[0]['ticket_id']} – Evidence Required"
+        else:
+            subject = f"IAM Deliverables – Evidence Required for {len(items)} Tickets"
+        msg = MIMEMultipart()
+        msg["From"] = self.smtp_config["user"]
+        msg["To"] = recipient
+        msg["Subject"] = subject
+
+        # Most urgent first
+        items = sorted(items, key=lambda i: (i.get("sla_deadline") is None, str(i.get("sla_deadline"))))
+        lines = "\n".join(
+            f"        - {i['ticket_id']} ({i.get('description')}): SLA Deadline {i.get('sla_deadline')}, "
+            f"Risk Level {i.get('risk_level')}"
+            for i in items
+        )
+        body = f"""
+        Dear Owner,
+
+        Please provide completion evidence for the following {len(items)} deliverable(s):
+
+{lines}
+
+        Regards,
+        IAM Governance Team
+        """
+        msg.attach(MIMEText(body, "plain"))
+        return msg
+
     def send_email(self, msg: MIMEMultipart):
-        try:
-            with smtplib.SMTP(self.smtp_config["server"], self.smtp_config["port"]) as server:
-                if self.smtp_config.get("use_tls", True):
-                    server.starttls()
-                server.login(self.smtp_config["user"], self.smtp_config["password"])
-                server.send_message(msg)
-            return True
-        except Exception as e:
-            print(f"Error sending email: {e}")
-            return False
-
-    def invoke(self, tickets: TicketResponse, send=False) -> dict:
+        """Send over SMTP; failures raise so the calling stage is retried"""
+        with smtplib.SMTP(self.smtp_config["server"], self.smtp_config["port"],
+                          timeout=self.smtp_config.get("timeout_seconds", 30)) as server:
+            if self.smtp_config.get("use_tls", True):
+                server.starttls()
+            server.login(self.smtp_config["user"], self.smtp_config["password"])
+            server.send_message(msg)
+        return True
+
+    def invoke(self, tickets: TicketResponse, send=False, outbox=None, digest=False) -> dict:
+        """Prepare one evidence request per ticket.
+
+        With send=True the email is queued in `outbox` (an EmailOutbox) when
+        given, otherwise sent synchronously over SMTP. With digest=True the
+        requests go out as one message per recipient: the outbox batches them
+        over its digest window, a direct send groups this call's tickets.
+        """
+        if send and digest and outbox is None:
+            return self.send_digests(tickets)
         emails = []
         for t in tickets.tickets:
             msg = self.prepare_email(t)
-            if send:
-                status = self.send_email(msg)
-                emails.append({"ticket_id": t.ticket_id, "status": "sent" if status else "failed"})
+            if send and outbox is not None:
+                emails.append(self.enqueue(t, msg, outbox, digest))
+            elif send:
+                self.send_email(msg)
+                emails.append({"ticket_id": t.ticket_id, "status": "sent"})
             else:
                 emails.append({
                     "to": [msg["To"]],
                     "subject": msg["Subject"],
-                    "body": msg.get_payload()[0].get_payload()
+                    "body": self.body(msg)
                 })
         return {"emails": emails}
+
+    def enqueue(self, ticket, msg: MIMEMultipart, outbox, digest=False) -> dict:
+        """Queue `msg` for `ticket` in `outbox`, as part of its recipient's digest with digest=True"""
+        outbox_id, queued = outbox.enqueue(
+            ticket.ticket_id, "evidence", msg,
+            digest_key=msg["To"] if digest else None,
+            item=self.digest_item(ticket) if digest else None,
+        )
+        return {
+            "ticket_id": ticket.ticket_id,
+            "status": "queued" if queued else "already-queued",
+            "outbox_id": outbox_id,
+            "to": [msg["To"]],
+            "subject": msg["Subject"],
+            "body": self.body(msg)
+        }
+
+    def send_digests(self, tickets: TicketResponse) -> dict:
+        """Send one digest per recipient; per-ticket statuses name the digest's recipient"""
+        by_recipient = {}
+        for t in tickets.tickets:
+            by_recipient.setdefault(self.recipient(t), []).append(t)
+        emails = []
+        for recipient, owned in by_recipient.items():
+            self.send_email(self.prepare_digest(recipient, [self.digest_item(t) for t in owned]))
+            emails.extend(
+                {"ticket_id": t.ticket_id, "status": "sent",
+                 "to": [recipient], "digest_size": len(owned)}
+                for t in owned
+            )
+        return {"emails": emails}
@@ -1,10 +1,46 @@
 # agents/sla_prioritizer.py
 from backend.models.ticket_context import TicketResponse, Ticket
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from langchain.agents import create_agent
 from langchain_core.tools import Tool
 from langchain_core.messages import ToolMessage
 
+# Risk tiers by whole days left ((due - now).days): High within 3 days, Medium within 6
+HIGH_WITHIN_DAYS = 3
+MEDIUM_WITHIN_DAYS = 6
+
+def sla_risk_level(sla_deadline, now: datetime = None) -> str:
+    """Risk level of a ticket from its SLA deadline (naive deadlines are UTC)."""
+    try:
+        due = datetime.fromisoformat(sla_deadline)
+    except Exception:
+        return "Unknown"
+    if due.tzinfo is not None:
+        due = due.astimezone(timezone.utc).replace(tzinfo=None)
+    days_left = (due - (now or datetime.utcnow())).days
+    if days_left < HIGH_WITHIN_DAYS:
+        return "High"
+    elif days_left < MEDIUM_WITHIN_DAYS:
+        return "Medium"
+    return "Low"
+
+def sla_crossings(sla_deadline) -> list:
+    """Epoch times at which a ticket's risk tier changes: (timestamp, tier) in time order.
+
+    The tier applies from just after the timestamp; "Breached" marks the deadline itself.
+    """
+    try:
+        due = datetime.fromisoformat(sla_deadline)
+    except Exception:
+        return []
+    if due.tzinfo is None:
+        due = due.replace(tzinfo=timezone.utc)
+    return [
+        ((due - timedelta(days=MEDIUM_WITHIN_DAYS)).timestamp(), "Medium"),
+        ((due - timedelta(days=HIGH_WITHIN_DAYS)).timestamp(), "High"),
+        (due.timestamp(), "Breached"),
+    ]
+
 # ✅ Tool function: calculate SLA risk levels
 def prioritize_tickets_by_sla(tickets) -> TicketResponse:
     """Assign risk levels to tickets based on SLA deadlines."""
@@ -24,17 +60,7 @@ def prioritize_tickets_by_sla(tickets) -> TicketResponse:
     updated = []
     if hasattr(tickets, 'tickets'):
         for t in tickets.tickets:
-            try:
-                due = datetime.fromisoformat(t.sla_deadline)
-                days_left = (due - datetime.utcnow()).days
-                if days_left <= 2:
-                    t.risk_level = "High"
-                elif days_left <= 5:
-                    t.risk_level = "Medium"
-                else:
-                    t.risk_level = "Low"
-            except Exception:
-                t.risk_level = "Unknown"
+            t.risk_level = sla_risk_level(t.sla_deadline)
             updated.append(t)
     return TicketResponse(tickets=updated).json()
 
@@ -64,18 +90,9 @@ class SLAPrioritizerAgent:
         try:
             # Direct python logic
             updated = []
+            now = datetime.utcnow()
             for t in tickets.tickets:
-                try:
-                    due = datetime.fromisoformat(t.sla_deadline)
-                    days_left = (due - datetime.utcnow()).days
-                    if days_left <= 2:
-                        t.risk_level = "High"
-                    elif days_left <= 5:
-                        t.risk_level = "Medium"
-                    else:
-                        t.risk_level = "Low"
-                except Exception:
-                    t.risk_level = "Unknown"
+                t.risk_level = sla_risk_level(t.sla_deadline, now)
                 updated.append(t)
             return TicketResponse(tickets=updated)
 
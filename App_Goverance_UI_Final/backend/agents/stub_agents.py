@@ -0,0 +1,111 @@
+"""Stub agent backend: the pipeline agents with injected latency and errors.
+
+Selected with "agents": {"backend": "stub"} in config/config.json (or the
+AGENT_BACKEND environment variable). No LLM is created; each stage agent
+runs its deterministic logic after sleeping for a latency drawn from its
+distribution, and fails with probability `error_rate`:
+
+    "stub": {
+        "seed": 7,
+        "default": {"latency": {"distribution": "fixed", "seconds": 1.0}, "error_rate": 0.0},
+        "evidence": {"latency": {"distribution": "long_tail", "median": 1.0, "p99": 8.0}, "error_rate": 0.02}
+    }
+
+Distributions:
+    fixed       {"seconds": s}
+    normal      {"mean": m, "stddev": sd}            (clamped at 0)
+    long_tail   {"median": m, "p99": p, "max": cap}  (lognormal; cap optional)
+"""
+import math
+import random
+import threading
+import time
+from typing import Optional
+
+# Orchestrator attributes of the per-ticket pipeline stages (the fetcher is not stubbed)
+STAGE_AGENTS = ("categorizer", "sla", "ownership", "app_space_checker", "evidence", "closer", "logger")
+
+Z_99 = 2.3263  # standard normal 99th percentile
+
+
+class StubAgentError(RuntimeError):
+    """Injected agent failure."""
+
+
+class Latency:
+    """A latency distribution in seconds."""
+
+    def __init__(self, spec: Optional[dict] = None):
+        spec = spec or {}
+        self.spec = spec
+        self.distribution = spec.get("distribution", "fixed")
+        if self.distribution == "fixed":
+            seconds = spec.get("seconds", 0.0)
+            self._sample = lambda rng: seconds
+        elif self.distribution == "normal":
+            mean, stddev = spec.get("mean", 0.0), spec.get("stddev", 0.0)
+            self._sample = lambda rng: max(0.0, rng.gauss(mean, stddev))
+        elif self.distribution == "long_tail":
+            median = spec["median"]
+            sigma = math.log(spec["p99"] / median) / Z_99
+            cap = spec.get("max", float("inf"))
+            self._sample = lambda rng: min(cap, rng.lognormvariate(math.log(median), sigma))
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+
+    def sample(self, rng: random.Random) -> float:
+        return self._sample(rng)
+
+
+class StubAgent:
+    """Wraps an agent: `invoke` sleeps, may raise, then delegates; other attributes pass through."""
+
+    def __init__(self, agent, name: str, latency: Latency, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.agent = agent
+        self.name = name
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+        self.slept = 0.0
+        self._lock = threading.Lock()  # stages run on several executor threads
+
+    def invoke(self, *args, **kwargs):
+        with self._lock:
+            delay = self.latency.sample(self.rng)
+            fail = self.rng.random() < self.error_rate
+            self.calls += 1
+            self.errors += fail
+            self.slept += delay
+        time.sleep(delay)
+        if fail:
+            raise StubAgentError(f"Injected {self.name} failure")
+        return self.agent.invoke(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.agent, name)
+
+    def describe(self) -> dict:
+        return {
+            "latency": self.latency.spec,
+            "errorRate": self.error_rate,
+            "calls": self.calls,
+            "errors": self.errors,
+            "avgLatencySeconds": round(self.slept / self.calls, 3) if self.calls else None,
+        }
+
+
+def wrap_stub_agents(target, config: dict):
+    """Replace `target`'s stage agents with StubAgents configured from the "stub" section."""
+    default = config.get("default", {})
+    seed = config.get("seed")
+    for position, name in enumerate(STAGE_AGENTS):
+        spec = {**default, **config.get(name, {})}
+        setattr(target, name, StubAgent(
+            getattr(target, name),
+            name,
+            Latency(spec.get("latency")),
+            error_rate=spec.get("error_rate", 0.0),
+            seed=None if seed is None else seed + position,
+        ))
@@ -14,6 +14,23 @@ def fetch_all_tickets(data_file: str) -> TicketResponse:
     tickets = [Ticket(**t) for t in sample_data]
     return TicketResponse(tickets=tickets)
 
+def source_change_token(data_file: str) -> str:
+    """Cheap token that changes whenever the ticket source changes."""
+    stat = os.stat(data_file)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+def read_ticket_records(data_file: str, change_token: str = None):
+    """Read raw ticket records unless the source is unchanged since change_token.
+
+    Returns:
+        tuple: (list of raw records, or None if unchanged; current change token)
+    """
+    token = source_change_token(data_file)
+    if change_token is not None and token == change_token:
+        return None, token
+    with open(data_file, "r") as f:
+        return json.load(f), token
+
 class TicketFetcherAgent:
     def __init__(self, llm=None, data_file=None):
         self.llm = llm
@@ -46,3 +63,23 @@ class TicketFetcherAgent:
         except Exception as e:
             print(f"Error fetching tickets: {e}")
             return TicketResponse(tickets=[])
+
+    def change_token(self):
+        """Current change token of the ticket source (None if it cannot be read)."""
+        try:
+            return source_change_token(self.data_file)
+        except OSError as e:
+            print(f"Error reading ticket source change token: {e}")
+            return None
+
+    def fetch_changes(self, change_token: str = None):
+        """Fetch raw ticket records only if the source changed since change_token.
+
+        Returns:
+            tuple: (raw records or None if unchanged, new change token)
+        """
+        try:
+            return read_ticket_records(self.data_file, change_token)
+        except Exception as e:
+            print(f"Error fetching ticket changes: {e}")
+            return None, change_token
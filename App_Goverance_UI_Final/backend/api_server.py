@@ -1,14 +1,36 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
 import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 from dotenv import load_dotenv
 from backend.core.orchestrator import IAMOrchestrator
+from backend.core.ticket_sync import TicketSync, SyncDelta
+from backend.core.file_watcher import FileWatcher
+from backend.core.scheduler import TicketScheduler, deadline_timestamp, RISK_RANK, UNKNOWN_RISK_RANK
+from backend.core.continuations import ContinuationStore
+from backend.core.dead_letters import DeadLetterQueue
+from backend.core.retry import RetryPolicy, StageFailed, run_with_retry
+from backend.core.export import EXPORT_FORMATS, MEDIA_TYPES, ExportFilter, TicketExporter
+from backend.core.outbox import EmailOutbox, OutboxSpooler, log_transport, smtp_transport
+from backend.core.ticket_store import TicketStore
+from backend.core.stage_state import StageStates
+from backend.core.serialization import FastJSONResponse, TicketJSONCache, dumps, loads
+from backend.core.compression import CompressionMiddleware, SnapshotCompressor, negotiate_encoding
+from backend.core.config import load_config
+from backend.core.shared_state import LocalSharedState, create_shared_state
+from backend.core.search_index import TicketSearchIndex
+from backend.core.ticket_stats import TicketStats
+from backend.core.sla_monitor import SLAMonitor
+from backend.core.subscriptions import ALL, WAITING_FLAGS, SubscriptionIndex, normalize_topic, ticket_topics
 from backend.models.ticket_context import Ticket, TicketResponse
-from datetime import datetime
+from datetime import datetime, timezone
+from pathlib import Path
 
 load_dotenv()
 
@@ -17,6 +39,13 @@ from pydantic import BaseModel
 class PriorityUpdate(BaseModel):
     priority: str
 
+class BulkSelection(BaseModel):
+    """Tickets for a bulk checkpoint action: explicit IDs and/or a field filter
+    (e.g. {"priority": "low", "lobOwner": "Finance LOB"}) over waiting tickets"""
+    ticketIds: Optional[List[str]] = None
+    filter: Optional[Dict[str, Any]] = None
+    priority: Optional[str] = None
+
 app = FastAPI(title="Ticket Portal API", version="1.0.0")
 
 # CORS middleware for React frontend
@@ -28,44 +57,168 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated gzip/brotli for HTTP responses above a size threshold
+compression_config = load_config().get("compression", {})
+snapshot_compressor = None
+if compression_config.get("enabled", False):
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=compression_config.get("minimum_size", 1024),
+        gzip_level=compression_config.get("gzip_level", 6),
+        brotli_quality=compression_config.get("brotli_quality", 4),
+    )
+    if compression_config.get("precompress_snapshots", False):
+        snapshot_compressor = SnapshotCompressor(
+            gzip_level=compression_config.get("gzip_level", 6),
+            brotli_quality=compression_config.get("brotli_quality", 4),
+        )
+
 # WebSocket connection manager
 class ConnectionManager:
+    """WebSocket clients, their topic subscriptions and per-connection counters.
+
+    Ticket messages are routed through the subscription index, so a client
+    only receives (and the server only encodes) updates for its topics.
+    Messages relayed between workers carry a one-line routing header
+    followed by the payload.
+    """
+
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.subscriptions = SubscriptionIndex(current_tickets)
+        self.stats: Dict[WebSocket, Dict[str, Any]] = {}
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, topics: Optional[List[str]] = None):
         await websocket.accept()
         self.active_connections.append(websocket)
+        self.subscriptions.subscribe(websocket, topics or [ALL])
+        self.stats[websocket] = {"connectedAt": datetime.now().isoformat(), "messages": 0, "bytes": 0}
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        self.subscriptions.remove(websocket)
+        self.stats.pop(websocket, None)
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
+    async def send_payload(self, payload: bytes, connections):
+        """Send one encoded message to the given clients; every outgoing message ends here"""
+        text = payload.decode("utf-8")
+        for connection in connections:
             try:
-                await connection.send_json(message)
+                await connection.send_text(text)
             except Exception as e:
                 print(f"Error broadcasting to client: {e}")
+                continue
+            stats = self.stats.get(connection)
+            if stats is not None:
+                stats["messages"] += 1
+                stats["bytes"] += len(payload)
 
-manager = ConnectionManager()
+    def recipients(self, ticket_ids: Optional[List[str]]) -> List[WebSocket]:
+        """Clients interested in any of the tickets (everyone when ticket_ids is None)"""
+        if ticket_ids is None:
+            return list(self.active_connections)
+        return list(self.subscriptions.route({t: current_tickets.get(t) for t in ticket_ids}))
+
+    async def broadcast(self, message: dict, ticket_ids: Optional[List[str]] = None):
+        await self.broadcast_json(dumps(message), ticket_ids)
+
+    async def broadcast_json(self, payload: bytes, ticket_ids: Optional[List[str]] = None):
+        """Send an encoded message about `ticket_ids` (None: everyone) on every worker"""
+        await self.send_local(payload, ticket_ids)
+        shared_state.publish(dumps({"ids": ticket_ids}) + b"\n" + payload)
+
+    async def send_local(self, payload: bytes, ticket_ids: Optional[List[str]] = None):
+        await self.send_payload(payload, self.recipients(ticket_ids))
+
+    async def send_topic(self, payload: bytes, topic: str):
+        """Send a non-ticket message to clients subscribed to `topic` (or everything)"""
+        await self.send_payload(payload, self.subscriptions.subscribers([ALL, topic]))
+
+    async def send_tickets(self, ticket_ids: List[str]):
+        """Route ticket updates: each distinct subset of tickets is encoded once for its clients"""
+        routes = self.subscriptions.route({t: current_tickets[t] for t in ticket_ids})
+        groups: Dict[tuple, List[WebSocket]] = {}
+        for connection, ids in routes.items():
+            groups.setdefault(tuple(ids), []).append(connection)
+        for ids, connections in groups.items():
+            if len(ids) == 1:
+                payload = ticket_json.ticket_message("ticket_update", ids[0])
+            else:
+                payload = ticket_json.message("tickets_update", ids)
+            await self.send_payload(payload, connections)
+
+    async def deliver_remote(self, envelope: bytes):
+        """Shared state callback: a broadcast published by another worker"""
+        header, _, payload = envelope.partition(b"\n")
+        header = loads(header)
+        if "tickets" in header:
+            await self.send_tickets([t for t in header["tickets"] if t in current_tickets])
+        else:
+            await self.send_local(payload, header.get("ids"))
 
 # Global state
-current_tickets: Dict[str, Any] = {}
+current_tickets = TicketStore()
+ticket_json = TicketJSONCache(current_tickets)
+manager = ConnectionManager()
+search_index = TicketSearchIndex(current_tickets)
+ticket_stats = TicketStats(current_tickets)
+ticket_exporter = TicketExporter(current_tickets, ticket_json.fragment,
+                                 chunk_size=load_config().get("export", {}).get("chunk_size", 500))
+# Replaced at startup by the configured backend (see core.shared_state)
+shared_state = LocalSharedState()
 orchestrator: Optional[IAMOrchestrator] = None
+ticket_sync: Optional[TicketSync] = None
+scheduler: Optional[TicketScheduler] = None
+# Leader-only: timer wheel of upcoming SLA risk tier crossings
+sla_monitor: Optional[SLAMonitor] = None
+
+# Canonical Ticket objects + stage outputs of tickets paused at a checkpoint
+continuations = ContinuationStore()
+
+# Agent calls: timeouts, retries with backoff, and tickets that exhausted them
+stage_retry_config = load_config().get("stage_retry", {})
+stage_retry = RetryPolicy.from_config(stage_retry_config)
+stage_executor = ThreadPoolExecutor(max_workers=stage_retry_config.get("threads", 8), thread_name_prefix="stage")
+dead_letters = DeadLetterQueue()
+
+# Approved evidence emails are queued here and delivered by the leader's spooler
+email_outbox: Optional[EmailOutbox] = None
+outbox_spooler: Optional[OutboxSpooler] = None
+# Collapse each owner's evidence requests into one digest email (email_outbox.digest)
+email_digest = False
+
+# Scheduler job id -> ticket ids of a shared batch pipeline run (bulk approvals)
+pending_batches: Dict[str, List[str]] = {}
+batch_ids = itertools.count(1)
+
+# Frontend fields sourced from the ticket system that a sync may refresh on
+# tickets already in the pipeline (stage-owned fields are left untouched)
+SYNCED_SOURCE_FIELDS = ["title", "description", "createdAt", "slaDeadline", "aitNumber", "armId"]
+SYNCED_TICKET_FIELDS = ["description", "created_on", "sla_deadline", "ait_number", "arm_id"]
+
+# AppHQ record fields -> frontend fields refreshed on enriched tickets when AppHQ changes
+APPHQ_FRONTEND_FIELDS = {
+    "application_name": "applicationName",
+    "application_owner": "customer",
+    "lob_owner": "lobOwner",
+    "ait_owner": "aitOwner",
+    "contacts": "contacts",
+}
 
 def get_orchestrator():
     global orchestrator
     if orchestrator is None:
         api_key = os.getenv("OPEN_ROUTER_KEY_ORIGINAL")
-        if not api_key:
+        agent_backend = os.getenv("AGENT_BACKEND")  # overrides agents.backend in config.json
+        if not api_key and agent_backend != "stub":
             print("⚠️ WARNING: OPEN_ROUTER_KEY_ORIGINAL not found in environment variables")
         # Config file is now at root level
         # import os removed
         from pathlib import Path
         root_dir = Path(__file__).parent.parent
         config_path = root_dir / "config" / "config.json"
-        orchestrator = IAMOrchestrator(api_key, config_file=str(config_path))
+        orchestrator = IAMOrchestrator(api_key, config_file=str(config_path), agent_backend=agent_backend)
     return orchestrator
 
 def convert_ticket_to_frontend(ticket: Ticket) -> dict:
@@ -88,18 +241,16 @@ def convert_ticket_to_frontend(ticket: Ticket) -> dict:
         "aitOwner": ticket.ait_owner,
         "armId": ticket.arm_id,
         "contacts": ticket.contacts,
-        "stages": [
-            {"id": 1, "name": "Ticket Fetching", "status": "pending", "message": ""},
-            {"id": 2, "name": "Category Check", "status": "pending", "message": ""},
-            {"id": 3, "name": "SLA Prioritization", "status": "pending", "message": ""},
-            {"id": 4, "name": "Ownership Enrichment", "status": "pending", "message": ""},
-            {"id": 5, "name": "App Owner Check", "status": "pending", "message": ""},
-            {"id": 6, "name": "Evidence Collection", "status": "pending", "message": ""},
-            {"id": 7, "name": "Ticket Closure", "status": "pending", "message": ""},
-            {"id": 8, "name": "Logging", "status": "pending", "message": ""},
-        ]
+        # Expanded to the [{"id", "name", "status", "message"}, ...] list when serialized
+        "stages": StageStates(),
     }
 
+def create_frontend_ticket(ticket: Ticket) -> dict:
+    """Frontend ticket for a freshly fetched ticket (fetch stage completed)"""
+    frontend_ticket = convert_ticket_to_frontend(ticket)
+    frontend_ticket["stages"].set(0, "completed", "Ticket fetched successfully")
+    return frontend_ticket
+
 def convert_frontend_to_ticket(data: dict) -> Ticket:
     """Convert frontend dictionary to Pydantic Ticket model"""
     return Ticket(
@@ -119,179 +270,460 @@ def convert_frontend_to_ticket(data: dict) -> Ticket:
         contacts=data.get("contacts", [])
     )
 
+# Dashboard aggregates are pushed at most once per interval while they change
+STATS_PUSH_INTERVAL = 0.5
+stats_push_pending = False
+
+def schedule_stats_push():
+    """TicketStats listener: coalesce counter changes into one stats_update"""
+    global stats_push_pending
+    if stats_push_pending:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # no clients before the server loop runs
+    stats_push_pending = True
+    loop.create_task(push_stats())
+
+async def push_stats():
+    global stats_push_pending
+    await asyncio.sleep(STATS_PUSH_INTERVAL)
+    stats_push_pending = False
+    # Every worker pushes its own (journal-synced) aggregates, so this is not relayed
+    await manager.send_topic(dumps({"type": "stats_update", "stats": ticket_stats.snapshot()}), "stats")
+
+ticket_stats.add_listener(schedule_stats_push)
+
+async def sla_breach_loop(interval: float = 15.0):
+    """Count tickets whose SLA deadline passes while nothing else changes"""
+    while True:
+        await asyncio.sleep(interval)
+        ticket_stats.advance()
+
+async def sla_retier_loop(tick: float):
+    """Apply SLA risk tier crossings as the timer wheel reaches them"""
+    while True:
+        await asyncio.sleep(tick)
+        try:
+            crossings = sla_monitor.advance()
+            if crossings:
+                await apply_sla_crossings(crossings)
+        except Exception as e:
+            print(f"SLA re-tiering error: {e}")
+
+async def apply_sla_crossings(crossings):
+    """Escalate tickets that crossed into a riskier SLA tier, re-queue them and broadcast the delta.
+
+    Risk only ever goes up here (a human-confirmed "urgent" stays urgent);
+    the breach crossing flags the ticket as slaBreached.
+    """
+    changed = []
+    for ticket_id, tier in crossings:
+        ticket = current_tickets.get(ticket_id)
+        if ticket is None or ticket.get("status") == "completed":
+            continue
+        if tier == "Breached":
+            if ticket.get("slaBreached"):
+                continue
+            ticket["slaBreached"] = True
+        else:
+            if RISK_RANK[tier.lower()] >= RISK_RANK.get((ticket.get("priority") or "").lower(), UNKNOWN_RISK_RANK):
+                continue
+            ticket["priority"] = tier.lower()
+            if "risk_level" in ticket:
+                ticket["risk_level"] = tier.upper()
+            continuations.update_ticket(ticket_id, risk_level=tier)
+        changed.append(ticket_id)
+    if not changed:
+        return
+
+    if scheduler is not None:
+        jobs = {ticket_id: [ticket_id] for ticket_id in changed}
+        for job_id, ticket_ids in pending_batches.items():
+            if not jobs.keys().isdisjoint(ticket_ids):
+                jobs[job_id] = ticket_ids
+        for job_id, ticket_ids in jobs.items():
+            await scheduler.reprioritize(job_id, *job_priority(ticket_ids))
+    await broadcast_tickets(changed)
+    print(f"SLA re-tiering: {len(changed)} ticket(s) escalated")
+
+def set_stage(ticket_id: str, stage_index: int, status: str, message: str):
+    """Update ticket stage progress in the store without broadcasting"""
+    current_tickets[ticket_id]["currentStage"] = stage_index
+    current_tickets[ticket_id]["stages"].set(stage_index, status, message)
+
+    if status == "in-progress":
+        current_tickets[ticket_id]["status"] = "in-progress"
+    elif status == "completed" and stage_index == 7:
+        mark_completed(ticket_id)
+    current_tickets.touch(ticket_id)
+
+def mark_completed(ticket_id: str):
+    """Set a ticket's status to completed, stamping when (SLA met vs breached in the stats)"""
+    ticket = current_tickets[ticket_id]
+    if ticket.get("status") != "completed":
+        ticket["completedAt"] = datetime.now(timezone.utc).isoformat()
+    ticket["status"] = "completed"
+
+async def broadcast_tickets(ticket_ids: List[str]):
+    """Broadcast ticket changes: a ticket_update for one ticket, one coalesced tickets_update for many.
+
+    Every in-place ticket edit is published through here, so this is also
+    where the store is told the tickets changed.
+    """
+    ids = [t for t in ticket_ids if t in current_tickets]
+    for ticket_id in ids:
+        current_tickets.touch(ticket_id)
+    if ids:
+        # Journal the batch (one write, off the loop) so the messages carry the new versions
+        await shared_state.flush()
+        await manager.send_tickets(ids)
+        # Other workers build the messages from their own (journal-synced) store
+        shared_state.publish(dumps({"tickets": ids}) + b"\n")
+
 async def update_stage_progress(ticket_id: str, stage_index: int, status: str, message: str):
     """Update ticket stage progress and broadcast to WebSocket clients"""
     if ticket_id in current_tickets:
-        current_tickets[ticket_id]["currentStage"] = stage_index
-        current_tickets[ticket_id]["stages"][stage_index]["status"] = status
-        current_tickets[ticket_id]["stages"][stage_index]["message"] = message
-        
-        if status == "in-progress":
-            current_tickets[ticket_id]["status"] = "in-progress"
-        elif status == "completed" and stage_index == 7:
-            current_tickets[ticket_id]["status"] = "completed"
-        
-        await manager.broadcast({
-            "type": "ticket_update",
-            "ticket": current_tickets[ticket_id]
-        })
+        set_stage(ticket_id, stage_index, status, message)
+        await broadcast_tickets([ticket_id])
+
+async def update_batch_progress(ticket_ids: List[str], stage_index: int, status: str, message: str):
+    """Update stage progress for a batch of tickets with a single broadcast"""
+    for ticket_id in ticket_ids:
+        set_stage(ticket_id, stage_index, status, message)
+    await broadcast_tickets(ticket_ids)
+
+async def schedule_ticket(ticket_id: str):
+    """Queue a ticket for the worker pool at its SLA deadline priority"""
+    await schedule_batch([ticket_id])
+
+async def schedule_batch(ticket_ids: List[str]):
+    """Queue tickets resuming from the same checkpoint as one shared pipeline run"""
+    ticket_ids = [t for t in ticket_ids if t in current_tickets]
+    if not ticket_ids:
+        return
+    if scheduler is None:
+        asyncio.create_task(process_ticket_batch(ticket_ids))
+        return
+    if len(ticket_ids) == 1:
+        job_id = ticket_ids[0]
+    else:
+        job_id = f"batch-{next(batch_ids)}"
+        pending_batches[job_id] = ticket_ids
+    await scheduler.submit(job_id, *job_priority(ticket_ids), ticket_ids=ticket_ids)
+
+async def on_outbox_status(ticket_id: str, state: dict):
+    """Outbox spooler callback: reflect an email's delivery status into the ticket"""
+    ticket = current_tickets.get(ticket_id)
+    if ticket is None:
+        return
+    ticket[f"{state['kind']}Email"] = state
+    await broadcast_tickets([ticket_id])
+
+def job_priority(ticket_ids: List[str]):
+    """(sla_deadline, risk) a job runs at: that of its most urgent ticket"""
+    ticket = min(
+        (current_tickets[t] for t in ticket_ids if t in current_tickets),
+        key=lambda t: (deadline_timestamp(t.get("slaDeadline")),
+                       RISK_RANK.get((t.get("priority") or "").lower(), UNKNOWN_RISK_RANK)),
+        default={},
+    )
+    return ticket.get("slaDeadline"), ticket.get("priority")
+
+async def run_pipeline_job(job_id: str):
+    """Scheduler runner: a job is either a single ticket id or a pending batch"""
+    ticket_ids = pending_batches.pop(job_id, None)
+    await process_ticket_batch(ticket_ids or [job_id])
 
 async def process_individual_ticket(ticket_id: str):
     """Process a single ticket through the real agent pipeline"""
+    await process_ticket_batch([ticket_id])
+
+async def process_ticket_batch(ticket_ids: List[str]):
+    """Process tickets resuming from the same checkpoint through the real agent pipeline.
+
+    Each stage invokes its agent once for the whole batch and sends one
+    coalesced broadcast, so a bulk approval of N tickets is one pipeline run.
+    """
+    label = f"ticket {ticket_ids[0]}" if len(ticket_ids) == 1 else f"{len(ticket_ids)} tickets"
     try:
-        if ticket_id not in current_tickets:
+        ids = [t for t in ticket_ids if t in current_tickets]
+        if not ids:
             return
-        
+
         orch = get_orchestrator()
-        ticket_data = current_tickets[ticket_id]
-        current_stage = ticket_data["currentStage"]
-        
-        # Convert to Pydantic model for agents
-        ticket_obj = convert_frontend_to_ticket(ticket_data)
-        ticket_context = TicketResponse(tickets=[ticket_obj])
-        
+        current_stage = min(current_tickets[t]["currentStage"] for t in ids)
+
+        # Resume from the paused Ticket objects; only tickets with no
+        # continuation (first run, or after a restart) are rebuilt from the
+        # frontend projection
+        ticket_objs = {}
+        for ticket_id in ids:
+            continuation = continuations.get(ticket_id)
+            ticket_objs[ticket_id] = continuation.ticket if continuation \
+                else convert_frontend_to_ticket(current_tickets[ticket_id])
+
+        def batch_context():
+            return TicketResponse(tickets=[ticket_objs[t] for t in ids])
+
         await manager.broadcast({
             "type": "processing_start",
-            "message": f"Processing ticket {ticket_id} with AI Agents..."
-        })
-        
+            "message": f"Processing {label} with AI Agents..."
+        }, ids)
+
         # Stage 1: Category Check - Validate if IAM
         if current_stage < 1:
-            await update_stage_progress(ticket_id, 1, "in-progress", "AI Agent: Analyzing ticket category...")
-            # Call real agent (non-blocking)
+            await update_batch_progress(ids, 1, "in-progress", "AI Agent: Analyzing ticket category...")
             # Call real agent (non-blocking)
-            result = await asyncio.to_thread(orch.categorizer.invoke, ticket_context)
-            
-            if hasattr(result, 'tickets') and result.tickets:
-                ticket_obj = result.tickets[0]
-                current_tickets[ticket_id]["category"] = ticket_obj.category
-                await update_stage_progress(ticket_id, 1, "completed", f"✅ Confirmed: {ticket_obj.category} ticket")
-            else:
-                # Not IAM - agent filtered it out
-                await update_stage_progress(ticket_id, 1, "error", f"❌ Not an IAM ticket - processing stopped")
-                current_tickets[ticket_id]["status"] = "completed"
+            result = await run_stage(ids, 1, "categorizer", orch.categorizer.invoke, batch_context())
+            accepted = {t.ticket_id: t for t in getattr(result, "tickets", [])}
+
+            for ticket_id in ids:
+                if ticket_id in accepted:
+                    ticket_objs[ticket_id] = accepted[ticket_id]
+                    current_tickets[ticket_id]["category"] = accepted[ticket_id].category
+                    set_stage(ticket_id, 1, "completed", f"✅ Confirmed: {accepted[ticket_id].category} ticket")
+                else:
+                    # Not IAM - agent filtered it out
+                    set_stage(ticket_id, 1, "error", f"❌ Not an IAM ticket - processing stopped")
+                    mark_completed(ticket_id)
+            await broadcast_tickets(ids)
+
+            rejected = [t for t in ids if t not in accepted]
+            for ticket_id in rejected:
+                continuations.discard(ticket_id)
+            if rejected:
                 await manager.broadcast({
                     "type": "processing_complete",
-                    "message": f"Ticket {ticket_id} is not IAM - agent stopped processing",
-                    "ticket": current_tickets[ticket_id]
-                })
+                    "message": f"Ticket {', '.join(rejected)} is not IAM - agent stopped processing",
+                    "ticket": current_tickets[rejected[0]] if len(rejected) == 1 else None
+                }, rejected)
+            ids = [t for t in ids if t in accepted]
+            if not ids:
                 return  # Stop processing
             current_stage = 1
-            
+
         # Stage 2: SLA Prioritization
         if current_stage < 2:
-            await update_stage_progress(ticket_id, 2, "in-progress", "Agent: Calculating SLA...")
-            ticket_context.tickets = [ticket_obj]
-            result = await asyncio.to_thread(orch.sla.invoke, ticket_context)
-            if result.tickets:
-                ticket_obj = result.tickets[0]
+            await update_batch_progress(ids, 2, "in-progress", "Agent: Calculating SLA...")
+            result = await run_stage(ids, 2, "sla", orch.sla.invoke, batch_context())
+            for ticket_obj in result.tickets:
+                ticket_id = ticket_obj.ticket_id
+                ticket_objs[ticket_id] = ticket_obj
                 current_tickets[ticket_id]["slaDeadline"] = ticket_obj.sla_deadline
                 current_tickets[ticket_id]["priority"] = ticket_obj.risk_level.lower()
-                await update_stage_progress(ticket_id, 2, "completed", f"✅ Risk: {ticket_obj.risk_level} | SLA: {ticket_obj.sla_deadline}")
-            current_stage = 2
-            
+                set_stage(ticket_id, 2, "completed", f"✅ Risk: {ticket_obj.risk_level} | SLA: {ticket_obj.sla_deadline}")
+
             # NEW CHECKPOINT: Pause for Priority Confirmation
-            current_tickets[ticket_id]["waitingForPriorityConfirmation"] = True
-            await manager.broadcast({
-                "type": "ticket_update",
-                "ticket": current_tickets[ticket_id]
-            })
+            for ticket_id in ids:
+                current_tickets[ticket_id]["waitingForPriorityConfirmation"] = True
+                continuations.save(ticket_id, ticket_objs[ticket_id], "confirm-priority")
+            await broadcast_tickets(ids)
             return # Stop processing until confirmed
-            
+
         # Stage 3: Ownership Enrichment
         if current_stage < 3:
-            await update_stage_progress(ticket_id, 3, "in-progress", "Agent: Fetching ownership...")
-            ticket_context.tickets = [ticket_obj]
-            result = await asyncio.to_thread(orch.ownership.invoke, ticket_context)
-            if result.tickets:
-                ticket_obj = result.tickets[0]
+            await update_batch_progress(ids, 3, "in-progress", "Agent: Fetching ownership...")
+            result = await run_stage(ids, 3, "ownership", orch.ownership.invoke, batch_context())
+            for ticket_obj in result.tickets:
+                ticket_id = ticket_obj.ticket_id
+                ticket_objs[ticket_id] = ticket_obj
                 current_tickets[ticket_id]["lobOwner"] = ticket_obj.lob_owner
                 current_tickets[ticket_id]["applicationName"] = ticket_obj.application_name
-                await update_stage_progress(ticket_id, 3, "completed", f"✅ Owner: {ticket_obj.lob_owner}")
+                set_stage(ticket_id, 3, "completed", f"✅ Owner: {ticket_obj.lob_owner}")
+            await broadcast_tickets(ids)
             current_stage = 3
-            
+
         # Stage 4: App Owner Check
         if current_stage < 4:
-            await update_stage_progress(ticket_id, 4, "in-progress", "Agent: Verifying app owner...")
-            ticket_context.tickets = [ticket_obj]
-            result = await asyncio.to_thread(orch.app_space_checker.invoke, ticket_context)
-            if result.tickets:
-                ticket_obj = result.tickets[0]
-                await update_stage_progress(ticket_id, 4, "completed", "✅ App owner verified")
-            else:
-                await update_stage_progress(ticket_id, 4, "error", "App owner verification failed")
+            await update_batch_progress(ids, 4, "in-progress", "Agent: Verifying app owner...")
+            result = await run_stage(ids, 4, "app_space_checker", orch.app_space_checker.invoke, batch_context())
+            verified = {t.ticket_id: t for t in result.tickets}
+            for ticket_id in ids:
+                if ticket_id in verified:
+                    ticket_objs[ticket_id] = verified[ticket_id]
+                    set_stage(ticket_id, 4, "completed", "✅ App owner verified")
+                else:
+                    set_stage(ticket_id, 4, "error", "App owner verification failed")
+                    continuations.discard(ticket_id)
+            await broadcast_tickets(ids)
+            ids = [t for t in ids if t in verified]
+            if not ids:
                 return
             current_stage = 4
-            
+
         # Stage 5: Evidence Collection (PAUSE FOR REVIEW)
         if current_stage < 5:
-            await update_stage_progress(ticket_id, 5, "in-progress", "Agent: Preparing evidence emails...")
-            ticket_context.tickets = [ticket_obj]
+            await update_batch_progress(ids, 5, "in-progress", "Agent: Preparing evidence emails...")
             # Call agent to generate emails but don't send yet (non-blocking)
-            await asyncio.to_thread(orch.evidence.invoke, ticket_context, send=False)
-            
+            evidence = await run_stage(ids, 5, "evidence", orch.evidence.invoke, batch_context(), send=False)
+            emails = evidence.get("emails", []) if isinstance(evidence, dict) else []
+
             # Mark as waiting for review
-            current_tickets[ticket_id]["waitingForReview"] = True
-            await update_stage_progress(ticket_id, 5, "in-progress", "⏸️ Waiting for application team review...")
-            
-            await manager.broadcast({
-                "type": "ticket_update",
-                "ticket": current_tickets[ticket_id]
-            })
+            for position, ticket_id in enumerate(ids):
+                current_tickets[ticket_id]["waitingForReview"] = True
+                email = emails[position] if position < len(emails) else None
+                continuations.save(ticket_id, ticket_objs[ticket_id], "approve-review", {"evidence": email})
+            await update_batch_progress(ids, 5, "in-progress", "⏸️ Waiting for application team review...")
             return # Stop for review
-            
+
+        # Review approved: queue the evidence emails the reviewer saw; the outbox spooler delivers them
+        to_queue = [t for t in ids if "evidenceEmail" not in current_tickets[t]] if email_outbox else []
+        if current_stage == 5 and to_queue:
+            reviewed = []
+            for ticket_id in to_queue:
+                continuation = continuations.get(ticket_id)
+                reviewed.append((ticket_objs[ticket_id], continuation.outputs.get("evidence") if continuation else None))
+            await update_batch_progress(to_queue, 5, "in-progress", "Agent: Queuing approved evidence emails...")
+            queued = await run_stage(to_queue, 5, "evidence", queue_reviewed_evidence, orch.evidence, reviewed)
+            for ticket_id in to_queue:
+                set_stage(ticket_id, 5, "completed", "✅ Review approved - Evidence queued")
+            for email in queued.get("emails", []):
+                if email.get("status") == "queued":
+                    current_tickets[email["ticket_id"]]["evidenceEmail"] = {
+                        "kind": "evidence", "status": "queued", "attempts": 0,
+                        "to": ", ".join(email["to"]), "error": None, "updatedAt": time.time(),
+                    }
+            await broadcast_tickets(to_queue)
+            if outbox_spooler is not None:
+                outbox_spooler.wake()
+
         # Stage 6: Ticket Closure
         # Run if we are at stage 6 (or previous stages done) AND it's not completed yet
-        stage_6_status = current_tickets[ticket_id]["stages"][6]["status"]
-        if current_stage < 6 or (current_stage == 6 and stage_6_status != "completed"):
-            # Check if we have approval to proceed
-            if not current_tickets[ticket_id].get("closure_approved", False):
-                await update_stage_progress(ticket_id, 6, "in-progress", "Agent: Preparing for closure...")
-                
-                # NEW CHECKPOINT: Pause for Closure Confirmation
-                current_tickets[ticket_id]["waitingForClosureConfirmation"] = True
-                await update_stage_progress(ticket_id, 6, "in-progress", "⏸️ Waiting for final closure confirmation...")
-                
-                await manager.broadcast({
-                    "type": "ticket_update",
-                    "ticket": current_tickets[ticket_id]
-                })
-                return # Stop processing until confirmed
-            
+        if current_stage <= 6:
+            pending = [t for t in ids if current_tickets[t]["stages"].status(6) != "completed"]
+
+            # NEW CHECKPOINT: Pause for Closure Confirmation unless approved
+            unapproved = [t for t in pending if not current_tickets[t].get("closure_approved", False)]
+            if unapproved:
+                await update_batch_progress(unapproved, 6, "in-progress", "Agent: Preparing for closure...")
+                for ticket_id in unapproved:
+                    current_tickets[ticket_id]["waitingForClosureConfirmation"] = True
+                    continuations.save(ticket_id, ticket_objs[ticket_id], "confirm-closure")
+                await update_batch_progress(unapproved, 6, "in-progress", "⏸️ Waiting for final closure confirmation...")
+
             # If approved, proceed with actual closure
-            await update_stage_progress(ticket_id, 6, "in-progress", "Agent: Closing ticket...")
-            ticket_context.tickets = [ticket_obj]
-            result = await asyncio.to_thread(orch.closer.invoke, ticket_context)
-            if result.tickets:
-                ticket_obj = result.tickets[0]
-                await update_stage_progress(ticket_id, 6, "completed", "✅ Ticket closed")
-            else:
-                 # Fallback if agent returns empty but no crash
-                 await update_stage_progress(ticket_id, 6, "completed", "✅ Ticket closed (No changes)")
+            approved = [t for t in pending if t not in unapproved]
+            ids = [t for t in ids if t not in unapproved]
+            if not ids:
+                return # Stop processing until confirmed
+            if approved:
+                await update_batch_progress(approved, 6, "in-progress", "Agent: Closing ticket...")
+                result = await run_stage(
+                    approved, 6, "closer", orch.closer.invoke, TicketResponse(tickets=[ticket_objs[t] for t in approved])
+                )
+                closed = {t.ticket_id: t for t in result.tickets}
+                for ticket_id in approved:
+                    if ticket_id in closed:
+                        ticket_objs[ticket_id] = closed[ticket_id]
+                        set_stage(ticket_id, 6, "completed", "✅ Ticket closed")
+                    else:
+                        # Fallback if agent returns empty but no crash
+                        set_stage(ticket_id, 6, "completed", "✅ Ticket closed (No changes)")
+                await broadcast_tickets(approved)
             current_stage = 6
-            
+
         # Stage 7: Logging
         # Run only if Stage 6 is fully completed
-        stage_6_status = current_tickets[ticket_id]["stages"][6]["status"]
-        if current_stage < 7 and stage_6_status == "completed":
-            await update_stage_progress(ticket_id, 7, "in-progress", "Agent: Logging results...")
-            ticket_context.tickets = [ticket_obj]
-            await asyncio.to_thread(orch.logger.invoke, ticket_context)
-            await update_stage_progress(ticket_id, 7, "completed", "✅ Logged successfully")
-            current_tickets[ticket_id]["status"] = "completed"
-            
+        to_log = [t for t in ids if current_tickets[t]["stages"].status(6) == "completed"]
+        if current_stage < 7 and to_log:
+            await update_batch_progress(to_log, 7, "in-progress", "Agent: Logging results...")
+            logged = await run_stage(to_log, 7, "logger", orch.logger.invoke,
+                                     TicketResponse(tickets=[ticket_objs[t] for t in to_log]))
+            logs = logged.get("logs", []) if isinstance(logged, dict) else []
+            for position, ticket_id in enumerate(to_log):
+                if position < len(logs):
+                    current_tickets[ticket_id].setdefault("logs", []).append(logs[position])
+                set_stage(ticket_id, 7, "completed", "✅ Logged successfully")
+                continuations.discard(ticket_id)
+            await broadcast_tickets(to_log)
+
         await manager.broadcast({
             "type": "processing_complete",
-            "message": f"Ticket {ticket_id} processed successfully",
-            "ticket": current_tickets[ticket_id]
-        })
+            "message": f"{label[:1].upper()}{label[1:]} processed successfully",
+            "ticket": current_tickets[ids[0]] if len(ids) == 1 else None
+        }, ids)
 
     except Exception as e:
-        print(f"Error processing ticket {ticket_id}: {e}")
+        print(f"Error processing {label}: {e}")
+        await dead_letter_tickets(ticket_ids, e)
         await manager.broadcast({
             "type": "error",
             "message": f"Error processing ticket: {str(e)}"
-        })
+        }, ticket_ids)
+
+def queue_reviewed_evidence(agent, reviewed: list) -> dict:
+    """Queue approved evidence emails in the outbox (blocking; runs on the stage executor).
+
+    `reviewed` pairs each Ticket with the email parked at the review
+    checkpoint; a ticket resumed without one (e.g. after a restart) gets
+    the email prepare_email builds from its current fields.
+    """
+    emails = []
+    for ticket_obj, email in reviewed:
+        msg = agent.message(email) if email else agent.prepare_email(ticket_obj)
+        emails.append(agent.enqueue(ticket_obj, msg, email_outbox, email_digest))
+    return {"emails": emails}
+
+async def run_stage(ticket_ids: List[str], stage_index: int, stage: str, fn, *args, **kwargs):
+    """Run a blocking agent call with the stage timeout, retrying with backoff"""
+    async def on_retry(attempt: int, error: Exception, delay: float):
+        print(f"Stage {stage} failed (attempt {attempt}/{stage_retry.max_attempts}): {error}; retrying in {delay:.1f}s")
+        await update_batch_progress(ticket_ids, stage_index, "in-progress",
+                                    f"⚠️ {error} - retry {attempt + 1}/{stage_retry.max_attempts} in {delay:.0f}s")
+    return await run_with_retry(stage, fn, *args, policy=stage_retry, executor=stage_executor,
+                                on_retry=on_retry, **kwargs)
+
+async def dead_letter_tickets(ticket_ids: List[str], error: Exception):
+    """Move tickets left mid-stage by a failed run to the dead-letter queue"""
+    failed = []
+    for ticket_id in ticket_ids:
+        ticket = current_tickets.get(ticket_id)
+        if ticket is None:
+            continue
+        stage_index = ticket["currentStage"]
+        stages = ticket["stages"]
+        if stages.status(stage_index) != "in-progress" or any(ticket.get(flag) for flag in WAITING_FLAGS):
+            continue
+        attempts = error.attempts if isinstance(error, StageFailed) else 1
+        dead_letters.add(ticket_id, stage_index, stages.name(stage_index), str(error), attempts)
+        stages.set(stage_index, "error", f"❌ {error} - in dead-letter queue")
+        ticket["deadLettered"] = True
+        failed.append(ticket_id)
+    if failed:
+        print(f"Dead-lettered {len(failed)} ticket(s): {error}")
+        await broadcast_tickets(failed)
+
+async def replay_dead_letters(ticket_ids: List[str]) -> List[str]:
+    """Re-run dead-lettered tickets from the stage that failed.
+
+    A ticket that failed after its stage's checkpoint was approved (its
+    continuation is parked there) resumes past the checkpoint, so e.g. a
+    failed post-review outbox enqueue queues the reviewed email without
+    preparing it again or asking for a second review.
+
+    Returns:
+        list: ticket ids queued again
+    """
+    by_stage: Dict[int, List[str]] = {}
+    for ticket_id in ticket_ids:
+        letter = dead_letters.pop(ticket_id)
+        ticket = current_tickets.get(ticket_id)
+        if letter is None or ticket is None:
+            continue
+        continuation = continuations.get(ticket_id)
+        approved = continuation is not None and continuation.checkpoint == STAGE_CHECKPOINTS.get(letter.stage)
+        ticket["stages"].set(letter.stage, "pending", "Queued for replay")
+        ticket["currentStage"] = letter.stage if approved else letter.stage - 1
+        ticket.pop("deadLettered", None)
+        # Batched by resume point: a batch runs from its least advanced ticket
+        by_stage.setdefault(ticket["currentStage"], []).append(ticket_id)
+    replayed = [t for ids in by_stage.values() for t in ids]
+    await broadcast_tickets(replayed)
+    for ids in by_stage.values():
+        await schedule_batch(ids)
+    return replayed
 
 async def load_initial_tickets():
     """Load tickets using the TicketFetcherAgent"""
@@ -299,168 +731,694 @@ async def load_initial_tickets():
         print("Fetching initial tickets...")
         orch = get_orchestrator()
         
+        # Token taken before the read, so a write racing the load still shows up on the next sync
+        change_token = orch.fetcher.change_token() if hasattr(orch.fetcher, "change_token") else None
+
         # Stage 1: Fetch tickets (non-blocking)
         tickets_response = await asyncio.to_thread(orch.fetcher.invoke)
         
         if tickets_response.tickets:
             for ticket in tickets_response.tickets:
-                frontend_ticket = convert_ticket_to_frontend(ticket)
-                # Mark first stage as completed
-                frontend_ticket["stages"][0]["status"] = "completed"
-                frontend_ticket["stages"][0]["message"] = "Ticket fetched successfully"
+                frontend_ticket = create_frontend_ticket(ticket)
                 current_tickets[frontend_ticket["id"]] = frontend_ticket
             print(f"Loaded {len(current_tickets)} tickets")
         else:
             print("No tickets found")
+
+        # Baseline for incremental syncs (sources without change tracking skip it)
+        prime_ticket_sync(tickets_response, change_token)
             
     except Exception as e:
         print(f"Error loading initial tickets: {e}")
 
+def prime_ticket_sync(tickets_response: TicketResponse, change_token: Optional[str] = None):
+    """Set the baseline the incremental ticket sync diffs against.
+
+    With the source's change token from the load, the first sync skips an
+    unchanged source instead of re-reading and diffing it.
+    """
+    global ticket_sync
+    orch = get_orchestrator()
+    if hasattr(orch.fetcher, "fetch_changes"):
+        ticket_sync = TicketSync(orch.fetcher)
+        ticket_sync.prime(tickets_response, change_token)
+
+def merge_synced_tickets(delta: SyncDelta):
+    """Merge synced tickets into the live store without disturbing pipeline state.
+
+    Tickets that have not started processing are replaced outright; tickets
+    already in the pipeline only get their source fields refreshed. Deleted
+    tickets are removed unless they are mid-pipeline, in which case they are
+    only flagged so the running stages can finish.
+
+    Returns:
+        tuple: (frontend tickets inserted or changed, removed ticket ids)
+    """
+    merged, removed = [], []
+    for ticket in delta.new + delta.changed:
+        fresh = create_frontend_ticket(ticket)
+        existing = current_tickets.get(ticket.ticket_id)
+        if existing is None or existing.get("status") == "not-started":
+            current_tickets[ticket.ticket_id] = fresh
+        else:
+            for field in SYNCED_SOURCE_FIELDS:
+                existing[field] = fresh[field]
+            continuations.update_ticket(ticket.ticket_id, **{
+                name: getattr(ticket, name) for name in SYNCED_TICKET_FIELDS
+            })
+        merged.append(current_tickets[ticket.ticket_id])
+    for ticket_id in delta.deleted:
+        existing = current_tickets.get(ticket_id)
+        if existing is None:
+            continue
+        if existing.get("status") == "in-progress":
+            existing["sourceDeleted"] = True
+            merged.append(existing)
+        else:
+            del current_tickets[ticket_id]
+            continuations.discard(ticket_id)
+            removed.append(ticket_id)
+    return merged, removed
+
+async def sync_tickets() -> int:
+    """Pull new/changed tickets from the source and broadcast only the deltas"""
+    if ticket_sync is None:
+        return 0
+    delta = await asyncio.to_thread(ticket_sync.poll)
+    if not delta:
+        return 0
+    merged, removed = merge_synced_tickets(delta)
+    print(f"Ticket sync: {len(delta.new)} new, {len(delta.changed)} changed, {len(delta.deleted)} deleted")
+    await broadcast_tickets([t["id"] for t in merged])
+    if removed:
+        await manager.broadcast({
+            "type": "tickets_removed",
+            "ticketIds": removed
+        }, removed)
+    return len(merged) + len(removed)
+
+async def reload_apphq_data() -> int:
+    """Apply an AppHQ file change to the AppHQ index and enriched tickets"""
+    resolver = get_orchestrator().ownership
+    if not hasattr(resolver, "diff_index") or getattr(resolver, "client", None) is not None:
+        return 0  # remote AppHQ: records refresh as their cache entries expire
+    new_index, upserts, deletes, token = await asyncio.to_thread(resolver.diff_index)
+    # Tickets of a removed AIT lose their AppHQ ownership
+    removed = {source_field: [] if source_field == "contacts" else "" for source_field in APPHQ_FRONTEND_FIELDS}
+    patches = {**{ait: removed for ait in deletes}, **upserts}
+
+    # Swap the index and patch tickets with no await in between, so readers
+    # never see the new index alongside stale ticket ownership (or vice versa)
+    resolver.swap_index(new_index, token)
+    changed = []
+    for ticket in current_tickets.values():
+        record = patches.get(ticket.get("aitNumber"))
+        if record is None or ticket["stages"].status(3) != "completed":
+            continue
+        for source_field, frontend_field in APPHQ_FRONTEND_FIELDS.items():
+            ticket[frontend_field] = record.get(source_field)
+        continuations.update_ticket(ticket["id"], **{
+            source_field: record.get(source_field) for source_field in APPHQ_FRONTEND_FIELDS
+        })
+        changed.append(ticket)
+
+    print(f"AppHQ reload: {len(upserts)} upserted, {len(deletes)} deleted, {len(changed)} tickets refreshed")
+    await broadcast_tickets([t["id"] for t in changed])
+    return len(changed)
+
+async def on_data_file_changed(path: str):
+    """File watcher callback: parse and apply only the file that changed"""
+    orch = get_orchestrator()
+    if path == str(Path(orch.fetcher.data_file).resolve()):
+        await sync_tickets()
+    elif path == str(Path(orch.ownership.data_file).resolve()):
+        await reload_apphq_data()
+
+async def on_config_changed(path: str):
+    """Recompile selection policies when config.json changes (every worker)"""
+    try:
+        await asyncio.to_thread(get_orchestrator().reload_policies)
+        print("Policies reloaded from config.json")
+    except Exception as e:
+        print(f"Error reloading policies, keeping current rules: {e}")
+
+async def ticket_sync_loop(interval: float):
+    """Periodically run incremental ticket syncs"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sync_tickets()
+        except Exception as e:
+            print(f"Error syncing tickets: {e}")
+
+async def start_leader_services(orch, config: dict):
+    """Singletons run by exactly one worker: initial load, source sync, SLA re-tiering, email delivery and file watching"""
+    if current_tickets:
+        # Another worker loaded the tickets; diff future syncs against the shared view
+        prime_ticket_sync(TicketResponse(tickets=[
+            convert_frontend_to_ticket(t) for t in current_tickets.values()
+        ]))
+    else:
+        await load_initial_tickets()
+
+    sync_config = config.get("ticket_sync", {})
+    if sync_config.get("enabled", False):
+        asyncio.create_task(ticket_sync_loop(sync_config.get("interval_seconds", 30)))
+
+    global outbox_spooler
+    if email_outbox is not None:
+        outbox_config = config.get("email_outbox", {})
+        transport = outbox_config.get("transport", "log")
+        outbox_spooler = OutboxSpooler(
+            email_outbox,
+            smtp_transport(config["smtp"]) if transport == "smtp" else log_transport,
+            concurrency=outbox_config.get("concurrency", 4),
+            retry=RetryPolicy(
+                max_attempts=outbox_config.get("max_attempts", 5),
+                base_delay=outbox_config.get("base_delay_seconds", 30.0),
+                max_delay=outbox_config.get("max_delay_seconds", 900.0),
+            ),
+            poll_interval=outbox_config.get("poll_interval_seconds", 5.0),
+            on_status=on_outbox_status,
+            render_digest=orch.evidence.prepare_digest if email_digest else None,
+            digest_window=outbox_config.get("digest", {}).get("window_seconds", 60.0),
+            digest_max_items=outbox_config.get("digest", {}).get("max_tickets", 50),
+        )
+        outbox_spooler.start()
+
+    retier_config = config.get("sla_retiering", {})
+    if retier_config.get("enabled", False):
+        global sla_monitor
+        tick = retier_config.get("tick_seconds", 1.0)
+        sla_monitor = SLAMonitor(current_tickets, tick=tick)
+        asyncio.create_task(sla_retier_loop(tick))
+
+    reload_config = config.get("hot_reload", {})
+    if reload_config.get("enabled", False) and hasattr(orch.fetcher, "data_file"):
+        watched = [orch.fetcher.data_file]
+        if getattr(orch.ownership, "client", None) is None:
+            watched.append(orch.ownership.data_file)
+            # Stage 3 then reads the snapshot reload_apphq_data diffs against
+            await asyncio.to_thread(orch.ownership.enable_hot_reload)
+        watcher = FileWatcher(
+            watched,
+            on_data_file_changed,
+            poll_interval=reload_config.get("poll_interval_seconds", 1.0),
+            use_inotify=reload_config.get("use_inotify", True),
+        )
+        asyncio.create_task(watcher.run())
+
+async def leader_election_loop(orch, config: dict, interval: float = 5.0):
+    """Take over the leader services when the current leader worker exits"""
+    while not shared_state.try_lead():
+        await asyncio.sleep(interval)
+    print(f"Worker {os.getpid()} is now the leader")
+    await start_leader_services(orch, config)
+
 @app.on_event("startup")
 async def startup_event():
-    await load_initial_tickets()
+    orch = get_orchestrator()
+    config = getattr(orch, "config", {})
+
+    # Join the shared ticket view before loading anything (multi-worker deployments)
+    global shared_state
+    shared_state = create_shared_state(config.get("shared_state", {}), base_dir=Path(__file__).parent.parent)
+    shared_state.attach(current_tickets, manager.deliver_remote)
+    await shared_state.start()
+
+    # Every worker queues emails; only the leader delivers them
+    global email_outbox, email_digest
+    outbox_config = config.get("email_outbox", {})
+    if outbox_config.get("enabled", False):
+        outbox_path = Path(outbox_config.get("path", "data/outbox.db"))
+        if not outbox_path.is_absolute():
+            outbox_path = Path(__file__).parent.parent / outbox_path
+        email_outbox = EmailOutbox(str(outbox_path), lease_seconds=outbox_config.get("lease_seconds", 300.0))
+        email_digest = outbox_config.get("digest", {}).get("enabled", False)
+
+    global scheduler
+    scheduler = TicketScheduler(
+        run_pipeline_job,
+        workers=config.get("scheduler", {}).get("workers", 4),
+    )
+    scheduler.start()
+    asyncio.create_task(sla_breach_loop())
+
+    reload_config = config.get("hot_reload", {})
+    if reload_config.get("enabled", False) and hasattr(orch, "reload_policies"):
+        config_watcher = FileWatcher(
+            [orch.config_file],
+            on_config_changed,
+            poll_interval=reload_config.get("poll_interval_seconds", 1.0),
+            use_inotify=reload_config.get("use_inotify", True),
+        )
+        asyncio.create_task(config_watcher.run())
+
+    if shared_state.try_lead():
+        await start_leader_services(orch, config)
+    else:
+        asyncio.create_task(leader_election_loop(orch, config))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if scheduler is not None:
+        await scheduler.stop()
+    stage_executor.shutdown(wait=False, cancel_futures=True)
+    if outbox_spooler is not None:
+        await outbox_spooler.stop()
+    if email_outbox is not None:
+        email_outbox.close()
+    apphq = getattr(orchestrator, "apphq", None)
+    if apphq is not None:
+        await asyncio.to_thread(apphq.close)
+    llm_transport = getattr(orchestrator, "llm_transport", None)
+    if llm_transport is not None:
+        await llm_transport.aclose()
+    await shared_state.close()
 
 @app.get("/")
 async def root():
     return {"status": "ok", "message": "Ticket Portal API (Real Agents)"}
 
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header covers `etag`"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+def conditional_response(request: Request, etag: str, render) -> Response:
+    """304 when the client already has `etag`; otherwise the body from render()"""
+    headers = {"ETag": etag, "X-Store-Version": str(current_tickets.version)}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(content=render(), headers=headers)
+
+def snapshot_response(request: Request, etag: str) -> Response:
+    """Full ticket list, served from the pre-compressed snapshot when enabled"""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding")) if snapshot_compressor else None
+    if encoding is None or etag_matches(request, etag):
+        return conditional_response(request, etag, ticket_json.list_body)
+    body = ticket_json.list_body()
+    if len(body) < compression_config.get("minimum_size", 1024):
+        return conditional_response(request, etag, lambda: body)
+    return Response(
+        content=snapshot_compressor.get(current_tickets.version, body, encoding),
+        media_type="application/json",
+        headers={
+            "ETag": etag,
+            "X-Store-Version": str(current_tickets.version),
+            "Content-Encoding": encoding,
+            "Vary": "Accept-Encoding",
+        },
+    )
+
 @app.get("/api/tickets")
-async def get_tickets():
-    return JSONResponse(content={
-        "tickets": list(current_tickets.values()),
-        "count": len(current_tickets)
-    })
+async def get_tickets(request: Request, since: Optional[int] = None):
+    """All tickets, or with ?since=<version> only tickets changed/removed after that version"""
+    if since is not None:
+        return conditional_response(request, f'"tickets-{current_tickets.version}-since-{since}"',
+                                    lambda: ticket_json.changes_body(since))
+    return snapshot_response(request, f'"tickets-{current_tickets.version}"')
+
+def split_param(value: Optional[str]) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+@app.get("/api/export")
+async def export_tickets(format: str = "ndjson", status: Optional[str] = None, category: Optional[str] = None,
+                         priority: Optional[str] = None, stage: Optional[int] = None, since: Optional[int] = None,
+                         stages: bool = True, logs: bool = True):
+    """Stream tickets with their stage history and logs as NDJSON, CSV or Parquet.
+
+    Filters take comma-separated values; `since` exports only tickets changed
+    after that store version. Each row carries the ticket's `version`.
+    """
+    if format not in EXPORT_FORMATS:
+        detail = f"Unsupported format '{format}'; use one of {', '.join(EXPORT_FORMATS)}"
+        if format == "parquet":
+            detail = "Parquet export needs pyarrow (pip install pyarrow)"
+        raise HTTPException(status_code=400, detail=detail)
+    matches = ExportFilter(split_param(status), split_param(category), split_param(priority), stage)
+    ticket_ids = current_tickets.changed_since(since)[0] if since is not None else None
+    version = current_tickets.version
+    return StreamingResponse(
+        ticket_exporter.stream(format, matches, ticket_ids, include_stages=stages, include_logs=logs),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tickets-{version}.{format}"',
+            "X-Store-Version": str(version),
+        },
+    )
 
 @app.get("/api/tickets/iam")
-async def get_iam_tickets():
+async def get_iam_tickets(request: Request):
     """Get only IAM category tickets"""
-    iam_tickets = [t for t in current_tickets.values() if t.get("category", "").upper() == "IAM"]
-    return JSONResponse(content={
-        "tickets": iam_tickets,
-        "count": len(iam_tickets)
-    })
+    def render():
+        iam_ids = [t["id"] for t in current_tickets.values() if t.get("category", "").upper() == "IAM"]
+        return ticket_json.list_body(iam_ids)
+    return conditional_response(request, f'"iam-{current_tickets.version}"', render)
+
+@app.get("/api/scheduler/metrics")
+async def get_scheduler_metrics():
+    """Queue depth, worker utilisation and deadline slack of the EDF scheduler"""
+    if scheduler is None:
+        return FastJSONResponse(status_code=503, content={"error": "Scheduler not started"})
+    return FastJSONResponse(content=scheduler.metrics())
+
+@app.get("/api/dead-letters")
+async def get_dead_letters():
+    """Tickets whose pipeline stage failed every retry, oldest first (this worker)"""
+    return FastJSONResponse(content={"count": len(dead_letters), "deadLetters": dead_letters.describe()})
+
+@app.post("/api/dead-letters/replay")
+async def replay_all_dead_letters(selection: Optional[BulkSelection] = None):
+    """Replay the given dead-lettered tickets (`ticketIds`), or all of them"""
+    ticket_ids = selection.ticketIds if selection and selection.ticketIds else dead_letters.ids()
+    replayed = await replay_dead_letters(ticket_ids)
+    return {"status": "success", "replayed": replayed}
+
+@app.post("/api/dead-letters/{ticket_id}/replay")
+async def replay_dead_letter(ticket_id: str):
+    """Re-run one dead-lettered ticket from the stage that failed"""
+    if ticket_id not in dead_letters:
+        raise HTTPException(status_code=404, detail="Ticket not in dead-letter queue")
+    replayed = await replay_dead_letters([ticket_id])
+    return {"status": "success", "replayed": replayed}
+
+@app.get("/api/outbox")
+async def get_outbox():
+    """Evidence email outbox: message counts per status and the latest failures"""
+    if email_outbox is None:
+        return FastJSONResponse(status_code=503, content={"error": "Email outbox disabled"})
+    result = email_outbox.describe()
+    if outbox_spooler is not None:
+        result["spooler"] = {
+            "delivered": outbox_spooler.delivered,
+            "digestsSent": outbox_spooler.digests,
+            "failedAttempts": outbox_spooler.failures,
+        }
+    return FastJSONResponse(content=result)
+
+@app.post("/api/outbox/{message_id}/retry")
+async def retry_outbox_message(message_id: int):
+    """Give a failed email a fresh set of delivery attempts"""
+    if email_outbox is None:
+        return FastJSONResponse(status_code=503, content={"error": "Email outbox disabled"})
+    if not email_outbox.requeue(message_id):
+        raise HTTPException(status_code=404, detail="No failed message with that id")
+    message = email_outbox.get(message_id)
+    ticket = current_tickets.get(message["ticketId"])
+    if ticket is not None:
+        ticket[f"{message['kind']}Email"] = {
+            "kind": message["kind"], "status": "queued", "attempts": 0,
+            "to": message["to"], "error": None, "updatedAt": time.time(),
+        }
+        await broadcast_tickets([message["ticketId"]])
+    if outbox_spooler is not None:
+        outbox_spooler.wake()
+    return {"status": "success", "message": message}
+
+@app.get("/api/apphq/cache")
+async def get_apphq_cache():
+    """Remote AppHQ lookup cache: hits, negative hits, coalesced lookups and requests sent"""
+    apphq = getattr(get_orchestrator(), "apphq", None)
+    if apphq is None:
+        return FastJSONResponse(status_code=404, content={"error": "AppHQ is read from the local data file"})
+    return FastJSONResponse(content=apphq.describe())
+
+@app.get("/api/sla/timers")
+async def get_sla_timers():
+    """Pending SLA tier crossings on the re-tiering timer wheel (leader worker only)"""
+    if sla_monitor is None:
+        return FastJSONResponse(status_code=503, content={"error": "SLA re-tiering not running on this worker"})
+    return FastJSONResponse(content=sla_monitor.describe())
+
+@app.get("/api/tickets/search")
+async def search_tickets(q: str = "", limit: int = 20, offset: int = 0):
+    """Ranked full-text search over ticket ids, descriptions, application names, ARM/AIT ids and owners"""
+    limit = max(1, min(limit, 100))
+    offset = max(0, offset)
+    results = search_index.search(q)
+    page = results[offset:offset + limit]
+    return FastJSONResponse(content=ticket_json.list_body([t for t, _ in page], extra={
+        "query": q,
+        "total": len(results),
+        "offset": offset,
+        "limit": limit,
+        "scores": [round(score, 3) for _, score in page],
+    }))
+
+@app.get("/api/stats")
+async def get_stats():
+    """Incrementally maintained counts per status, stage, risk, category, LOB, checkpoint and SLA state"""
+    return FastJSONResponse(content=ticket_stats.snapshot())
+
+@app.get("/api/policies")
+async def get_policies():
+    """Compiled category / owner-space policies with per-rule hit counters"""
+    policies = getattr(get_orchestrator(), "policies", None)
+    if policies is None:
+        return FastJSONResponse(status_code=404, content={"error": "Policies not available"})
+    return FastJSONResponse(content=policies.describe())
+
+@app.post("/api/tickets/sync")
+async def trigger_ticket_sync():
+    """Run an incremental ticket sync now instead of waiting for the schedule"""
+    synced = await sync_tickets()
+    return FastJSONResponse(content={"status": "success", "synced": synced})
 
 @app.get("/api/tickets/{ticket_id}")
-async def get_ticket(ticket_id: str):
+async def get_ticket(ticket_id: str, request: Request):
     if ticket_id in current_tickets:
-        return JSONResponse(content=current_tickets[ticket_id])
-    return JSONResponse(status_code=404, content={"error": "Ticket not found"})
+        etag = f'"{ticket_id}-{current_tickets.ticket_version(ticket_id)}"'
+        return conditional_response(request, etag, lambda: ticket_json.fragment(ticket_id))
+    return FastJSONResponse(status_code=404, content={"error": "Ticket not found"})
 
 @app.post("/api/tickets/{ticket_id}/process")
 async def process_single_ticket(ticket_id: str):
-    asyncio.create_task(process_individual_ticket(ticket_id))
-    return JSONResponse(content={"status": "success", "message": "Processing started"})
+    await schedule_ticket(ticket_id)
+    return FastJSONResponse(content={"status": "success", "message": "Processing started"})
 
-@app.post("/api/tickets/{ticket_id}/confirm-priority")
-async def confirm_priority(ticket_id: str, update: PriorityUpdate = None):
-    """Confirm priority/risk and continue processing"""
-    try:
-        if ticket_id not in current_tickets:
-            return JSONResponse(status_code=404, content={"error": f"Ticket {ticket_id} not found"})
-        
-        ticket = current_tickets[ticket_id]
-        
-        # Idempotency check: If already confirmed (stage > 2 or waiting flag cleared), return success
-        if not ticket.get("waitingForPriorityConfirmation", False):
-            # Check if we already moved past this validation
-            if ticket.get("currentStage", 0) >= 2:
-                 return JSONResponse(content={"status": "success", "message": "Priority already confirmed"})
-            return JSONResponse(status_code=400, content={"error": "Ticket is not waiting for priority confirmation"})
-        
-        # Update priority if provided
-        if update and update.priority:
-            current_tickets[ticket_id]["priority"] = update.priority.lower()
-            current_tickets[ticket_id]["risk_level"] = update.priority.upper()
-            ticket["priority"] = update.priority.lower()
-            ticket["risk_level"] = update.priority.upper()
+# Human checkpoints: waiting flag on the ticket and how far it must have got
+# to count as already confirmed (idempotent retries return success)
+CHECKPOINTS = {
+    "confirm-priority": {
+        "flag": "waitingForPriorityConfirmation",
+        "done": lambda t: t.get("currentStage", 0) >= 2,
+        "not_waiting": "Ticket is not waiting for priority confirmation",
+        "already": "Priority already confirmed",
+    },
+    "approve-review": {
+        "flag": "waitingForReview",
+        "done": lambda t: t.get("currentStage", 0) > 5 or not t.get("waitingForReview", True),
+        "not_waiting": "Ticket is not waiting for review",
+        "already": "Review already approved",
+    },
+    "confirm-closure": {
+        "flag": "waitingForClosureConfirmation",
+        "done": lambda t: t.get("closure_approved", False) or t.get("currentStage", 0) >= 6,
+        "not_waiting": "Ticket is not waiting for closure confirmation",
+        "already": "Closure already confirmed",
+    },
+}
+
+# Checkpoint each pausing stage waits at (stage index -> checkpoint)
+STAGE_CHECKPOINTS = {5: "approve-review", 6: "confirm-closure"}
 
+def checkpoint_state(ticket_id: str, checkpoint: str) -> str:
+    """Return "waiting", "done", "missing" or "invalid" for a ticket at a checkpoint"""
+    ticket = current_tickets.get(ticket_id)
+    if ticket is None:
+        return "missing"
+    spec = CHECKPOINTS[checkpoint]
+    if ticket.get(spec["flag"], False):
+        return "waiting"
+    return "done" if spec["done"](ticket) else "invalid"
+
+def apply_checkpoint(ticket_id: str, checkpoint: str, priority: Optional[str] = None):
+    """Clear a checkpoint and mark its stage, without broadcasting"""
+    ticket = current_tickets[ticket_id]
+    if checkpoint == "confirm-priority":
+        # Update priority if provided
+        if priority:
+            ticket["priority"] = priority.lower()
+            ticket["risk_level"] = priority.upper()
+            continuations.update_ticket(ticket_id, risk_level=priority.upper())
         # Mark confirmation as completed
-        current_tickets[ticket_id]["waitingForPriorityConfirmation"] = False
-        
-        confirmed_risk = ticket.get('risk_level', 'MEDIUM')
-        await update_stage_progress(ticket_id, 2, "completed", f"✅ Risk Confirmed: {confirmed_risk}")
-        
-        # Continue processing from stage 3
-        asyncio.create_task(process_individual_ticket(ticket_id))
-        
-        return JSONResponse(content={
+        ticket["waitingForPriorityConfirmation"] = False
+        set_stage(ticket_id, 2, "completed", f"✅ Risk Confirmed: {ticket.get('risk_level', 'MEDIUM')}")
+    elif checkpoint == "approve-review":
+        # Mark review as completed
+        ticket["waitingForReview"] = False
+        set_stage(ticket_id, 5, "completed", "✅ Review approved - Evidence collected")
+    elif checkpoint == "confirm-closure":
+        # Mark confirmation as completed and approve closure
+        ticket["waitingForClosureConfirmation"] = False
+        ticket["closure_approved"] = True
+        set_stage(ticket_id, 6, "in-progress", "✅ Closure Confirmed - Starting Agent...")
+
+async def confirm_checkpoint(ticket_id: str, checkpoint: str, success_message: str, priority: Optional[str] = None):
+    """Single-ticket checkpoint endpoint body"""
+    try:
+        state = checkpoint_state(ticket_id, checkpoint)
+        if state == "missing":
+            return FastJSONResponse(status_code=404, content={"error": f"Ticket {ticket_id} not found"})
+        # Idempotency check: already past this checkpoint
+        if state == "done":
+            return FastJSONResponse(content={"status": "success", "message": CHECKPOINTS[checkpoint]["already"]})
+        if state == "invalid":
+            return FastJSONResponse(status_code=400, content={"error": CHECKPOINTS[checkpoint]["not_waiting"]})
+
+        apply_checkpoint(ticket_id, checkpoint, priority)
+        await broadcast_tickets([ticket_id])
+
+        # Continue processing from the next stage
+        await schedule_ticket(ticket_id)
+
+        return FastJSONResponse(content={
             "status": "success",
-            "message": f"Priority confirmed for ticket {ticket_id}"
+            "message": success_message
         })
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return FastJSONResponse(status_code=500, content={"error": str(e)})
 
-@app.post("/api/tickets/{ticket_id}/confirm-closure")
-async def confirm_closure(ticket_id: str):
-    """Confirm closure and complete processing"""
+def select_bulk_tickets(selection: BulkSelection, checkpoint: str) -> List[str]:
+    """Resolve explicit IDs plus filter matches (filters only match waiting tickets)"""
+    selected = list(dict.fromkeys(selection.ticketIds or []))
+    if selection.filter is not None:
+        flag = CHECKPOINTS[checkpoint]["flag"]
+        seen = set(selected)
+        for ticket_id, ticket in current_tickets.items():
+            if ticket_id in seen or not ticket.get(flag, False):
+                continue
+            if all(str(ticket.get(k, "")).lower() == str(v).lower() for k, v in selection.filter.items()):
+                selected.append(ticket_id)
+    return selected
+
+async def bulk_confirm_checkpoint(selection: BulkSelection, checkpoint: str):
+    """Validate every ticket in one pass, apply all approvals or none, then
+    resume the waiting tickets as one batch with one coalesced broadcast"""
     try:
-        if ticket_id not in current_tickets:
-            return JSONResponse(status_code=404, content={"error": f"Ticket {ticket_id} not found"})
-        
-        ticket = current_tickets[ticket_id]
-        
-        # Idempotency check
-        if not ticket.get("waitingForClosureConfirmation", False):
-            if ticket.get("closure_approved", False) or ticket.get("currentStage", 0) >= 6:
-                return JSONResponse(content={"status": "success", "message": "Closure already confirmed"})
-            return JSONResponse(status_code=400, content={"error": "Ticket is not waiting for closure confirmation"})
-        
-        # Mark confirmation as completed and approve closure
-        current_tickets[ticket_id]["waitingForClosureConfirmation"] = False
-        current_tickets[ticket_id]["closure_approved"] = True
-        await update_stage_progress(ticket_id, 6, "in-progress", "✅ Closure Confirmed - Starting Agent...")
-        
-        # Continue processing (will now enter the closure block)
-        asyncio.create_task(process_individual_ticket(ticket_id))
-        
-        return JSONResponse(content={
+        selected = select_bulk_tickets(selection, checkpoint)
+        if not selected:
+            return FastJSONResponse(status_code=400, content={"error": "No tickets selected"})
+
+        states = {ticket_id: checkpoint_state(ticket_id, checkpoint) for ticket_id in selected}
+        errors = {
+            ticket_id: ("Ticket not found" if state == "missing" else CHECKPOINTS[checkpoint]["not_waiting"])
+            for ticket_id, state in states.items() if state in ("missing", "invalid")
+        }
+        if errors:
+            return FastJSONResponse(status_code=400, content={"error": "Bulk action rejected", "tickets": errors})
+
+        waiting = [ticket_id for ticket_id, state in states.items() if state == "waiting"]
+        already = [ticket_id for ticket_id, state in states.items() if state == "done"]
+        for ticket_id in waiting:
+            apply_checkpoint(ticket_id, checkpoint, selection.priority)
+        await broadcast_tickets(waiting)
+        await schedule_batch(waiting)
+
+        return FastJSONResponse(content={
             "status": "success",
-            "message": f"Closure confirmed for ticket {ticket_id}"
+            "applied": waiting,
+            "alreadyConfirmed": already,
+            "message": f"{checkpoint} applied to {len(waiting)} tickets"
         })
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return FastJSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/tickets/bulk/confirm-priority")
+async def bulk_confirm_priority(selection: BulkSelection):
+    """Confirm priority for many tickets and continue them as one batch"""
+    return await bulk_confirm_checkpoint(selection, "confirm-priority")
+
+@app.post("/api/tickets/bulk/approve-review")
+async def bulk_approve_review(selection: BulkSelection):
+    """Approve email review for many tickets and continue them as one batch"""
+    return await bulk_confirm_checkpoint(selection, "approve-review")
+
+@app.post("/api/tickets/bulk/confirm-closure")
+async def bulk_confirm_closure(selection: BulkSelection):
+    """Confirm closure for many tickets and close them as one batch"""
+    return await bulk_confirm_checkpoint(selection, "confirm-closure")
+
+@app.post("/api/tickets/{ticket_id}/confirm-priority")
+async def confirm_priority(ticket_id: str, update: PriorityUpdate = None):
+    """Confirm priority/risk and continue processing"""
+    return await confirm_checkpoint(
+        ticket_id, "confirm-priority", f"Priority confirmed for ticket {ticket_id}",
+        priority=update.priority if update else None,
+    )
+
+@app.post("/api/tickets/{ticket_id}/confirm-closure")
+async def confirm_closure(ticket_id: str):
+    """Confirm closure and complete processing"""
+    return await confirm_checkpoint(ticket_id, "confirm-closure", f"Closure confirmed for ticket {ticket_id}")
 
 @app.post("/api/tickets/{ticket_id}/approve-review")
 async def approve_review(ticket_id: str):
     """Approve email review and continue"""
+    return await confirm_checkpoint(ticket_id, "approve-review", f"Review approved for ticket {ticket_id}")
+
+@app.get("/api/ws/clients")
+async def get_websocket_clients():
+    """Connected WebSocket clients with their topics and message/byte counters"""
+    return FastJSONResponse(content={
+        "connections": len(manager.active_connections),
+        "clients": [
+            {**manager.stats.get(ws, {}), "topics": sorted(manager.subscriptions.topics_of(ws))}
+            for ws in manager.active_connections
+        ],
+        "topics": manager.subscriptions.topic_counts(),
+    })
+
+def matching_ticket_ids(websocket: WebSocket) -> List[str]:
+    """Tickets matching a client's subscriptions, for its snapshot"""
+    topics = manager.subscriptions.topics_of(websocket)
+    if ALL in topics:
+        return list(current_tickets.keys())
+    return [t for t, ticket in current_tickets.items() if not topics.isdisjoint(ticket_topics(ticket))]
+
+async def handle_client_message(websocket: WebSocket, data: str):
+    """Client requests: "ping", or {"type": "subscribe"|"unsubscribe", "topics": [...]}"""
+    if data == "ping":
+        await manager.send_payload(dumps({"type": "pong"}), [websocket])
+        return
     try:
-        if ticket_id not in current_tickets:
-            return JSONResponse(status_code=404, content={"error": f"Ticket {ticket_id} not found"})
-        
-        ticket = current_tickets[ticket_id]
-        
-        # Idempotency check
-        if not ticket.get("waitingForReview", False):
-            if ticket.get("currentStage", 0) > 5 or not ticket.get("waitingForReview", True):
-                 return JSONResponse(content={"status": "success", "message": "Review already approved"})
-            return JSONResponse(status_code=400, content={"error": "Ticket is not waiting for review"})
-        
-        # Mark review as completed
-        current_tickets[ticket_id]["waitingForReview"] = False
-        await update_stage_progress(ticket_id, 5, "completed", "✅ Review approved - Evidence collected")
-        
-        # Continue processing from stage 6
-        asyncio.create_task(process_individual_ticket(ticket_id))
-        
-        return JSONResponse(content={
-            "status": "success",
-            "message": f"Review approved for ticket {ticket_id}"
-        })
-    except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        request = loads(data)
+    except ValueError:
+        return
+    if not isinstance(request, dict) or request.get("type") not in ("subscribe", "unsubscribe"):
+        return
+    topics = [t for t in request.get("topics") or [] if isinstance(t, str)]
+    if request["type"] == "subscribe":
+        if request.get("replace", False):
+            manager.subscriptions.remove(websocket)
+        elif ALL not in map(normalize_topic, topics):
+            # The first specific subscription narrows the default "all"
+            manager.subscriptions.unsubscribe(websocket, [ALL])
+        manager.subscriptions.subscribe(websocket, topics)
+    else:
+        manager.subscriptions.unsubscribe(websocket, topics)
+    # Snapshot of the tickets now in scope, so the client needs no extra GET
+    await manager.send_payload(ticket_json.message(
+        "subscribed", matching_ticket_ids(websocket),
+        extra={"topics": sorted(manager.subscriptions.topics_of(websocket))},
+    ), [websocket])
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, topics: Optional[str] = None):
+    """Ticket updates; `?topics=a,b` subscribes at connect time (default: all tickets)"""
+    await manager.connect(websocket, [t for t in (topics or "").split(",") if t.strip()])
     try:
-        await websocket.send_json({
-            "type": "initial_state",
-            "tickets": list(current_tickets.values())
-        })
+        await manager.send_payload(ticket_json.message(
+            "initial_state", matching_ticket_ids(websocket), extra={"stats": ticket_stats.snapshot()}
+        ), [websocket])
         while True:
             data = await websocket.receive_text()
-            if data == "ping":
-                await websocket.send_json({"type": "pong"})
+            await handle_client_message(websocket, data)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
@@ -469,4 +1427,6 @@ if __name__ == "__main__":
     print("="*60)
     print("Starting Ticket Portal API with REAL AGENTS")
     print("="*60)
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # permessage-deflate is negotiated per WebSocket client (initial_state snapshots compress ~10x)
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info",
+                ws_per_message_deflate=compression_config.get("websocket_deflate", True))
@@ -0,0 +1,218 @@
+"""AppHQ lookups against a remote AppHQ service.
+
+`HttpAppHQClient` asks the service for many AIT numbers per request:
+
+    POST {url}/aits/lookup   {"ait_numbers": ["AIT-1", ...]}
+    -> {"records": [{"ait_number": "AIT-1", ...}, ...]}   (unknown AITs are left out)
+
+`AppHQLookup` sits in front of it:
+  * TTL cache of records, with negative caching of unknown AITs (shorter TTL)
+  * singleflight: concurrent lookups of the same AIT share one in-flight request
+  * coalescing: misses from every caller within `linger` seconds go out together,
+    split into `batch_size` AITs per request
+
+Lookups run on the lookup's own event loop thread, so one cache and one
+set of in-flight requests serve both the synchronous agents (stage executor
+threads, `lookup_sync`) and async code (`lookup_async`).
+
+Selected with "apphq": {"source": "http", "url": ...} in config/config.json;
+backend/mocks/apphq_server.py is a local stand-in for the service.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+Records = Dict[str, Optional[dict]]  # AIT number -> record, None when AppHQ does not know it
+
+
+class AppHQError(RuntimeError):
+    """AppHQ could not be reached or answered with an error."""
+
+
+class HttpAppHQClient:
+    """Batched AppHQ record lookups over HTTP (async httpx)."""
+
+    def __init__(self, url: str, batch_size: int = 100, max_concurrency: int = 4,
+                 timeout: float = 10.0, headers: Optional[dict] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.url = url.rstrip("/")
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.transport = transport
+        self.requests = 0
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created on first use so it binds to the loop that runs the lookups
+        if self._client is None:
+            self._client = httpx.AsyncClient(base_url=self.url, timeout=self.timeout,
+                                             headers=self.headers, transport=self.transport)
+        return self._client
+
+    async def _fetch_batch(self, ait_numbers: List[str], limit: asyncio.Semaphore) -> Records:
+        async with limit:
+            self.requests += 1
+            try:
+                response = await self._get_client().post("/aits/lookup", json={"ait_numbers": ait_numbers})
+                response.raise_for_status()
+                records = response.json().get("records", [])
+            except (httpx.HTTPError, ValueError) as e:
+                raise AppHQError(f"AppHQ lookup of {len(ait_numbers)} AIT(s) failed: {e}") from e
+        found = {rec["ait_number"]: rec for rec in records if rec.get("ait_number") in ait_numbers}
+        return {ait: found.get(ait) for ait in ait_numbers}
+
+    async def fetch(self, ait_numbers: List[str]) -> Records:
+        """Records for `ait_numbers`, `batch_size` per request, up to `max_concurrency` requests at once."""
+        limit = asyncio.Semaphore(self.max_concurrency)
+        batches = [ait_numbers[i:i + self.batch_size] for i in range(0, len(ait_numbers), self.batch_size)]
+        results = await asyncio.gather(*(self._fetch_batch(batch, limit) for batch in batches))
+        return {ait: rec for result in results for ait, rec in result.items()}
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class AppHQLookup:
+    """Cached, singleflight, coalescing AppHQ lookups on a dedicated event loop thread."""
+
+    def __init__(self, source: HttpAppHQClient, ttl: float = 300.0, negative_ttl: float = 60.0,
+                 max_entries: int = 100000, linger: float = 0.002):
+        self.source = source
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.linger = linger
+        self.stats = {"hits": 0, "negativeHits": 0, "misses": 0, "coalesced": 0, "fetches": 0, "errors": 0}
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()  # AIT -> (expires_at, record or None)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._queue: List[str] = []
+        self._flush_scheduled = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="apphq-lookup", daemon=True)
+        self._thread.start()
+
+    # -- called on the lookup loop ------------------------------------------
+
+    async def lookup(self, ait_numbers: Iterable[str]) -> Records:
+        now = time.monotonic()
+        result: Records = {}
+        waits: Dict[str, asyncio.Future] = {}
+        for ait in dict.fromkeys(ait_numbers):
+            entry = self._cache.get(ait)
+            if entry is not None and entry[0] > now:
+                self._cache.move_to_end(ait)
+                result[ait] = entry[1]
+                self.stats["hits" if entry[1] is not None else "negativeHits"] += 1
+            elif ait in self._inflight:
+                waits[ait] = self._inflight[ait]
+                self.stats["coalesced"] += 1
+            else:
+                waits[ait] = self._inflight[ait] = self._loop.create_future()
+                self._queue.append(ait)
+                self.stats["misses"] += 1
+        if self._queue and not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._loop.call_later(self.linger, self._flush)
+        if waits:
+            # Shielded: a cancelled caller must not cancel a request other callers share
+            records = await asyncio.gather(*(asyncio.shield(f) for f in waits.values()), return_exceptions=True)
+            for ait, record in zip(waits, records):
+                if isinstance(record, BaseException):
+                    raise record
+                result[ait] = record
+        return result
+
+    def _flush(self):
+        self._flush_scheduled = False
+        queued, self._queue = self._queue, []
+        self._loop.create_task(self._fetch(queued))
+
+    async def _fetch(self, ait_numbers: List[str]):
+        self.stats["fetches"] += 1
+        try:
+            records = await self.source.fetch(ait_numbers)
+        except Exception as e:
+            self.stats["errors"] += 1
+            error = e if isinstance(e, AppHQError) else AppHQError(f"AppHQ lookup failed: {e}")
+            for ait in ait_numbers:
+                future = self._inflight.pop(ait)
+                if not future.done():
+                    future.set_exception(error)
+            return
+        now = time.monotonic()
+        for ait in ait_numbers:
+            record = records.get(ait)
+            self._cache[ait] = (now + (self.ttl if record is not None else self.negative_ttl), record)
+            self._cache.move_to_end(ait)
+            future = self._inflight.pop(ait)
+            if not future.done():
+                future.set_result(record)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    # -- called from other threads ------------------------------------------
+
+    def lookup_sync(self, ait_numbers: Iterable[str], timeout: Optional[float] = None) -> Records:
+        """Blocking lookup for synchronous callers (not from the lookup thread itself)."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("lookup_sync called from the AppHQ lookup thread")
+        return asyncio.run_coroutine_threadsafe(self.lookup(list(ait_numbers)), self._loop).result(timeout)
+
+    async def lookup_async(self, ait_numbers: Iterable[str]) -> Records:
+        """Lookup from another event loop (e.g. the API server's)."""
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self.lookup(list(ait_numbers)), self._loop))
+
+    def invalidate(self, ait_numbers: Optional[Iterable[str]] = None):
+        """Forget cached records (all of them by default)."""
+        def drop():
+            if ait_numbers is None:
+                self._cache.clear()
+            else:
+                for ait in ait_numbers:
+                    self._cache.pop(ait, None)
+        self._loop.call_soon_threadsafe(drop)
+
+    def describe(self) -> dict:
+        return {
+            **self.stats,
+            "cached": len(self._cache),
+            "inFlight": len(self._inflight),
+            "requests": self.source.requests,
+            "ttlSeconds": self.ttl,
+            "negativeTtlSeconds": self.negative_ttl,
+        }
+
+    def close(self):
+        if not self._loop.is_running():
+            return
+        asyncio.run_coroutine_threadsafe(self.source.aclose(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+
+def create_apphq_lookup(config: dict) -> Optional[AppHQLookup]:
+    """AppHQLookup for an "apphq" config section with source "http" (None for the local file)."""
+    if config.get("source", "file") != "http":
+        return None
+    source = HttpAppHQClient(
+        config["url"],
+        batch_size=config.get("batch_size", 100),
+        max_concurrency=config.get("max_concurrency", 4),
+        timeout=config.get("timeout_seconds", 10.0),
+    )
+    return AppHQLookup(
+        source,
+        ttl=config.get("ttl_seconds", 300.0),
+        negative_ttl=config.get("negative_ttl_seconds", 60.0),
+        max_entries=config.get("max_entries", 100000),
+        linger=config.get("linger_ms", 2) / 1000,
+    )
@@ -0,0 +1,161 @@
+"""Negotiated gzip/brotli compression for HTTP responses."""
+import gzip
+import zlib
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred first; brotli only when the package is installed
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header (None for identity)."""
+    if not accept_encoding:
+        return None
+    offered = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip().lower()] = q
+    for encoding in SUPPORTED_ENCODINGS:
+        if offered.get(encoding, offered.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    # mtime=0 keeps output deterministic for identical bodies
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class StreamCompressor:
+    """Incremental gzip/brotli encoder: each chunk is flushed so the client can decode it on arrival."""
+
+    def __init__(self, encoding: str, gzip_level: int = 6, brotli_quality: int = 4):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing HTTP responses above a size threshold.
+
+    Buffered responses are compressed whole; streaming responses (exports)
+    are compressed chunk by chunk as they are sent. Responses that already
+    carry a Content-Encoding (pre-compressed snapshots) and non-compressible
+    media types are passed through untouched.
+    """
+
+    COMPRESSIBLE_TYPES = ("application/json", "text/", "application/x-ndjson")
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        encoding = negotiate_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+        stream = None
+
+        def compressed_headers(length: Optional[int]):
+            headers = [(k, v) for k, v in start.get("headers") or []
+                       if k not in (b"content-length", b"vary")]
+            headers += [(b"content-encoding", encoding.encode()), (b"vary", b"Accept-Encoding")]
+            if length is not None:
+                headers.append((b"content-length", str(length).encode()))
+            return headers
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough, stream
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is not None:
+                data = stream.compress(body) if more_body else stream.compress(body) + stream.finish()
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            response_headers = dict(start.get("headers") or [])
+            content_type = response_headers.get(b"content-type", b"").decode("latin-1")
+            if (b"content-encoding" in response_headers
+                    or (not more_body and len(body) < self.minimum_size)
+                    or not content_type.startswith(self.COMPRESSIBLE_TYPES)):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if more_body:
+                # Streaming response: compress each chunk as it goes out
+                stream = StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+                await send({**start, "headers": compressed_headers(None)})
+                await send({"type": "http.response.body", "body": stream.compress(body), "more_body": True})
+                return
+
+            compressed = compress(body, encoding, self.gzip_level, self.brotli_quality)
+            await send({**start, "headers": compressed_headers(len(compressed))})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class SnapshotCompressor:
+    """Keeps the compressed form of the latest snapshot per encoding.
+
+    Keyed by a caller-supplied version (e.g. the ticket store version), so a
+    snapshot is compressed once per change rather than once per request.
+    """
+
+    def __init__(self, gzip_level: int = 6, brotli_quality: int = 4):
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._cache: Dict[str, Tuple[object, bytes]] = {}
+
+    def get(self, key, body: bytes, encoding: str) -> bytes:
+        cached = self._cache.get(encoding)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        compressed = compress(body, encoding, self.gzip_level, self.brotli_quality)
+        self._cache[encoding] = (key, compressed)
+        return compressed
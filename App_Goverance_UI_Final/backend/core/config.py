@@ -9,6 +9,8 @@ root_dir = Path(__file__).parent.parent
 env_path = root_dir / ".env"
 load_dotenv(dotenv_path=env_path)
 
+DEFAULT_CONFIG_FILE = Path(__file__).parent.parent.parent / "config" / "config.json"
+
 
 def load_config(config_file=None):
     """Load configuration from JSON file.
@@ -20,7 +22,7 @@ def load_config(config_file=None):
         dict: Configuration dictionary
     """
     if config_file is None:
-        config_file = Path(__file__).parent.parent.parent / "config" / "config.json"
+        config_file = DEFAULT_CONFIG_FILE
     
     with open(config_file, "r") as f:
         return json.load(f)
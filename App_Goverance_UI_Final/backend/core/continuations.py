@@ -0,0 +1,56 @@
+"""Continuation store for tickets paused at a human checkpoint."""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from backend.models.ticket_context import Ticket
+
+
+@dataclass
+class Continuation:
+    """Canonical pipeline state of a paused ticket.
+
+    `ticket` is the exact Ticket object the last stage produced (including
+    enrichment the frontend projection does not carry); results that live
+    on the Ticket (SLA tier, deadline, ownership) are read from it. `outputs`
+    holds stage results the resume path uses instead of recomputing them
+    but that are not Ticket fields, keyed by stage name: "evidence" is the
+    email the reviewer approved, queued as-is once the review is approved.
+    """
+    ticket: Ticket
+    checkpoint: str
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    paused_at: float = field(default_factory=time.time)
+
+
+class ContinuationStore:
+    """In-memory continuations keyed by ticket id."""
+
+    def __init__(self):
+        self._continuations: Dict[str, Continuation] = {}
+
+    def save(self, ticket_id: str, ticket: Ticket, checkpoint: str, outputs: Optional[Dict[str, Any]] = None):
+        """Park a ticket at a checkpoint, keeping outputs saved at earlier checkpoints."""
+        previous = self._continuations.get(ticket_id)
+        merged = dict(previous.outputs) if previous else {}
+        merged.update(outputs or {})
+        self._continuations[ticket_id] = Continuation(ticket=ticket, checkpoint=checkpoint, outputs=merged)
+
+    def get(self, ticket_id: str) -> Optional[Continuation]:
+        return self._continuations.get(ticket_id)
+
+    def update_ticket(self, ticket_id: str, **fields):
+        """Apply edits made while paused (e.g. a human priority override)."""
+        continuation = self._continuations.get(ticket_id)
+        if continuation is not None:
+            for name, value in fields.items():
+                setattr(continuation.ticket, name, value)
+
+    def discard(self, ticket_id: str):
+        self._continuations.pop(ticket_id, None)
+
+    def __contains__(self, ticket_id: str) -> bool:
+        return ticket_id in self._continuations
+
+    def __len__(self) -> int:
+        return len(self._continuations)
@@ -0,0 +1,45 @@
+"""Dead-letter queue for tickets whose pipeline stage failed every retry."""
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class DeadLetter:
+    """A ticket stuck at `stage` (pipeline stage index) after exhausting its retries."""
+    ticket_id: str
+    stage: int
+    stage_name: str
+    error: str
+    attempts: int
+    failed_at: float = field(default_factory=time.time)
+
+
+class DeadLetterQueue:
+    """In-memory dead letters keyed by ticket id, oldest first."""
+
+    def __init__(self):
+        self._letters: Dict[str, DeadLetter] = {}
+
+    def add(self, ticket_id: str, stage: int, stage_name: str, error: str, attempts: int) -> DeadLetter:
+        self._letters.pop(ticket_id, None)
+        letter = self._letters[ticket_id] = DeadLetter(ticket_id, stage, stage_name, error, attempts)
+        return letter
+
+    def get(self, ticket_id: str) -> Optional[DeadLetter]:
+        return self._letters.get(ticket_id)
+
+    def pop(self, ticket_id: str) -> Optional[DeadLetter]:
+        return self._letters.pop(ticket_id, None)
+
+    def ids(self) -> List[str]:
+        return list(self._letters)
+
+    def describe(self) -> List[dict]:
+        return [asdict(letter) for letter in self._letters.values()]
+
+    def __contains__(self, ticket_id: str) -> bool:
+        return ticket_id in self._letters
+
+    def __len__(self) -> int:
+        return len(self._letters)
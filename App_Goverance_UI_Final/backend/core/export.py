@@ -0,0 +1,196 @@
+"""Streaming ticket export (NDJSON, CSV, Parquet) for reporting pipelines.
+
+Tickets are read from the live store one chunk at a time and encoded as
+they go, so memory stays bounded by the chunk size rather than the number
+of tickets exported; only the list of matching ticket ids is taken up
+front. A ticket changed while an export runs is written as it is when its
+chunk is read; every row carries the ticket's store `version` so the
+consumer can keep the newest row per id.
+
+Parquet needs `pip install pyarrow`; each chunk becomes one row group.
+"""
+import asyncio
+import csv
+import io
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from backend.core.serialization import dumps
+from backend.core.stage_state import STAGES
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet") if pyarrow is not None else ("ndjson", "csv")
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Scalar ticket fields, in column order
+FIELDS = (
+    "id", "title", "description", "customer", "priority", "status", "category", "currentStage",
+    "createdAt", "slaDeadline", "slaBreached", "aitNumber", "deliverableType", "applicationName",
+    "lobOwner", "aitOwner", "armId", "deadLettered",
+)
+STAGE_COUNT = len(STAGES)
+
+
+class ExportFilter:
+    """Which tickets an export includes (empty criteria match everything)."""
+
+    def __init__(self, status: Iterable[str] = (), category: Iterable[str] = (), priority: Iterable[str] = (),
+                 stage: Optional[int] = None):
+        self.status = {s.lower() for s in status}
+        self.category = {c.upper() for c in category}
+        self.priority = {p.lower() for p in priority}
+        self.stage = stage
+
+    def __call__(self, ticket: dict) -> bool:
+        if self.status and (ticket.get("status") or "").lower() not in self.status:
+            return False
+        if self.category and (ticket.get("category") or "").upper() not in self.category:
+            return False
+        if self.priority and (ticket.get("priority") or "").lower() not in self.priority:
+            return False
+        if self.stage is not None and ticket.get("currentStage") != self.stage:
+            return False
+        return True
+
+
+def _stage_columns() -> List[str]:
+    return [f"stage{i}{part}" for i in range(1, STAGE_COUNT + 1) for part in ("Status", "Message")]
+
+
+def columns(include_stages: bool = True, include_logs: bool = True) -> List[str]:
+    names = ["version", *FIELDS, "contacts"]
+    if include_stages:
+        names += _stage_columns()
+    if include_logs:
+        names.append("logs")
+    return names
+
+
+def flat_row(ticket: dict, version: Optional[int], include_stages: bool, include_logs: bool) -> Dict[str, object]:
+    """A ticket as one flat record (the CSV / Parquet row)"""
+    row = {"version": version, **{f: ticket.get(f) for f in FIELDS}}
+    row["contacts"] = "; ".join(ticket.get("contacts") or [])
+    if include_stages:
+        stages = ticket["stages"]
+        for i in range(STAGE_COUNT):
+            row[f"stage{i + 1}Status"] = stages.status(i)
+            row[f"stage{i + 1}Message"] = stages.message(i)
+    if include_logs:
+        row["logs"] = "\n".join(ticket.get("logs") or [])
+    return row
+
+
+class TicketExporter:
+    """Encodes the tickets of a store as a stream of byte chunks.
+
+    Args:
+        store: TicketStore (or any mapping with `ticket_version`)
+        fragment: optional ticket id -> cached JSON bytes (full tickets only)
+    """
+
+    def __init__(self, store, fragment: Optional[Callable[[str], bytes]] = None, chunk_size: int = 500):
+        self.store = store
+        self.fragment = fragment
+        self.chunk_size = max(1, chunk_size)
+
+    def _chunks(self, ticket_ids: List[str], matches: ExportFilter):
+        """Lists of (id, ticket, version) per chunk, skipping removed and non-matching tickets"""
+        for start in range(0, len(ticket_ids), self.chunk_size):
+            chunk = []
+            for ticket_id in ticket_ids[start:start + self.chunk_size]:
+                ticket = self.store.get(ticket_id)
+                if ticket is not None and matches(ticket):
+                    chunk.append((ticket_id, ticket, self.store.ticket_version(ticket_id)))
+            yield chunk
+
+    async def stream(self, fmt: str, matches: Optional[ExportFilter] = None,
+                     ticket_ids: Optional[List[str]] = None,
+                     include_stages: bool = True, include_logs: bool = True) -> AsyncIterator[bytes]:
+        """Yield the export body chunk by chunk, letting other tasks run in between."""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        matches = matches or ExportFilter()
+        ticket_ids = list(self.store.keys()) if ticket_ids is None else ticket_ids
+        encode = {"ndjson": self._ndjson, "csv": self._csv, "parquet": self._parquet}[fmt]
+        for data in encode(self._chunks(ticket_ids, matches), include_stages, include_logs):
+            if data:
+                yield data
+            await asyncio.sleep(0)
+
+    def _ndjson(self, chunks, include_stages: bool, include_logs: bool):
+        full = include_stages and include_logs and self.fragment is not None
+        for chunk in chunks:
+            lines = []
+            for ticket_id, ticket, version in chunk:
+                if full:
+                    body = self.fragment(ticket_id)
+                else:
+                    record = {k: v for k, v in ticket.items()
+                              if (include_stages or k != "stages") and (include_logs or k != "logs")}
+                    body = dumps(record)
+                # Splice the version in front of the ticket's own fields
+                lines.append(b'{"version":%d,' % (version or 0) + body[1:])
+            yield b"\n".join(lines) + b"\n" if lines else b""
+
+    def _csv(self, chunks, include_stages: bool, include_logs: bool):
+        names = columns(include_stages, include_logs)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=names, lineterminator="\n")
+        writer.writeheader()
+        for chunk in chunks:
+            for _, ticket, version in chunk:
+                writer.writerow(flat_row(ticket, version, include_stages, include_logs))
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    def _parquet(self, chunks, include_stages: bool, include_logs: bool):
+        names = columns(include_stages, include_logs)
+        types = {"version": pyarrow.int64(), "currentStage": pyarrow.int64(),
+                 "slaBreached": pyarrow.bool_(), "deadLettered": pyarrow.bool_()}
+        schema = pyarrow.schema([(name, types.get(name, pyarrow.string())) for name in names])
+        sink = _Drain()
+        with pyarrow.parquet.ParquetWriter(sink, schema) as writer:
+            for chunk in chunks:
+                if chunk:
+                    rows = [flat_row(t, v, include_stages, include_logs) for _, t, v in chunk]
+                    for row in rows:
+                        for name, value in row.items():
+                            if value is not None and types.get(name) is None and not isinstance(value, str):
+                                row[name] = str(value)
+                    writer.write_table(pyarrow.Table.from_pylist(rows, schema=schema))
+                yield sink.drain()
+        yield sink.drain()  # footer
+
+
+class _Drain(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
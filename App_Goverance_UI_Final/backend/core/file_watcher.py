@@ -0,0 +1,66 @@
+"""Watch data files for changes (inotify via watchfiles, polling fallback)."""
+import asyncio
+import os
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+try:
+    from watchfiles import awatch  # inotify on Linux, FSEvents/ReadDirectoryChangesW elsewhere
+except ImportError:
+    awatch = None
+
+
+def _stat_token(path: str) -> Optional[str]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class FileWatcher:
+    """Calls `on_change(path)` whenever one of the watched files changes.
+
+    Parent directories are watched rather than the files themselves so that
+    editors which save by replacing the file are still picked up.
+    """
+
+    def __init__(self, paths: Iterable[str], on_change: Callable[[str], Awaitable[None]],
+                 poll_interval: float = 1.0, use_inotify: bool = True):
+        self.paths = {str(Path(p).resolve()) for p in paths}
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and awatch is not None
+
+    async def run(self):
+        if self.use_inotify:
+            try:
+                await self._run_inotify()
+                return
+            except Exception as e:
+                print(f"File watcher: inotify unavailable ({e}), falling back to polling")
+        await self._run_polling()
+
+    async def _notify(self, path: str):
+        try:
+            await self.on_change(path)
+        except Exception as e:
+            print(f"Error handling change of {path}: {e}")
+
+    async def _run_inotify(self):
+        dirs = sorted({str(Path(p).parent) for p in self.paths})
+        async for changes in awatch(*dirs):
+            changed = {str(Path(p).resolve()) for _, p in changes} & self.paths
+            for path in sorted(changed):
+                await self._notify(path)
+
+    async def _run_polling(self):
+        tokens: Dict[str, Optional[str]] = {p: _stat_token(p) for p in self.paths}
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            for path in sorted(self.paths):
+                token = _stat_token(path)
+                if token != tokens[path]:
+                    tokens[path] = token
+                    if token is not None:
+                        await self._notify(path)
@@ -0,0 +1,92 @@
+"""Shared, pooled HTTP transport for the LLM clients.
+
+Every ChatOpenAI the process builds gets the same httpx clients, so the
+agents share one connection pool per process with explicit limits,
+keep-alive and timeouts instead of the OpenAI SDK defaults:
+
+    "llm": {..., "http": {"max_connections": 20, "max_keepalive_connections": 10,
+                          "keepalive_expiry_seconds": 30, "connect_timeout_seconds": 5,
+                          "pool_timeout_seconds": 10, "http2": false}}
+
+HTTP/2 needs `pip install h2`; without it the transport stays on HTTP/1.1.
+The async client binds its connections to the event loop that first uses
+it, so async callers should all run on one loop (the API server's).
+
+backend/mocks/llm_server.py is an OpenAI-compatible stand-in for local
+testing and benchmarks (point "base_url" at it).
+"""
+from typing import Optional
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+
+class LLMTransport:
+    """Sync and async httpx clients sharing one set of pool limits and timeouts."""
+
+    def __init__(self, max_connections: int = 20, max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 30.0, connect_timeout: float = 5.0,
+                 read_timeout: Optional[float] = 60.0, pool_timeout: float = 10.0, http2: bool = False):
+        if http2 and h2 is None:
+            print("⚠️ LLM transport: http2 requested but the 'h2' package is not installed, using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout, pool=pool_timeout)
+        self.client = httpx.Client(limits=self.limits, timeout=self.timeout, http2=http2)
+        self.async_client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=http2)
+
+    def chat_model(self, llm_config: dict, api_key: str) -> ChatOpenAI:
+        """ChatOpenAI for an "llm" config section, using this transport."""
+        return ChatOpenAI(
+            model=llm_config["model"],
+            temperature=llm_config["temperature"],
+            api_key=api_key,
+            base_url=llm_config["base_url"],
+            max_tokens=llm_config.get("max_tokens", 500),
+            timeout=llm_config.get("timeout_seconds"),
+            max_retries=llm_config.get("max_retries", 2),
+            http_client=self.client,
+            http_async_client=self.async_client,
+        )
+
+    def describe(self) -> dict:
+        return {
+            "maxConnections": self.limits.max_connections,
+            "maxKeepaliveConnections": self.limits.max_keepalive_connections,
+            "keepaliveExpirySeconds": self.limits.keepalive_expiry,
+            "connectTimeoutSeconds": self.timeout.connect,
+            "readTimeoutSeconds": self.timeout.read,
+            "poolTimeoutSeconds": self.timeout.pool,
+            "http2": self.http2,
+        }
+
+    def close(self):
+        self.client.close()
+
+    async def aclose(self):
+        self.client.close()
+        await self.async_client.aclose()
+
+
+def create_llm_transport(llm_config: dict) -> LLMTransport:
+    """LLMTransport for an "llm" config section (its "http" subsection, read timeout from "timeout_seconds")."""
+    http = llm_config.get("http", {})
+    return LLMTransport(
+        max_connections=http.get("max_connections", 20),
+        max_keepalive_connections=http.get("max_keepalive_connections", 10),
+        keepalive_expiry=http.get("keepalive_expiry_seconds", 30.0),
+        connect_timeout=http.get("connect_timeout_seconds", 5.0),
+        read_timeout=llm_config.get("timeout_seconds", 60.0),
+        pool_timeout=http.get("pool_timeout_seconds", 10.0),
+        http2=http.get("http2", False),
+    )
@@ -1,21 +1,33 @@
+import copy
+
 from backend.agents.human_approval import HumanApprovalAgent
 from backend.agents.ticket_fetcher import TicketFetcherAgent
 from backend.agents.category_checker import CategoryCheckerAgent
-from backend.agents.sla_prioritizer import SLAPrioritizerAgent
+from backend.agents.sla_prioritizer import SLAPrioritizerAgent, sla_risk_level
 from backend.agents.apphq_portal import AppHQResolverAgent
 from backend.agents.app_owner_check import AppOwnerCheckerAgent
 from backend.agents.evidence_collector import EvidenceCollectorAgent
 from backend.agents.closer import CloserAgent
 from backend.agents.logger import LoggerAgent
-from backend.core.config import load_config
+from backend.agents.stub_agents import wrap_stub_agents
+from backend.core.apphq_client import create_apphq_lookup
+from backend.core.config import DEFAULT_CONFIG_FILE, load_config
+from backend.core.llm_transport import create_llm_transport
+from backend.core.policy import PolicyEngine
+from backend.core.stage_cache import MISS, RunSummary, StageCache, chain_key, content_hash
 from backend.models.ticket_context import TicketResponse
-from langchain_openai import ChatOpenAI
 
 class IAMOrchestrator:
-    def __init__(self, api_key, config_file=None):
+    def __init__(self, api_key, config_file=None, agent_backend=None):
         
         # ✅ Load config.json
+        self.config_file = str(config_file or DEFAULT_CONFIG_FILE)
         self.config = load_config(config_file)
+        agents_config = self.config.get("agents", {})
+        self.agent_backend = agent_backend or agents_config.get("backend", "llm")
+
+        # ✅ Compile selection policies once (reloaded when config.json changes)
+        self.policies = PolicyEngine(self.config.get("policies"))
 
         # ✅ Step 1: Initialize your LLM once
         # llm = ChatOpenAI(
@@ -25,23 +37,30 @@ class IAMOrchestrator:
         #     base_url="https://openrouter.ai/api/v1"
         # )
 
-        llm = ChatOpenAI(
-            model=self.config["llm"]["model"],
-            temperature=self.config["llm"]["temperature"],
-            api_key=api_key,
-            base_url=self.config["llm"]["base_url"],
-            max_tokens=500
-        )
+        # Stub backend: no LLM at all (agents run their deterministic logic)
+        # LLM backend: one pooled HTTP transport shared by every LLM client
+        llm = None
+        self.llm_transport = None
+        if self.agent_backend != "stub":
+            self.llm_transport = create_llm_transport(self.config["llm"])
+            llm = self.llm_transport.chat_model(self.config["llm"], api_key)
 
         # ✅ Pass LLM into agents
         self.fetcher = TicketFetcherAgent(llm=llm)
-        self.categorizer = CategoryCheckerAgent(llm=llm)
+        self.categorizer = CategoryCheckerAgent(llm=llm, policies=self.policies)
         self.sla = SLAPrioritizerAgent(llm=llm)
-        self.ownership = AppHQResolverAgent(llm=llm)
-        self.app_space_checker = AppOwnerCheckerAgent(llm=llm)
+        # AppHQ: the local data file, or a remote service behind a cached, coalescing client
+        self.apphq = create_apphq_lookup(self.config.get("apphq", {}))
+        self.ownership = AppHQResolverAgent(llm=llm, client=self.apphq)
+        self.app_space_checker = AppOwnerCheckerAgent(llm=llm, policies=self.policies)
         self.evidence = EvidenceCollectorAgent(llm=llm)
         self.closer = CloserAgent(llm=llm)
         self.logger = LoggerAgent(llm=llm)
+        if self.agent_backend == "stub":
+            wrap_stub_agents(self, agents_config.get("stub", {}))
+
+        # ✅ Stage outputs of the last run, reused for tickets whose inputs are unchanged
+        self.stage_cache = StageCache()
         #self.human_approval = HumanApprovalAgent(llm=llm)
 
     # def checkpoint(self, stage: str, tickets: TicketResponse):
@@ -50,47 +69,105 @@ class IAMOrchestrator:
     #         return self.human_approval.invoke(tickets, stage)
     #     return None
 
+    def reload_policies(self):
+        """Recompile policies from config.json; a bad config keeps the current rules."""
+        self.policies.reload(load_config(self.config_file).get("policies"))
+
+    def _cached_stage(self, stage, tickets, keys, invoke, summary, extra=None, collect=None):
+        """Invoke a stage only for tickets whose inputs changed since the last run.
+
+        `extra(ticket)` adds stage-specific inputs to the ticket's key;
+        `collect(result, tickets)` maps the agent result to outputs by
+        ticket id (default: the returned tickets, missing ones filtered out).
+
+        Returns:
+            tuple: (outputs aligned with `tickets`, None where filtered out; stage keys by ticket id)
+        """
+        stage_keys, outputs, misses = {}, {}, []
+        for t in tickets:
+            key = stage_keys[t.ticket_id] = chain_key(keys[t.ticket_id], stage, extra(t) if extra else "")
+            cached = self.stage_cache.get(t.ticket_id, stage, key)
+            if cached is MISS:
+                misses.append(t)
+            else:
+                outputs[t.ticket_id] = copy.copy(cached)  # later stages edit tickets in place
+        if misses:
+            result = invoke(TicketResponse(tickets=misses))
+            fresh = collect(result, misses) if collect else {t.ticket_id: t for t in result.tickets}
+            for t in misses:
+                output = outputs[t.ticket_id] = fresh.get(t.ticket_id)
+                self.stage_cache.put(t.ticket_id, stage, stage_keys[t.ticket_id], copy.copy(output))
+        summary.record(stage, len(tickets) - len(misses), [t.ticket_id for t in misses])
+        return [outputs[t.ticket_id] for t in tickets], stage_keys
+
+    def _apphq_version(self, tickets):
+        """Per-ticket hash of its AppHQ record (records fetched in one batched lookup per run)."""
+        get_records = getattr(self.ownership, "records", None)
+        if get_records is None:
+            return lambda t: ""
+        records = get_records({t.ait_number for t in tickets if t.ait_number})
+        versions = {ait: content_hash(record) for ait, record in records.items()}
+        return lambda t: versions.get(t.ait_number, "")
+
     def run(self):
         # Step 1: Fetch tickets
         tickets = self.fetcher.invoke()
+        self.stage_cache.retain(t.ticket_id for t in tickets.tickets)
+        summary = RunSummary(len(tickets.tickets))
+        keys = {t.ticket_id: content_hash(t) for t in tickets.tickets}
 
         # ✅ If no IAM tickets, skip rest of pipeline and log
         if not tickets.tickets:
             logs = self.logger.invoke(TicketResponse(tickets=[]),"No tickets found")
-            return {"tickets": [], "emails": [], "logs": logs}
+            return {"tickets": [], "closed": [], "emails": [], "logs": logs, "summary": summary.as_dict()}
 
         # Step 2: Categortize tickets
-        categorized = self.categorizer.invoke(tickets)
+        categorized, keys = self._cached_stage(
+            "category", tickets.tickets, keys, self.categorizer.invoke, summary,
+            extra=lambda t: self.policies.get("category").fingerprint,
+        )
+        categorized = [t for t in categorized if t is not None]
 
         # ✅ If no IAM tickets, skip rest of pipeline and log
-        if not categorized.tickets:
+        if not categorized:
             logs = self.logger.invoke(TicketResponse(tickets=[]),"No IAM category tickets found")
-            return {"tickets": [], "emails": [], "logs": logs}
+            return {"tickets": [], "closed": [], "emails": [], "logs": logs, "summary": summary.as_dict()}
         
-        # Step 3: Prioritize SLA
-        prioritized = self.sla.invoke(categorized)
+        # Step 3: Prioritize SLA (the risk tier moves with the clock, so it is part of the key)
+        prioritized, keys = self._cached_stage(
+            "sla", categorized, keys, self.sla.invoke, summary,
+            extra=lambda t: sla_risk_level(t.sla_deadline),
+        )
+        prioritized = [t for t in prioritized if t is not None]
 
         #✅ Checkpoint for HITL after SLA prioritization
         # hitl = self.checkpoint("SLA", prioritized)
         # if hitl: return hitl
 
         # Step 4: Enrich with App HQ details
-        enriched = self.ownership.invoke(prioritized)
+        enriched, keys = self._cached_stage(
+            "ownership", prioritized, keys, self.ownership.invoke, summary, extra=self._apphq_version(prioritized),
+        )
+        enriched = [t for t in enriched if t is not None]
 
-        if not enriched.tickets:
+        if not enriched:
             logs = self.logger.invoke(TicketResponse(tickets=[]),"No AIT owners details found")
-            return {"tickets": [], "emails": [], "logs": logs}
+            return {"tickets": [], "closed": [], "emails": [], "logs": logs, "summary": summary.as_dict()}
         
          #✅ Checkpoint for HITL after Ownership enrichment
         # hitl = self.checkpoint("Ownership", enriched)
         # if hitl: return hitl
 
         # Step 5: Filter by App Owner space
-        filtered = self.app_space_checker.invoke(enriched)
+        filtered, keys = self._cached_stage(
+            "app_owner", enriched, keys, self.app_space_checker.invoke, summary,
+            extra=lambda t: self.policies.get("owner_space").fingerprint,
+        )
+        filtered = [t for t in filtered if t is not None]
 
-        if not filtered.tickets:
+        if not filtered:
             logs = self.logger.invoke(TicketResponse(tickets=[]),"No App owners in our space")
-            return {"tickets": [], "emails": [], "logs": logs}
+            return {"tickets": [], "closed": [], "emails": [], "logs": logs, "summary": summary.as_dict()}
         
         #✅ Checkpoint for HITL after App Owner space check
         # hitl = self.checkpoint("EvidenceCollector", filtered)
@@ -99,17 +176,27 @@ class IAMOrchestrator:
         #✅ Mock mode (just prepare emails)
         #✅ Real mode (send via SMTP) send=True
         
-        #Step 6: Collect evidence emails
-        emails = self.evidence.invoke(filtered, send=False)
+        #Step 6: Collect evidence emails (one per ticket, in order)
+        emails, _ = self._cached_stage(
+            "evidence", filtered, keys, lambda batch: self.evidence.invoke(batch, send=False), summary,
+            collect=lambda result, batch: dict(zip([t.ticket_id for t in batch], result.get("emails", []))),
+        )
+        emails = {"emails": [e for e in emails if e is not None]}
         
         #✅ Checkpoint for HITL after Evidence Collection
         # hitl = self.checkpoint("Closer", filtered)
         # if hitl: return hitl
 
         # Step 7: Close tickets
-        closed = self.closer.invoke(filtered)
+        closed, _ = self._cached_stage("closer", filtered, keys, self.closer.invoke, summary)
+        closed = TicketResponse(tickets=[t for t in closed if t is not None])
 
-        # Step 8: Always log at the end
+        # Step 8: Always log at the end (every ticket, skipped or not: the log records this run)
         logs = self.logger.invoke(closed)
 
-        return {"tickets": filtered, "emails": emails, "logs": logs}
+        result = summary.as_dict()
+        print(f"Run summary: {result['skippedTickets']}/{result['tickets']} tickets and "
+              f"{result['skippedStages']} stage runs skipped (inputs unchanged)")
+        # "tickets": every ticket that passed the filters (as before); "closed": the closer's output
+        return {"tickets": TicketResponse(tickets=filtered), "closed": closed, "emails": emails, "logs": logs,
+                "summary": result}
@@ -0,0 +1,408 @@
+"""Durable email outbox and the async spooler that delivers it.
+
+The pipeline only enqueues: a message is written to an SQLite table (one
+row per ticket and email kind, so re-running a stage cannot queue a second
+copy) and the ticket moves on. `OutboxSpooler` claims due rows, delivers
+them on worker threads with bounded concurrency and retries failures with
+exponential backoff until `max_attempts`.
+
+A row is marked sent only after the transport accepted it, and a sent row
+is never claimed again. A worker that dies mid-delivery leaves its row
+"sending"; the row is reclaimed once its lease expires, which is the only
+case a message can go out twice. Each message carries a Message-ID derived
+from its ticket and kind so receivers can discard such a duplicate.
+
+Digest mode collapses a recipient's messages into one: rows queued with a
+`digest_key` (the recipient) are held until the oldest has waited
+`window_seconds` (or `max_items` are waiting), then claimed together,
+rendered as one message and sent once. Each ticket keeps its own row, so
+inclusion is tracked per ticket; the rows of one digest share a digest_id,
+a hash of their row ids. A digest whose send failed or whose lease expired
+is claimed again as the same rows with the same digest_id, so the resend
+carries the same Message-ID.
+
+Configured under "email_outbox" in config/config.json; `transport` is
+"smtp" (real delivery) or "log" (print the message and mark it sent).
+"""
+import asyncio
+import email
+import email.policy
+import hashlib
+import json
+import smtplib
+import sqlite3
+import threading
+import time
+from email.message import Message
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from backend.core.retry import RetryPolicy
+
+STATUSES = ("pending", "sending", "sent", "failed")
+
+OnStatus = Callable[[str, dict], Awaitable[None]]
+RenderDigest = Callable[[str, List[dict]], Message]
+
+MESSAGE_ID_DOMAIN = "ticket-portal"
+
+
+def message_id(key: str) -> str:
+    """Deterministic Message-ID for `key` (unlike make_msgid, the same on every send)."""
+    return f"<{key}@{MESSAGE_ID_DOMAIN}>"
+
+
+# Columns added after the first release of the table (migrated in place)
+LATER_COLUMNS = {"digest_key": "TEXT", "item": "TEXT", "digest_id": "TEXT"}
+
+
+class EmailOutbox:
+    """SQLite-backed queue of outgoing messages (safe to share between worker processes)."""
+
+    def __init__(self, db_path: str, lease_seconds: float = 300.0):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the stage executor threads (enqueue) and the
+        # spooler; the lock keeps one caller's statements out of another's transaction
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, ticket_id TEXT NOT NULL, kind TEXT NOT NULL, "
+            "recipients TEXT NOT NULL, subject TEXT, message BLOB NOT NULL, "
+            "status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+            "next_attempt_at REAL NOT NULL, last_error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+            "digest_key TEXT, item TEXT, digest_id TEXT, "
+            "UNIQUE (ticket_id, kind))"
+        )
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(outbox)")}
+        for column, sql_type in LATER_COLUMNS.items():
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE outbox ADD COLUMN {column} {sql_type}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+
+    def enqueue(self, ticket_id: str, kind: str, msg: Message,
+                digest_key: Optional[str] = None, item: Optional[dict] = None) -> tuple:
+        """Queue `msg` for a ticket unless one of this kind is already queued or sent.
+
+        With a `digest_key` the message is sent as part of that key's digest
+        (rendered from `item`) rather than on its own.
+
+        Returns:
+            tuple: (row id, True if newly queued)
+        """
+        with self._lock:
+            if msg["Message-ID"] is None:
+                msg["Message-ID"] = message_id(
+                    hashlib.blake2b(f"{ticket_id}:{kind}".encode(), digest_size=8).hexdigest())
+            now = time.time()
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO outbox (ticket_id, kind, recipients, subject, message, next_attempt_at, "
+                "created_at, updated_at, digest_key, item) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (ticket_id, kind, msg["To"] or "", msg["Subject"], msg.as_bytes(), now, now, now,
+                 digest_key, None if item is None else json.dumps(item)),
+            )
+            if cursor.rowcount:
+                return cursor.lastrowid, True
+            row = self.conn.execute("SELECT id FROM outbox WHERE ticket_id = ? AND kind = ?",
+                                    (ticket_id, kind)).fetchone()
+            return row[0], False
+
+    def _release_expired(self, now: float):
+        """Return rows whose sender's lease ran out to pending (call inside a transaction)."""
+        self.conn.execute(
+            "UPDATE outbox SET status = 'pending' WHERE status = 'sending' AND updated_at <= ?",
+            (now - self.lease_seconds,),
+        )
+
+    def _take(self, rows: list, now: float, digest_id: Optional[str] = None):
+        self.conn.executemany(
+            "UPDATE outbox SET status = 'sending', attempts = attempts + 1, updated_at = ?, digest_id = ? WHERE id = ?",
+            [(now, digest_id, row[0]) for row in rows],
+        )
+
+    def claim(self, limit: int) -> List[dict]:
+        """Mark up to `limit` due non-digest messages as sending (this caller's) and return them."""
+        with self._lock:
+            now = time.time()
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._release_expired(now)
+                rows = self.conn.execute(
+                    "SELECT id, ticket_id, kind, recipients, message, attempts FROM outbox "
+                    "WHERE status = 'pending' AND next_attempt_at <= ? AND digest_key IS NULL "
+                    "ORDER BY next_attempt_at LIMIT ?",
+                    (now, limit),
+                ).fetchall()
+                self._take(rows, now)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            return [
+                {"id": r[0], "ticket_id": r[1], "kind": r[2], "recipients": r[3], "message": r[4], "attempts": r[5] + 1}
+                for r in rows
+            ]
+
+    def claim_digests(self, limit: int, window: float, max_items: int) -> List[dict]:
+        """Claim the due messages of up to `limit` digest keys that are ready to send.
+
+        A key is ready once its oldest due message has waited `window`
+        seconds or `max_items` are waiting; at most `max_items` go in one digest.
+
+        Returns:
+            list: {"digest_id", "digest_key", "kind", "rows": [{"id", "ticket_id", "item", "attempts"}]}
+        """
+        with self._lock:
+            now = time.time()
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._release_expired(now)
+                ready = self.conn.execute(
+                    "SELECT digest_key, kind FROM outbox "
+                    "WHERE status = 'pending' AND next_attempt_at <= ? AND digest_key IS NOT NULL "
+                    "GROUP BY digest_key, kind HAVING MIN(created_at) <= ? OR COUNT(*) >= ? "
+                    "ORDER BY MIN(created_at) LIMIT ?",
+                    (now, now - window, max_items, limit),
+                ).fetchall()
+                digests = []
+                for digest_key, kind in ready:
+                    # Rows of an earlier attempt at a digest first, claimed again as that digest
+                    rows = self.conn.execute(
+                        "SELECT id, ticket_id, item, attempts, digest_id FROM outbox WHERE status = 'pending' "
+                        "AND next_attempt_at <= ? AND digest_key = ? AND kind = ? "
+                        "ORDER BY digest_id IS NULL, digest_id, created_at LIMIT ?",
+                        (now, digest_key, kind, max_items),
+                    ).fetchall()
+                    digest_id = rows[0][4]
+                    if digest_id is None:
+                        digest_id = hashlib.blake2b(
+                            ",".join(str(r[0]) for r in sorted(rows)).encode(), digest_size=8,
+                        ).hexdigest()
+                    else:
+                        rows = [r for r in rows if r[4] == digest_id]
+                    self._take(rows, now, digest_id)
+                    digests.append({
+                        "digest_id": digest_id, "digest_key": digest_key, "kind": kind,
+                        "rows": [
+                            {"id": r[0], "ticket_id": r[1], "item": json.loads(r[2] or "{}"), "attempts": r[3] + 1}
+                            for r in rows
+                        ],
+                    })
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            return digests
+
+    def mark_sent(self, message_id: int):
+        with self._lock:
+            self.conn.execute("UPDATE outbox SET status = 'sent', last_error = NULL, updated_at = ? WHERE id = ?",
+                              (time.time(), message_id))
+
+    def mark_retry(self, message_id: int, error: str, delay: float):
+        with self._lock:
+            now = time.time()
+            self.conn.execute(
+                "UPDATE outbox SET status = 'pending', last_error = ?, next_attempt_at = ?, updated_at = ? "
+                "WHERE id = ?",
+                (error, now + delay, now, message_id),
+            )
+
+    def mark_failed(self, message_id: int, error: str):
+        with self._lock:
+            self.conn.execute("UPDATE outbox SET status = 'failed', last_error = ?, updated_at = ? WHERE id = ?",
+                              (error, time.time(), message_id))
+
+    def requeue(self, message_id: int) -> bool:
+        """Give a failed message a fresh set of attempts."""
+        with self._lock:
+            now = time.time()
+            cursor = self.conn.execute(
+                "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'failed'",
+                (now, now, message_id),
+            )
+            return cursor.rowcount > 0
+
+    def get(self, message_id: int) -> Optional[dict]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id, ticket_id, kind, recipients, subject, status, attempts, last_error, created_at, "
+                "updated_at, digest_id FROM outbox WHERE id = ?", (message_id,),
+            ).fetchone()
+            return None if row is None else _row_dict(row)
+
+    def describe(self, recent_failures: int = 20) -> dict:
+        with self._lock:
+            counts = dict.fromkeys(STATUSES, 0)
+            counts.update(self.conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+            failed = self.conn.execute(
+                "SELECT id, ticket_id, kind, recipients, subject, status, attempts, last_error, created_at, "
+                "updated_at, digest_id FROM outbox WHERE status = 'failed' ORDER BY updated_at DESC LIMIT ?",
+                (recent_failures,),
+            ).fetchall()
+            digests, digested = self.conn.execute(
+                "SELECT COUNT(DISTINCT digest_id), COUNT(digest_id) FROM outbox WHERE status = 'sent'"
+            ).fetchone()
+            return {
+                "counts": counts,
+                "digests": {"sent": digests, "tickets": digested},
+                "failed": [_row_dict(r) for r in failed],
+            }
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def _row_dict(row) -> dict:
+    keys = ("id", "ticketId", "kind", "to", "subject", "status", "attempts", "error", "createdAt", "updatedAt",
+            "digestId")
+    return dict(zip(keys, row))
+
+
+def smtp_transport(smtp_config: dict) -> Callable[[bytes], None]:
+    """Deliver a raw message over SMTP; raises on any failure."""
+    def send(raw: bytes):
+        msg = email.message_from_bytes(raw, policy=email.policy.default)
+        with smtplib.SMTP(smtp_config["server"], smtp_config["port"],
+                          timeout=smtp_config.get("timeout_seconds", 30)) as server:
+            if smtp_config.get("use_tls", True):
+                server.starttls()
+            server.login(smtp_config["user"], smtp_config["password"])
+            server.send_message(msg)
+    return send
+
+
+def log_transport(raw: bytes):
+    msg = email.message_from_bytes(raw, policy=email.policy.default)
+    print(f"Outbox (log transport): to={msg['To']} subject={msg['Subject']!r}")
+
+
+class OutboxSpooler:
+    """Delivers due outbox messages with at most `concurrency` sends in flight.
+
+    With `render_digest` (recipient, items -> message) digest rows are sent
+    as one message per recipient, batched over `digest_window` seconds.
+    """
+
+    def __init__(self, outbox: EmailOutbox, send: Callable[[bytes], None], concurrency: int = 4,
+                 retry: Optional[RetryPolicy] = None, poll_interval: float = 5.0,
+                 on_status: Optional[OnStatus] = None, render_digest: Optional[RenderDigest] = None,
+                 digest_window: float = 60.0, digest_max_items: int = 50):
+        self.outbox = outbox
+        self.send = send
+        self.concurrency = max(1, concurrency)
+        self.retry = retry or RetryPolicy(max_attempts=5, base_delay=30.0, max_delay=900.0)
+        self.poll_interval = poll_interval
+        self.on_status = on_status
+        self.render_digest = render_digest
+        self.digest_window = digest_window
+        self.digest_max_items = max(1, digest_max_items)
+        self.delivered = 0
+        self.digests = 0
+        self.failures = 0
+        self._in_flight: Dict[object, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def wake(self):
+        """Deliver newly queued messages now instead of at the next poll."""
+        self._wakeup.set()
+
+    async def stop(self):
+        tasks = [t for t in [self._task, *self._in_flight.values()] if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                free = self.concurrency - len(self._in_flight)
+                if free > 0 and self.render_digest is not None:
+                    for digest in self.outbox.claim_digests(free, self.digest_window, self.digest_max_items):
+                        self._in_flight[digest["digest_id"]] = asyncio.create_task(self._deliver_digest(digest))
+                free = self.concurrency - len(self._in_flight)
+                if free > 0:
+                    for row in self.outbox.claim(free):
+                        self._in_flight[row["id"]] = asyncio.create_task(self._deliver(row))
+            except sqlite3.Error as e:
+                print(f"Outbox: claim failed: {e}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _settle(self, row: dict, error: Optional[str]) -> str:
+        """Record one row's delivery outcome; returns its new status."""
+        if error is None:
+            self.outbox.mark_sent(row["id"])
+            self.delivered += 1
+            return "sent"
+        if row["attempts"] >= self.retry.max_attempts:
+            self.outbox.mark_failed(row["id"], error)
+            return "failed"
+        self.outbox.mark_retry(row["id"], error, self.retry.delay(row["attempts"]))
+        return "retrying"
+
+    async def _send(self, raw: bytes) -> Optional[str]:
+        try:
+            await asyncio.to_thread(self.send, raw)
+            return None
+        except Exception as e:
+            self.failures += 1
+            return f"{type(e).__name__}: {e}"
+
+    async def _deliver(self, row: dict):
+        try:
+            error = await self._send(row["message"])
+            if error is not None:
+                print(f"Outbox: delivery of message {row['id']} for {row['ticket_id']} failed "
+                      f"(attempt {row['attempts']}/{self.retry.max_attempts}): {error}")
+            state = self._settle(row, error)
+            if self.on_status is not None:
+                await self.on_status(row["ticket_id"], {
+                    "kind": row["kind"], "status": state, "attempts": row["attempts"],
+                    "to": row["recipients"], "error": error, "updatedAt": time.time(),
+                })
+        finally:
+            self._in_flight.pop(row["id"], None)
+            self._wakeup.set()  # a slot is free
+
+    async def _deliver_digest(self, digest: dict):
+        rows = digest["rows"]
+        try:
+            try:
+                msg = self.render_digest(digest["digest_key"], [row["item"] for row in rows])
+                if msg["Message-ID"] is None:
+                    msg["Message-ID"] = message_id(f"digest-{digest['digest_id']}")
+                error = await self._send(msg.as_bytes())
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            if error is not None:
+                print(f"Outbox: digest {digest['digest_id']} of {len(rows)} message(s) to "
+                      f"{digest['digest_key']} failed: {error}")
+            else:
+                self.digests += 1
+            for row in rows:
+                state = self._settle(row, error)
+                if self.on_status is not None:
+                    await self.on_status(row["ticket_id"], {
+                        "kind": digest["kind"], "status": state, "attempts": row["attempts"],
+                        "to": digest["digest_key"], "error": error, "updatedAt": time.time(),
+                        "digest": {"id": digest["digest_id"], "tickets": len(rows)},
+                    })
+        finally:
+            self._in_flight.pop(digest["digest_id"], None)
+            self._wakeup.set()
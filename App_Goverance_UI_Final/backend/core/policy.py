@@ -0,0 +1,139 @@
+"""Config-driven ticket selection policies, compiled once into fast predicates.
+
+Declared under "policies" in config/config.json:
+
+    "owner_space": {
+        "rules": [
+            {"name": "allowed-space", "field": "application_owner", "in": ["IAM-Space", "Security-Space"]},
+            {"name": "demo-email", "field": "application_owner", "regex": "@example\\.com$", "ignore_case": true}
+        ],
+        "set": {}
+    }
+
+A ticket is selected when any rule matches; `set` assigns fields on the
+selected tickets. `in` lists compile to frozensets and `regex` to compiled
+patterns (search semantics). Empty field values never match.
+"""
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from backend.core.stage_cache import content_hash
+
+# Behaviour before policies were configurable; used when config has no "policies"
+DEFAULT_POLICIES = {
+    "category": {
+        "rules": [{"name": "iam-category", "field": "category", "in": ["IAM"], "ignore_case": True}],
+        "set": {"deliverableType": "IAM Category"},
+    },
+    "owner_space": {
+        "rules": [
+            {"name": "allowed-space", "field": "application_owner", "in": ["IAM-Space", "Security-Space"]},
+            {"name": "demo-email", "field": "application_owner", "regex": "@example\\.com"},
+        ],
+    },
+}
+
+
+class Rule:
+    """One compiled predicate over a single ticket field."""
+
+    def __init__(self, spec: dict):
+        self.name = spec["name"]
+        self.field = spec["field"]
+        ignore_case = spec.get("ignore_case", False)
+        if "in" in spec:
+            members = frozenset(v.lower() if ignore_case else v for v in spec["in"])
+            self.kind = "in"
+            self.test: Callable[[Any], bool] = (
+                (lambda value: value.lower() in members) if ignore_case else members.__contains__
+            )
+        elif "regex" in spec:
+            pattern = re.compile(spec["regex"], re.IGNORECASE if ignore_case else 0)
+            self.kind = "regex"
+            self.test = lambda value: pattern.search(value) is not None
+        else:
+            raise ValueError(f"Policy rule {self.name!r} needs 'in' or 'regex'")
+        self.spec = spec
+
+
+class Policy:
+    """Rules OR-ed together, evaluated column-wise over a batch."""
+
+    def __init__(self, name: str, spec: dict):
+        self.name = name
+        self.rules = [Rule(r) for r in spec.get("rules", [])]
+        self.assignments: Dict[str, Any] = dict(spec.get("set", {}))
+        self.fingerprint = content_hash(spec)  # changes whenever the rules or `set` change
+        self.hits: Counter = Counter()
+        self.evaluated = 0
+
+    def evaluate(self, tickets: Sequence) -> List[bool]:
+        """Selection mask for `tickets`; each selected ticket counts one hit for the first rule that matched."""
+        mask = [False] * len(tickets)
+        pending = range(len(tickets))
+        columns: Dict[str, list] = {}
+        for rule in self.rules:
+            values = columns.get(rule.field)
+            if values is None:
+                values = columns[rule.field] = [getattr(t, rule.field, None) for t in tickets]
+            test = rule.test
+            remaining = []
+            for i in pending:
+                value = values[i]
+                if value and test(value):
+                    mask[i] = True
+                else:
+                    remaining.append(i)
+            self.hits[rule.name] += len(pending) - len(remaining)
+            pending = remaining
+        self.hits["(no match)"] += len(pending)
+        self.evaluated += len(tickets)
+        return mask
+
+    def select(self, tickets: Sequence) -> list:
+        """Selected tickets, with the policy's `set` fields applied."""
+        selected = [t for t, keep in zip(tickets, self.evaluate(tickets)) if keep]
+        for ticket in selected:
+            for field, value in self.assignments.items():
+                setattr(ticket, field, value)
+        return selected
+
+    def describe(self) -> dict:
+        return {
+            "rules": [{**rule.spec, "hits": self.hits[rule.name]} for rule in self.rules],
+            "set": self.assignments,
+            "evaluated": self.evaluated,
+            "unmatched": self.hits["(no match)"],
+        }
+
+
+class PolicyEngine:
+    """Named compiled policies; `reload` swaps them in atomically."""
+
+    def __init__(self, config: Optional[dict] = None):
+        self.policies: Dict[str, Policy] = {}
+        self.reload(config)
+
+    def reload(self, config: Optional[dict] = None):
+        """Compile `config` (the "policies" section) and swap it in.
+
+        Hit counters carry over for policies and rules that keep their names.
+        A config that fails to compile raises and leaves the current policies in place.
+        """
+        specs = {**DEFAULT_POLICIES, **(config or {})}
+        compiled = {name: Policy(name, spec) for name, spec in specs.items()}
+        for name, policy in compiled.items():
+            previous = self.policies.get(name)
+            if previous is not None:
+                policy.evaluated = previous.evaluated
+                for rule in [*policy.rules, None]:
+                    key = rule.name if rule else "(no match)"
+                    policy.hits[key] = previous.hits[key]
+        self.policies = compiled
+
+    def get(self, name: str) -> Policy:
+        return self.policies[name]
+
+    def describe(self) -> dict:
+        return {name: policy.describe() for name, policy in self.policies.items()}
@@ -0,0 +1,103 @@
+"""Per-stage timeouts and retry with exponential backoff for blocking agent calls.
+
+Configured under "stage_retry" in config/config.json:
+
+    "stage_retry": {
+        "max_attempts": 3,
+        "base_delay_seconds": 2.0,
+        "max_delay_seconds": 60.0,
+        "jitter": 0.5,
+        "timeout_seconds": 120,
+        "stage_timeouts": {"logger": 30},
+        "threads": 8
+    }
+
+Agent calls run on a dedicated thread pool so hung calls cannot starve the
+default executor. A thread cannot be killed: on timeout a call that has not
+started yet is cancelled, and one already running is abandoned (its result
+discarded) while the attempt is retried. The LLM and SMTP clients carry
+their own timeouts so abandoned threads return.
+"""
+import asyncio
+import functools
+import random
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class StageTimeout(Exception):
+    """An agent call did not finish within its stage timeout."""
+
+
+class StageFailed(Exception):
+    """An agent call failed on every attempt."""
+
+    def __init__(self, stage: str, attempts: int, error: Exception):
+        super().__init__(f"{stage} failed after {attempts} attempt(s): {error}")
+        self.stage = stage
+        self.attempts = attempts
+        self.error = error
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 3, base_delay: float = 2.0, max_delay: float = 60.0,
+                 jitter: float = 0.5, timeout: Optional[float] = 120.0,
+                 stage_timeouts: Optional[Dict[str, float]] = None):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.timeout = timeout
+        self.stage_timeouts = dict(stage_timeouts or {})
+
+    @classmethod
+    def from_config(cls, config: dict) -> "RetryPolicy":
+        return cls(
+            max_attempts=config.get("max_attempts", 3),
+            base_delay=config.get("base_delay_seconds", 2.0),
+            max_delay=config.get("max_delay_seconds", 60.0),
+            jitter=config.get("jitter", 0.5),
+            timeout=config.get("timeout_seconds", 120.0),
+            stage_timeouts=config.get("stage_timeouts"),
+        )
+
+    def timeout_for(self, stage: str) -> Optional[float]:
+        return self.stage_timeouts.get(stage, self.timeout)
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before the attempt after `attempt`: doubling, capped, minus up to `jitter` of it."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+
+OnRetry = Callable[[int, Exception, float], Awaitable[None]]
+
+
+async def run_with_retry(stage: str, fn: Callable, *args, policy: RetryPolicy,
+                         executor: Optional[Executor] = None, on_retry: Optional[OnRetry] = None, **kwargs):
+    """Run blocking `fn(*args, **kwargs)` on `executor`, retrying failures and timeouts.
+
+    `on_retry(attempt, error, delay)` is awaited before each backoff sleep.
+
+    Returns:
+        whatever `fn` returns
+
+    Raises:
+        StageFailed: every attempt raised or timed out
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(fn, *args, **kwargs)
+    timeout = policy.timeout_for(stage)
+    for attempt in range(1, policy.max_attempts + 1):
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(executor, call), timeout)
+        except asyncio.TimeoutError:
+            error: Exception = StageTimeout(f"{stage} timed out after {timeout}s")
+        except Exception as e:
+            error = e
+        if attempt == policy.max_attempts:
+            raise StageFailed(stage, attempt, error) from error
+        delay = policy.delay(attempt)
+        if on_retry is not None:
+            await on_retry(attempt, error, delay)
+        await asyncio.sleep(delay)
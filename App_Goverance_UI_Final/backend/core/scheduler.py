@@ -0,0 +1,192 @@
+"""Earliest-deadline-first scheduler feeding a fixed-size pipeline worker pool."""
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+# Lower rank runs first when deadlines tie
+RISK_RANK = {"critical": 0, "urgent": 0, "high": 1, "medium": 2, "low": 3}
+UNKNOWN_RISK_RANK = 4
+
+
+def deadline_timestamp(sla_deadline) -> float:
+    """Epoch seconds of an ISO SLA deadline (naive = UTC, as in sla_prioritizer); unparseable sort last."""
+    try:
+        due = datetime.fromisoformat(sla_deadline)
+    except (TypeError, ValueError):
+        return float("inf")
+    if due.tzinfo is None:
+        due = due.replace(tzinfo=timezone.utc)
+    return due.timestamp()
+
+
+class TicketScheduler:
+    """Queues ready jobs by (sla_deadline, risk) and runs them on N workers.
+
+    A job is a single ticket or a batch of tickets (`ticket_ids`). A job is
+    queued at most once: resubmitting it updates its priority, and a job
+    submitted while it runs is re-queued when that run finishes. A job
+    sharing a ticket with a running job is held back until that job
+    finishes, so the same ticket never runs on two workers at once.
+    """
+
+    def __init__(self, runner: Callable[[str], Awaitable[None]], workers: int = 4):
+        self.runner = runner
+        self.num_workers = max(1, workers)
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}
+        self._running: Dict[str, float] = {}
+        self._rerun: Dict[str, tuple] = {}
+        # job id -> its ticket ids (queued and running jobs)
+        self._job_tickets: Dict[str, tuple] = {}
+        # ticket id -> id of the job running it
+        self._running_tickets: Dict[str, str] = {}
+        # popped entries waiting for a running job to release one of their tickets
+        self._blocked: List[list] = []
+        self._seq = itertools.count()
+        self._ready = asyncio.Condition()
+        self._workers: List[asyncio.Task] = []
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._wait_total = 0.0
+        self._dispatch_slack_total = 0.0
+        self._dispatch_slack_count = 0
+        self._late_dispatches = 0
+
+    # -- queue -------------------------------------------------------------
+
+    def _push(self, ticket_id: str, sla_deadline, risk_level):
+        old = self._entries.pop(ticket_id, None)
+        if old is not None:
+            old[-1] = None  # lazily invalidated; skipped when popped
+        entry = [
+            deadline_timestamp(sla_deadline),
+            RISK_RANK.get((risk_level or "").lower(), UNKNOWN_RISK_RANK),
+            next(self._seq),
+            time.time(),
+            ticket_id,
+        ]
+        self._entries[ticket_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _pop(self) -> Optional[list]:
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            job_id = entry[-1]
+            if job_id is None:
+                continue
+            if any(t in self._running_tickets for t in self._job_tickets[job_id]):
+                self._blocked.append(entry)
+                continue
+            del self._entries[job_id]
+            return entry
+        return None
+
+    def _unblock(self):
+        for entry in self._blocked:
+            if entry[-1] is not None:
+                heapq.heappush(self._heap, entry)
+        self._blocked = []
+
+    async def submit(self, job_id: str, sla_deadline=None, risk_level=None,
+                     ticket_ids: Optional[Iterable[str]] = None):
+        """Queue (or re-prioritise) a job for processing; `ticket_ids` defaults to [job_id]."""
+        self.submitted += 1
+        tickets = tuple(ticket_ids) if ticket_ids is not None else (job_id,)
+        if job_id in self._running:
+            self._rerun[job_id] = (sla_deadline, risk_level, tickets)
+            return
+        async with self._ready:
+            self._job_tickets[job_id] = tickets
+            self._push(job_id, sla_deadline, risk_level)
+            self._ready.notify()
+
+    async def reprioritize(self, ticket_id: str, sla_deadline=None, risk_level=None) -> bool:
+        """Update the priority of a queued ticket; tickets not in the queue are left alone.
+
+        Returns:
+            bool: True if the ticket was queued
+        """
+        async with self._ready:
+            if ticket_id not in self._entries:
+                return False
+            self._push(ticket_id, sla_deadline, risk_level)
+            return True
+
+    # -- workers -----------------------------------------------------------
+
+    def start(self):
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.num_workers)]
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker(self):
+        while True:
+            async with self._ready:
+                entry = self._pop()
+                while entry is None:
+                    await self._ready.wait()
+                    entry = self._pop()
+                deadline, _, _, queued_at, job_id = entry
+                now = time.time()
+                self._running[job_id] = now
+                tickets = self._job_tickets.pop(job_id)
+                for ticket_id in tickets:
+                    self._running_tickets[ticket_id] = job_id
+            self._wait_total += now - queued_at
+            if deadline != float("inf"):
+                self._dispatch_slack_total += deadline - now
+                self._dispatch_slack_count += 1
+                self._late_dispatches += deadline < now
+            try:
+                await self.runner(job_id)
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Scheduler: error running job {job_id}: {e}")
+            finally:
+                del self._running[job_id]
+                for ticket_id in tickets:
+                    self._running_tickets.pop(ticket_id, None)
+                rerun = self._rerun.pop(job_id, None)
+            async with self._ready:
+                if self._blocked:
+                    self._unblock()
+                    self._ready.notify_all()
+            if rerun is not None:
+                await self.submit(job_id, *rerun)
+
+    # -- metrics -----------------------------------------------------------
+
+    def metrics(self) -> dict:
+        now = time.time()
+        slacks = [e[0] - now for e in self._entries.values() if e[0] != float("inf")]
+        dispatched = self.completed + self.failed + len(self._running)
+        return {
+            "workers": self.num_workers,
+            "queue_depth": len(self._entries),
+            "running": len(self._running),
+            "blocked": len(self._blocked),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_queue_wait_seconds": round(self._wait_total / dispatched, 3) if dispatched else None,
+            "queued_deadline_slack_seconds": {
+                "min": round(min(slacks), 1) if slacks else None,
+                "avg": round(sum(slacks) / len(slacks), 1) if slacks else None,
+                "overdue": sum(1 for s in slacks if s < 0),
+            },
+            "dispatch_deadline_slack_seconds": {
+                "avg": round(self._dispatch_slack_total / self._dispatch_slack_count, 1)
+                if self._dispatch_slack_count else None,
+                "late": self._late_dispatches,
+            },
+        }
@@ -0,0 +1,125 @@
+"""In-memory inverted index for ticket search.
+
+Kept current as a TicketStore listener: a change re-indexes the ticket only
+when one of its searchable fields changed, so stage updates cost a tuple
+comparison. Query terms are AND-ed; each term matches tokens it equals or
+(from MIN_PREFIX_LENGTH characters on) prefixes. Results are ranked by
+field-weighted term frequency times inverse document frequency.
+"""
+import math
+import re
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+# Frontend ticket field -> weight of a token found in it
+SEARCH_FIELDS = {
+    "id": 5.0,
+    "armId": 4.0,
+    "aitNumber": 4.0,
+    "applicationName": 3.0,
+    "customer": 2.0,
+    "lobOwner": 2.0,
+    "aitOwner": 2.0,
+    "description": 1.0,
+}
+MIN_PREFIX_LENGTH = 2
+PREFIX_MATCH_FACTOR = 0.5  # prefix hits score lower than exact token hits
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text) -> List[str]:
+    """Lowercase alphanumeric runs ("ARM-1234" -> ["arm", "1234"])."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+class TicketSearchIndex:
+    """token -> {ticket_id: weight}, plus a sorted vocabulary for prefix lookups."""
+
+    def __init__(self, store=None):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_tokens: Dict[str, Dict[str, float]] = {}
+        self._signatures: Dict[str, tuple] = {}
+        self._vocabulary: List[str] = []
+        if store is not None:
+            for ticket_id, ticket in store.items():
+                self.on_change(ticket_id, ticket)
+            store.add_listener(self.on_change)
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    # -- maintenance -------------------------------------------------------
+
+    def on_change(self, ticket_id: str, ticket: Optional[dict]):
+        if ticket is None:
+            self._signatures.pop(ticket_id, None)
+            self._remove(ticket_id)
+            return
+        signature = tuple(ticket.get(field) for field in SEARCH_FIELDS)
+        if self._signatures.get(ticket_id) == signature:
+            return
+        self._signatures[ticket_id] = signature
+        self._remove(ticket_id)
+        weights: Dict[str, float] = {}
+        for value, weight in zip(signature, SEARCH_FIELDS.values()):
+            for token in tokenize(value):
+                weights[token] = weights.get(token, 0.0) + weight
+        self._doc_tokens[ticket_id] = weights
+        for token, weight in weights.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            posting[ticket_id] = weight
+
+    def _remove(self, ticket_id: str):
+        for token in self._doc_tokens.pop(ticket_id, {}):
+            posting = self._postings[token]
+            del posting[ticket_id]
+            if not posting:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    # -- queries -----------------------------------------------------------
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Index tokens matching a query term, with their match factor."""
+        matches = [(term, 1.0)] if term in self._postings else []
+        if len(term) >= MIN_PREFIX_LENGTH:
+            i = bisect_left(self._vocabulary, term)
+            while i < len(self._vocabulary) and self._vocabulary[i].startswith(term):
+                if self._vocabulary[i] != term:
+                    matches.append((self._vocabulary[i], PREFIX_MATCH_FACTOR))
+                i += 1
+        return matches
+
+    def search(self, query: str) -> List[Tuple[str, float]]:
+        """All matching ticket ids, best first.
+
+        Returns:
+            list: (ticket_id, score) pairs
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        total = max(1, len(self._doc_tokens))
+        scores: Optional[Dict[str, float]] = None
+        for term in terms:
+            term_scores: Dict[str, float] = {}
+            for token, factor in self._expand(term):
+                posting = self._postings[token]
+                idf = math.log(1 + total / len(posting))
+                for ticket_id, weight in posting.items():
+                    score = weight * idf * factor
+                    if score > term_scores.get(ticket_id, 0.0):
+                        term_scores[ticket_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {t: s + term_scores[t] for t, s in scores.items() if t in term_scores}
+            if not scores:
+                return []
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
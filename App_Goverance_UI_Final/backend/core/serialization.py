@@ -0,0 +1,121 @@
+"""Fast JSON encoding and a per-ticket pre-serialized response cache."""
+import json
+from typing import Any, Dict, Iterable, Optional
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any):
+    """Objects with a `to_json()` (e.g. StageStates) encode as what it returns."""
+    to_json = getattr(obj, "to_json", None)
+    if to_json is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_json()
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode to compact UTF-8 JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def loads(data):
+    """Decode JSON bytes or str (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(Response):
+    """JSONResponse replacement using the fast encoder.
+
+    Pre-serialized bytes are sent as-is, which lets list endpoints return
+    bodies assembled from cached fragments.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
+
+
+class TicketJSONCache:
+    """Serialized bytes per ticket, invalidated by TicketStore change events.
+
+    Register `on_change` as a TicketStore listener. List bodies are built by
+    joining cached fragments, so only tickets changed since the last request
+    are re-encoded.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._fragments: Dict[str, bytes] = {}
+        self._all_body: Optional[bytes] = None
+        self.hits = 0
+        self.misses = 0
+        store.add_listener(self.on_change)
+
+    def on_change(self, ticket_id: str, ticket: Optional[dict]):
+        self._fragments.pop(ticket_id, None)
+        self._all_body = None
+
+    def fragment(self, ticket_id: str) -> bytes:
+        data = self._fragments.get(ticket_id)
+        if data is None:
+            self.misses += 1
+            data = self._fragments[ticket_id] = dumps(self.store[ticket_id])
+        else:
+            self.hits += 1
+        return data
+
+    def array(self, ticket_ids: Iterable[str]) -> bytes:
+        """JSON array of the given tickets."""
+        return b"[" + b",".join(self.fragment(t) for t in ticket_ids) + b"]"
+
+    def list_body(self, ticket_ids: Optional[Iterable[str]] = None,
+                  extra: Optional[Dict[str, Any]] = None) -> bytes:
+        """`{"tickets": [...], "count": n, **extra}` for the given tickets (default: all, cached)."""
+        if ticket_ids is None and extra is None:
+            if self._all_body is None:
+                self._all_body = self._list_body(list(self.store.keys()))
+            return self._all_body
+        return self._list_body(list(self.store.keys() if ticket_ids is None else ticket_ids), extra)
+
+    def _list_body(self, ticket_ids, extra: Optional[Dict[str, Any]] = None) -> bytes:
+        body = b'{"tickets":' + self.array(ticket_ids) + b',"count":' + str(len(ticket_ids)).encode()
+        for name, value in (extra or {}).items():
+            body += b',' + dumps(name) + b':' + dumps(value)
+        return body + b"}"
+
+    def changes_body(self, since: int) -> bytes:
+        """`{"tickets": [...], "removed": [...], "count": n, "version": v, "full": bool}` for changes after `since`.
+
+        When removals after `since` are no longer all known (see
+        TicketStore.complete_since) every ticket is returned with "full": true
+        and the client replaces its copy instead of merging.
+        """
+        full = not self.store.complete_since(since)
+        changed, removed = (list(self.store.keys()), []) if full else self.store.changed_since(since)
+        return (b'{"tickets":' + self.array(changed) + b',"removed":' + dumps(removed)
+                + b',"count":' + str(len(changed)).encode()
+                + b',"version":' + str(self.store.version).encode()
+                + b',"full":' + (b"true" if full else b"false") + b"}")
+
+    def message(self, message_type: str, ticket_ids: Iterable[str], key: str = "tickets",
+                extra: Optional[Dict[str, Any]] = None) -> bytes:
+        """WebSocket message `{"type": ..., key: [...], **extra}` built from cached fragments."""
+        body = b'{"type":' + dumps(message_type) + b',"' + key.encode() + b'":' + self.array(ticket_ids)
+        for name, value in (extra or {}).items():
+            body += b',' + dumps(name) + b':' + dumps(value)
+        return body + b"}"
+
+    def ticket_message(self, message_type: str, ticket_id: str) -> bytes:
+        """WebSocket message `{"type": ..., "ticket": {...}}` for one ticket."""
+        return b'{"type":' + dumps(message_type) + b',"ticket":' + self.fragment(ticket_id) + b"}"
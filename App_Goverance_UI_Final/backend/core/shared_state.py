@@ -0,0 +1,393 @@
+"""Shared ticket state and broadcast bus for multi-worker deployments.
+
+With `uvicorn --workers N` every worker process has its own module globals.
+A shared state backend keeps the workers' TicketStores consistent and fans
+WebSocket broadcasts out to clients connected to other workers.
+
+- `LocalSharedState`: single process, nothing shared (default).
+- `SQLiteSharedState`: a SQLite database (WAL) holds the ticket journal and
+  a broadcast log; workers wake each other with Unix datagram sockets and
+  fall back to polling. No external service needed.
+"""
+import asyncio
+import hashlib
+import os
+import socket
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from backend.core.serialization import dumps, loads
+from backend.core.stage_state import compact_ticket
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+Deliver = Callable[[bytes], Awaitable[None]]
+
+
+class LocalSharedState:
+    """Single-process backend: the in-memory store is the only copy."""
+
+    def attach(self, store, deliver: Deliver):
+        pass
+
+    def publish(self, payload: bytes):
+        pass
+
+    async def flush(self):
+        pass
+
+    def try_lead(self) -> bool:
+        return True
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class SQLiteSharedState:
+    """Ticket journal and broadcast log in SQLite, shared by worker processes.
+
+    Every local ticket change is written to the journal under a global
+    sequence number, and each worker applies the journal to its store in
+    sequence order (its own writes included), so store versions and ETags
+    agree across workers. Broadcasts are appended to an event log and
+    delivered to the other workers' WebSocket clients.
+
+    Changes and broadcasts are queued and written once per event loop tick
+    (or when `flush` is awaited), in one transaction on a writer thread with
+    its own connection, so a bulk update of N tickets is one write that
+    does not block the loop. A ticket touched several times in a tick is
+    journaled once.
+
+    One worker at a time holds the leader lock and runs the singletons
+    (initial load, source sync, file watching).
+    """
+
+    def __init__(self, db_path: str, socket_dir: Optional[str] = None,
+                 poll_interval: float = 1.0, event_retention: int = 10000):
+        self.db_path = os.path.abspath(db_path)
+        digest = hashlib.blake2b(self.db_path.encode(), digest_size=6).hexdigest()
+        self.socket_dir = socket_dir or os.path.join(tempfile.gettempdir(), f"ticket-portal-{digest}")
+        self.poll_interval = poll_interval
+        self.event_retention = event_retention
+        self.worker_id = os.getpid()
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = self._connect()  # reads, on the event loop
+        self._write_conn = self._connect()  # writes, on the writer thread only
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-state-writer")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS tickets (id TEXT PRIMARY KEY, seq INTEGER NOT NULL, data BLOB)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS tickets_seq ON tickets (seq)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS events "
+            "(seq INTEGER PRIMARY KEY AUTOINCREMENT, origin INTEGER NOT NULL, payload BLOB NOT NULL)"
+        )
+
+        self.store = None
+        self.deliver: Optional[Deliver] = None
+        self.ticket_seq = 0
+        # Only broadcasts published after this worker started are delivered
+        self.event_seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+        self._published = 0
+        self._notify_pending = False
+        self._pending: Dict[str, Optional[dict]] = {}  # ticket changes not yet journaled
+        self._pending_events: List[bytes] = []
+        self._flush_scheduled = False
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flushing = False
+        self._flush_tasks = set()
+        self._sock: Optional[socket.socket] = None
+        self._sock_path: Optional[str] = None
+        self._lock_fd: Optional[int] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def attach(self, store, deliver: Deliver):
+        """Journal `store` changes and deliver other workers' broadcasts via `deliver(payload)`."""
+        self.store = store
+        self.deliver = deliver
+        store.set_journal(self)
+
+    # -- tickets -----------------------------------------------------------
+
+    def record(self, ticket_id: str, ticket: Optional[dict]):
+        """Queue a local change; it is journaled and applied with the rest of this tick's changes."""
+        self._pending.pop(ticket_id, None)  # journal order follows the latest change
+        self._pending[ticket_id] = ticket
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush_now()  # no event loop (startup, scripts): write synchronously
+            return
+        self._flush_scheduled = True
+        loop.call_soon(self._start_flush)
+
+    def _start_flush(self):
+        self._flush_scheduled = False
+        task = asyncio.ensure_future(self._flush_logged())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush_logged(self):
+        try:
+            await self.flush()
+        except sqlite3.Error as e:
+            print(f"Shared state: journal write failed, retrying with the next change: {e}")
+
+    def _take_pending(self):
+        """(ticket changes, serialized rows, broadcasts) queued so far"""
+        tickets, self._pending = self._pending, {}
+        events, self._pending_events = self._pending_events, []
+        rows = [(ticket_id, None if ticket is None else dumps(ticket)) for ticket_id, ticket in tickets.items()]
+        return tickets, rows, events
+
+    def _requeue(self, tickets: Dict[str, Optional[dict]], events: List[bytes]):
+        """Put back a batch whose write failed, behind nothing newer for the same tickets"""
+        for ticket_id, ticket in tickets.items():
+            self._pending.setdefault(ticket_id, ticket)
+        self._pending_events[:0] = events
+
+    async def flush(self):
+        """Journal queued changes and broadcasts in one transaction off the loop, then apply them."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending and not self._pending_events:
+                return
+            tickets, rows, events = self._take_pending()
+            self._flushing = True
+            try:
+                seqs = await asyncio.get_running_loop().run_in_executor(self._writer, self._write, rows, events)
+            except Exception:
+                self._requeue(tickets, events)
+                raise
+            finally:
+                self._flushing = False
+            self._pull(own={seq: tickets[ticket_id] for seq, (ticket_id, _) in zip(seqs, rows)})
+            self._schedule_notify()
+
+    def _flush_now(self):
+        tickets, rows, events = self._take_pending()
+        seqs = self._write(rows, events)
+        self._pull(own={seq: tickets[ticket_id] for seq, (ticket_id, _) in zip(seqs, rows)})
+        self._schedule_notify()
+
+    def _write(self, rows: list, events: List[bytes]) -> List[int]:
+        """Append ticket rows and broadcasts in one transaction (writer thread).
+
+        Returns:
+            list: journal sequence numbers assigned to `rows`, in order
+        """
+        conn = self._write_conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            first = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM tickets").fetchone()[0]
+            seqs = list(range(first, first + len(rows)))
+            conn.executemany("INSERT OR REPLACE INTO tickets (id, seq, data) VALUES (?, ?, ?)",
+                             [(ticket_id, seq, data) for seq, (ticket_id, data) in zip(seqs, rows)])
+            if events:
+                conn.executemany("INSERT INTO events (origin, payload) VALUES (?, ?)",
+                                 [(self.worker_id, payload) for payload in events])
+                before = self._published
+                self._published += len(events)
+                if self._published // 500 > before // 500:
+                    last = conn.execute("SELECT MAX(seq) FROM events").fetchone()[0]
+                    conn.execute("DELETE FROM events WHERE seq <= ?", (last - self.event_retention,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return seqs
+
+    def _catch_up(self, own: Optional[Dict[int, dict]] = None):
+        """Apply journal rows after the last applied one; `own` maps this worker's seqs to its tickets."""
+        rows = self.conn.execute(
+            "SELECT seq, id, data FROM tickets WHERE seq > ? ORDER BY seq", (self.ticket_seq,)
+        ).fetchall()
+        for seq, ticket_id, data in rows:
+            if own is not None and seq in own:
+                self.store.apply(ticket_id, own[seq], seq, local=True)
+            else:
+                self.store.apply(ticket_id, None if data is None else compact_ticket(loads(data)), seq)
+            self.ticket_seq = seq
+
+    # -- broadcasts --------------------------------------------------------
+
+    def publish(self, payload: bytes):
+        """Queue a broadcast for the other workers' clients (written after the changes before it)."""
+        self._pending_events.append(payload)
+        self._schedule_flush()
+
+    def _pull(self, own: Optional[Dict[int, dict]] = None):
+        """Apply journal changes and queue broadcasts from other workers."""
+        if self._flushing and own is None:
+            return  # our in-flight rows may be committed but not yet matched to local tickets
+        self._catch_up(own)
+        if self._queue is None:
+            return  # not started: no broadcasts to deliver yet
+        last = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+        if last <= self.event_seq:
+            return
+        rows = self.conn.execute(
+            "SELECT payload FROM events WHERE seq > ? AND seq <= ? AND origin != ? ORDER BY seq",
+            (self.event_seq, last, self.worker_id),
+        )
+        for (payload,) in rows:
+            self._queue.put_nowait(payload)
+        self.event_seq = last
+
+    async def _deliver_loop(self):
+        while True:
+            payload = await self._queue.get()
+            try:
+                await self.deliver(payload)
+            except Exception as e:
+                print(f"Shared state: error delivering broadcast: {e}")
+
+    # -- notifications -----------------------------------------------------
+
+    def _schedule_notify(self):
+        """Wake the other workers once per event loop iteration, not per write."""
+        if self._notify_pending:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._notify_peers()
+            return
+        self._notify_pending = True
+        loop.call_soon(self._notify_peers)
+
+    def _notify_peers(self):
+        self._notify_pending = False
+        if self._sock is None:
+            return  # peers find the change on their next poll
+        for name in os.listdir(self.socket_dir):
+            path = os.path.join(self.socket_dir, name)
+            if not name.endswith(".sock") or path == self._sock_path:
+                continue
+            try:
+                self._sock.sendto(b"!", path)
+            except BlockingIOError:
+                pass  # peer already has unread wake-ups queued
+            except (ConnectionRefusedError, FileNotFoundError):
+                try:
+                    os.unlink(path)  # socket of a worker that exited
+                except OSError:
+                    pass
+            except OSError:
+                pass
+
+    def _on_wakeup(self):
+        while True:
+            try:
+                self._sock.recv(16)
+            except (BlockingIOError, InterruptedError):
+                break
+        self._pull()
+
+    async def _poll_loop(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                self._pull()
+            except sqlite3.Error as e:
+                print(f"Shared state: poll failed: {e}")
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def try_lead(self) -> bool:
+        """Take the leader lock if no other worker holds it."""
+        if self._lock_fd is not None:
+            return True
+        if fcntl is None:
+            return True
+        fd = os.open(f"{self.db_path}.leader", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    async def start(self):
+        """Load tickets other workers already hold and start listening for changes."""
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._catch_up()
+        if hasattr(socket, "AF_UNIX"):
+            os.makedirs(self.socket_dir, exist_ok=True)
+            self._sock_path = os.path.join(self.socket_dir, f"{self.worker_id}.sock")
+            if os.path.exists(self._sock_path):
+                os.unlink(self._sock_path)
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._sock.bind(self._sock_path)
+            self._sock.setblocking(False)
+            loop.add_reader(self._sock.fileno(), self._on_wakeup)
+        self._tasks = [asyncio.create_task(self._deliver_loop()), asyncio.create_task(self._poll_loop())]
+
+    async def close(self):
+        try:
+            await self.flush()
+        except sqlite3.Error as e:
+            print(f"Shared state: final journal write failed: {e}")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._sock is not None:
+            asyncio.get_running_loop().remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+            try:
+                os.unlink(self._sock_path)
+            except OSError:
+                pass
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+        self._writer.shutdown(wait=True)
+        self._write_conn.close()
+        self.conn.close()
+
+
+def create_shared_state(config: dict, base_dir: Optional[Path] = None):
+    """Build the backend named by the `shared_state` config section.
+
+    Returns:
+        LocalSharedState or SQLiteSharedState
+    """
+    backend = config.get("backend", "local")
+    if backend == "local":
+        return LocalSharedState()
+    if backend == "sqlite":
+        path = Path(config.get("path", "data/shared_state.db"))
+        if not path.is_absolute() and base_dir is not None:
+            path = base_dir / path
+        return SQLiteSharedState(
+            str(path),
+            socket_dir=config.get("socket_dir"),
+            poll_interval=config.get("poll_interval_seconds", 1.0),
+            event_retention=config.get("event_retention", 10000),
+        )
+    raise ValueError(f"Unknown shared_state backend: {backend}")
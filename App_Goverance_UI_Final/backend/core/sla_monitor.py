@@ -0,0 +1,73 @@
+"""SLA risk re-tiering as deadlines approach.
+
+The SLA prioritizer assigns a risk tier once, when a ticket passes its
+stage; without re-tiering a "Low" ticket stays "Low" until its deadline
+has long gone. SLAMonitor keeps each open ticket's next tier crossing
+(see `sla_crossings`) on a TimerWheel and reports crossings as they come
+due, so the cost is one wheel operation per crossing rather than a scan
+of all open tickets. A ticket registered after some of its crossings
+have passed (already inside the Medium or High window, or past its
+deadline) is reported at its current tier on the next `advance`.
+"""
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.agents.sla_prioritizer import sla_crossings
+from backend.core.timer_wheel import TimerWheel
+
+
+class SLAMonitor:
+    """TicketStore listener holding one timer per open ticket with an SLA deadline."""
+
+    def __init__(self, store, tick: float = 1.0, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.wheel = TimerWheel(clock(), tick=tick)
+        self._deadlines: Dict[str, str] = {}  # deadline the ticket's timer was computed from
+        self._due: List[Tuple[str, str]] = []  # tiers already reached when a ticket was registered
+        for ticket_id, ticket in store.items():
+            self.on_change(ticket_id, ticket)
+        store.add_listener(self.on_change)
+
+    def on_change(self, ticket_id: str, ticket: Optional[dict]):
+        deadline = None
+        if ticket is not None and ticket.get("status") != "completed":
+            deadline = ticket.get("slaDeadline")
+        if deadline == self._deadlines.get(ticket_id):
+            return
+        self.wheel.cancel(ticket_id)
+        self._deadlines.pop(ticket_id, None)
+        if deadline:
+            self._deadlines[ticket_id] = deadline
+            self._track(ticket_id, deadline, self.clock())
+
+    def _track(self, ticket_id: str, deadline: str, now: float):
+        """Report the tier the ticket is already in, then time its next crossing"""
+        passed = [tier for when, tier in sla_crossings(deadline) if when <= now]
+        tiers = [tier for tier in passed if tier != "Breached"]
+        if tiers:
+            self._due.append((ticket_id, tiers[-1]))
+        if "Breached" in passed:
+            self._due.append((ticket_id, "Breached"))
+        self._schedule_next(ticket_id, deadline, now)
+
+    def _schedule_next(self, ticket_id: str, deadline: str, after: float):
+        for when, tier in sla_crossings(deadline):
+            if when > after:
+                self.wheel.schedule(ticket_id, when, (when, tier))
+                return
+
+    def advance(self, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """Crossings that came due since the last call.
+
+        Returns:
+            list: (ticket_id, tier) pairs; tier is "Medium", "High" or "Breached"
+        """
+        now = self.clock() if now is None else now
+        crossed, self._due = self._due, []
+        for ticket_id, (when, tier) in self.wheel.advance(now):
+            crossed.append((ticket_id, tier))
+            self._schedule_next(ticket_id, self._deadlines[ticket_id], when)
+        return crossed
+
+    def describe(self) -> dict:
+        return {"tracked": len(self._deadlines), **self.wheel.describe()}
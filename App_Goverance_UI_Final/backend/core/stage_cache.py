@@ -0,0 +1,76 @@
+"""Per-ticket stage output cache keyed by content hashes.
+
+A ticket's key for a stage chains the key of the stage before it with the
+stage's own extra inputs (e.g. the ticket's AppHQ record, or the policy
+fingerprint), starting from a hash of the ticket's source fields. A stage
+whose key is unchanged since the last run has unchanged inputs, so its
+cached output for that ticket is reused instead of invoking the agent.
+"""
+import hashlib
+from typing import Any, Dict, Hashable, Iterable, Tuple
+
+from backend.core.serialization import dumps
+
+MISS = object()
+
+
+def content_hash(value: Any) -> str:
+    """Stable hash of a JSON-serializable value (pydantic models via model_dump)."""
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+    return hashlib.blake2b(dumps(value), digest_size=16).hexdigest()
+
+
+def chain_key(previous: str, stage: str, extra: str = "") -> str:
+    return hashlib.blake2b(f"{previous}|{stage}|{extra}".encode(), digest_size=16).hexdigest()
+
+
+class StageCache:
+    """ticket id -> stage -> (input key, output)."""
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Dict[str, Tuple[str, Any]]] = {}
+
+    def get(self, ticket_id: Hashable, stage: str, key: str):
+        """Cached output, or MISS if the stage last ran on different inputs."""
+        entry = self._entries.get(ticket_id, {}).get(stage)
+        if entry is None or entry[0] != key:
+            return MISS
+        return entry[1]
+
+    def put(self, ticket_id: Hashable, stage: str, key: str, output: Any):
+        self._entries.setdefault(ticket_id, {})[stage] = (key, output)
+
+    def retain(self, ticket_ids: Iterable[Hashable]):
+        """Drop tickets the source no longer returns."""
+        keep = set(ticket_ids)
+        for ticket_id in [t for t in self._entries if t not in keep]:
+            del self._entries[ticket_id]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RunSummary:
+    """Per-stage run/skip counts of one pipeline run."""
+
+    def __init__(self, tickets: int = 0):
+        self.tickets = tickets
+        self.stages: Dict[str, Dict[str, int]] = {}
+        self.processed = set()  # tickets at least one stage actually ran for
+
+    def record(self, stage: str, skipped: int, ran: Iterable[Hashable]):
+        ran = list(ran)
+        self.stages[stage] = {"run": len(ran), "skipped": skipped}
+        self.processed.update(ran)
+
+    def as_dict(self) -> dict:
+        return {
+            "tickets": self.tickets,
+            "skippedTickets": self.tickets - len(self.processed),
+            "skippedStages": sum(s["skipped"] for s in self.stages.values()),
+            "stages": self.stages,
+        }
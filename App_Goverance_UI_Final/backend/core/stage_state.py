@@ -0,0 +1,89 @@
+"""Compact per-ticket pipeline stage state.
+
+Every ticket goes through the same eight stages, so their ids and names
+live once in STAGES and a ticket only keeps a status code per stage (one
+byte each) and the messages that are not empty. `StageStates.to_json`
+expands this to the list of {"id", "name", "status", "message"} dicts the
+frontend expects; `serialization.dumps` calls it, so the API shape is
+unchanged and the expansion only happens when a ticket is serialized.
+"""
+from typing import List, Optional
+
+# (id, name) of each pipeline stage, in order
+STAGES = (
+    (1, "Ticket Fetching"),
+    (2, "Category Check"),
+    (3, "SLA Prioritization"),
+    (4, "Ownership Enrichment"),
+    (5, "App Owner Check"),
+    (6, "Evidence Collection"),
+    (7, "Ticket Closure"),
+    (8, "Logging"),
+)
+STAGE_NAMES = tuple(name for _, name in STAGES)
+
+# Status code = index
+STATUSES = ("pending", "in-progress", "completed", "error")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+NO_MESSAGES = ("",) * len(STAGES)
+
+
+class StageStates:
+    """Status codes and messages of a ticket's stages, indexed like STAGES."""
+
+    __slots__ = ("codes", "messages")
+
+    def __init__(self):
+        self.codes = bytearray(len(STAGES))
+        self.messages: Optional[List[str]] = None  # allocated on the first non-empty message
+
+    def status(self, index: int) -> str:
+        return STATUSES[self.codes[index]]
+
+    def message(self, index: int) -> str:
+        return self.messages[index] if self.messages is not None else ""
+
+    @staticmethod
+    def name(index: int) -> str:
+        return STAGE_NAMES[index]
+
+    def set(self, index: int, status: str, message: str = ""):
+        self.codes[index] = STATUS_CODES[status]
+        if message:
+            if self.messages is None:
+                self.messages = [""] * len(STAGES)
+            self.messages[index] = message
+        elif self.messages is not None:
+            self.messages[index] = ""
+
+    def to_json(self) -> List[dict]:
+        return [
+            {"id": stage_id, "name": name, "status": STATUSES[code], "message": message}
+            for (stage_id, name), code, message in zip(STAGES, self.codes, self.messages or NO_MESSAGES)
+        ]
+
+    @classmethod
+    def from_json(cls, stages: List[dict]) -> "StageStates":
+        states = cls()
+        for index, stage in enumerate(stages[:len(STAGES)]):
+            states.set(index, stage.get("status") or "pending", stage.get("message") or "")
+        return states
+
+    def __len__(self) -> int:
+        return len(STAGES)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, StageStates):
+            return NotImplemented
+        return self.codes == other.codes and all(self.message(i) == other.message(i) for i in range(len(STAGES)))
+
+    def __repr__(self) -> str:
+        return f"StageStates({', '.join(self.status(i) for i in range(len(STAGES)))})"
+
+
+def compact_ticket(ticket: dict) -> dict:
+    """Convert a ticket's JSON stage list (e.g. from another worker) to StageStates in place."""
+    stages = ticket.get("stages")
+    if isinstance(stages, list):
+        ticket["stages"] = StageStates.from_json(stages)
+    return ticket
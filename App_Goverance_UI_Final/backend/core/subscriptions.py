@@ -0,0 +1,139 @@
+"""Topic subscriptions for routing WebSocket ticket messages.
+
+A client subscribes to topics; a ticket message goes only to clients
+subscribed to one of the ticket's topics:
+
+    all                   every ticket (default for new connections)
+    ticket:<id>           one ticket
+    category:<name>       e.g. category:iam
+    lob:<owner>           tickets of one LOB owner
+    status:<status>       not-started / in-progress / completed
+    waiting:<checkpoint>  priority / review / closure, or waiting:any
+    approver:<owner>      tickets of that LOB owner waiting at any checkpoint
+    stats                 stats_update aggregate messages only
+
+Values are case-insensitive except ticket ids.
+"""
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Set
+
+ALL = "all"
+
+WAITING_FLAGS = {
+    "waitingForPriorityConfirmation": "priority",
+    "waitingForReview": "review",
+    "waitingForClosureConfirmation": "closure",
+}
+
+
+def normalize_topic(topic: str) -> str:
+    kind, sep, value = topic.strip().partition(":")
+    kind = kind.lower()
+    if not sep:
+        return kind
+    value = value.strip()
+    return f"{kind}:{value}" if kind == "ticket" else f"{kind}:{value.lower()}"
+
+
+def ticket_topics(ticket: dict) -> FrozenSet[str]:
+    """All topics a frontend ticket currently belongs to."""
+    topics = {ALL, f"ticket:{ticket['id']}", f"status:{(ticket.get('status') or '').lower()}"}
+    if ticket.get("category"):
+        topics.add(f"category:{ticket['category'].lower()}")
+    lob = (ticket.get("lobOwner") or "").lower()
+    if lob:
+        topics.add(f"lob:{lob}")
+    waiting = [name for flag, name in WAITING_FLAGS.items() if ticket.get(flag)]
+    for name in waiting:
+        topics.add(f"waiting:{name}")
+    if waiting:
+        topics.add("waiting:any")
+        if lob:
+            topics.add(f"approver:{lob}")
+    return frozenset(topics)
+
+
+class SubscriptionIndex:
+    """topic -> subscribed clients, plus the topics each ticket was last routed under.
+
+    A ticket update is routed to subscribers of both its previous and its
+    current topics, so a client watching `waiting:review` also hears that a
+    ticket has left the review checkpoint.
+
+    With a store attached, the topics of every ticket's latest state are
+    tracked from its change events, so the removal of a ticket that was
+    never broadcast still reaches `all`, `ticket:<id>` and the topics it
+    last belonged to.
+    """
+
+    def __init__(self, store=None):
+        self._by_topic: Dict[str, Set[Hashable]] = {}
+        self._by_client: Dict[Hashable, Set[str]] = {}
+        self._ticket_topics: Dict[str, FrozenSet[str]] = {}
+        self._last_topics: Dict[str, FrozenSet[str]] = {}
+        if store is not None:
+            for ticket_id, ticket in store.items():
+                self.on_change(ticket_id, ticket)
+            store.add_listener(self.on_change)
+
+    def on_change(self, ticket_id: str, ticket: Optional[dict]):
+        """TicketStore listener; removals keep the last topics until they are routed"""
+        if ticket is not None:
+            self._last_topics[ticket_id] = ticket_topics(ticket)
+
+    def subscribe(self, client: Hashable, topics: Iterable[str]) -> Set[str]:
+        subscribed = self._by_client.setdefault(client, set())
+        for topic in map(normalize_topic, topics):
+            subscribed.add(topic)
+            self._by_topic.setdefault(topic, set()).add(client)
+        return subscribed
+
+    def unsubscribe(self, client: Hashable, topics: Iterable[str]) -> Set[str]:
+        subscribed = self._by_client.get(client, set())
+        for topic in map(normalize_topic, topics):
+            subscribed.discard(topic)
+            clients = self._by_topic.get(topic)
+            if clients is not None:
+                clients.discard(client)
+                if not clients:
+                    del self._by_topic[topic]
+        return subscribed
+
+    def remove(self, client: Hashable):
+        self.unsubscribe(client, list(self._by_client.pop(client, ())))
+
+    def topics_of(self, client: Hashable) -> Set[str]:
+        return self._by_client.get(client, set())
+
+    def subscribers(self, topics: Iterable[str]) -> Set[Hashable]:
+        clients: Set[Hashable] = set()
+        for topic in topics:
+            clients |= self._by_topic.get(topic, set())
+        return clients
+
+    def topic_counts(self) -> Dict[str, int]:
+        return {topic: len(clients) for topic, clients in self._by_topic.items()}
+
+    def matches(self, client: Hashable, ticket: dict) -> bool:
+        return not self.topics_of(client).isdisjoint(ticket_topics(ticket))
+
+    def route(self, tickets: Dict[str, Optional[dict]]) -> Dict[Hashable, List[str]]:
+        """Clients interested in each ticket (None = removed ticket).
+
+        Returns:
+            dict: client -> ticket ids it should receive, in input order
+        """
+        recipients: Dict[Hashable, List[str]] = {}
+        for ticket_id, ticket in tickets.items():
+            previous = self._ticket_topics.get(ticket_id, frozenset())
+            if ticket is None:
+                current = frozenset((ALL, f"ticket:{ticket_id}"))
+                previous = previous | self._last_topics.pop(ticket_id, frozenset())
+                self._ticket_topics.pop(ticket_id, None)
+            else:
+                current = self._ticket_topics[ticket_id] = ticket_topics(ticket)
+            for topic in current | previous:
+                for client in self._by_topic.get(topic, ()):
+                    ids = recipients.setdefault(client, [])
+                    if not ids or ids[-1] != ticket_id:
+                        ids.append(ticket_id)
+        return recipients
@@ -0,0 +1,133 @@
+"""Dashboard aggregates maintained incrementally from TicketStore changes."""
+import heapq
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.core.scheduler import deadline_timestamp
+from backend.core.stage_state import STAGE_NAMES
+from backend.core.subscriptions import WAITING_FLAGS
+
+DIMENSIONS = ("byStatus", "byStage", "byRisk", "byCategory", "byLob", "checkpoints", "sla")
+
+
+class TicketStats:
+    """Counts per status, stage, risk, category, LOB, checkpoint and SLA state.
+
+    Each ticket's contribution (its key in every dimension) is remembered, so
+    a change is one decrement and one increment per dimension. Open tickets
+    whose SLA deadline passes without any change are moved to "breached" by
+    `advance()`, driven from a deadline heap. A completed ticket counts as
+    "met" only if its `completedAt` is not past its deadline.
+    """
+
+    def __init__(self, store, clock: Callable[[], float] = time.time):
+        self.store = store
+        self.clock = clock
+        self.counters: Dict[str, Counter] = {dim: Counter() for dim in DIMENSIONS}
+        self._keys: Dict[str, Tuple[tuple, ...]] = {}
+        self._deadlines: List[Tuple[float, str]] = []
+        self._tracked: Dict[str, float] = {}  # deadline currently in the heap per ticket
+        self.version = 0
+        self._listeners: List[Callable[[], None]] = []
+        for ticket_id, ticket in store.items():
+            self.on_change(ticket_id, ticket)
+        store.add_listener(self.on_change)
+
+    def add_listener(self, listener: Callable[[], None]):
+        """Called (synchronously) whenever any counter changes."""
+        self._listeners.append(listener)
+
+    def _keys_for(self, ticket: dict, now: float) -> Tuple[tuple, ...]:
+        index = ticket.get("currentStage", 0)
+        stage = STAGE_NAMES[index] if 0 <= index < len(STAGE_NAMES) else str(index)
+        status = ticket.get("status") or "unknown"
+        deadline = deadline_timestamp(ticket.get("slaDeadline"))
+        if status == "completed":
+            completed_at = deadline_timestamp(ticket.get("completedAt"))
+            if completed_at == float("inf"):
+                completed_at = now  # completed before completion times were recorded
+            sla = "breached" if completed_at > deadline else "met"
+        elif deadline == float("inf"):
+            sla = "noDeadline"
+        elif deadline <= now:
+            sla = "breached"
+        else:
+            sla = "onTrack"
+            if self._tracked.get(ticket["id"]) != deadline:
+                self._tracked[ticket["id"]] = deadline
+                heapq.heappush(self._deadlines, (deadline, ticket["id"]))
+        return (
+            (status,),
+            (stage,),
+            ((ticket.get("priority") or "unknown").lower(),),
+            (ticket.get("category") or "Unknown",),
+            (ticket.get("lobOwner") or "Unassigned",),
+            tuple(name for flag, name in WAITING_FLAGS.items() if ticket.get(flag)),
+            (sla,),
+        )
+
+    def _apply(self, old, new) -> bool:
+        if old == new:
+            return False
+        for counter, old_values, new_values in zip(self.counters.values(), old or ((),) * len(DIMENSIONS),
+                                                   new or ((),) * len(DIMENSIONS)):
+            if old_values == new_values:
+                continue
+            for value in old_values:
+                counter[value] -= 1
+                if not counter[value]:
+                    del counter[value]
+            for value in new_values:
+                counter[value] += 1
+        return True
+
+    def on_change(self, ticket_id: str, ticket: Optional[dict]):
+        old = self._keys.pop(ticket_id, None)
+        new = None
+        if ticket is not None:
+            new = self._keys[ticket_id] = self._keys_for(ticket, self.clock())
+        else:
+            self._tracked.pop(ticket_id, None)
+        if self._apply(old, new):
+            self._changed()
+
+    def advance(self, now: Optional[float] = None) -> List[str]:
+        """Move open tickets whose SLA deadline has passed to "breached".
+
+        Returns:
+            list: ticket ids that breached since the last call
+        """
+        now = self.clock() if now is None else now
+        breached = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, ticket_id = heapq.heappop(self._deadlines)
+            if self._tracked.get(ticket_id) != deadline:
+                continue  # superseded by a newer deadline
+            del self._tracked[ticket_id]
+            keys = self._keys.get(ticket_id)
+            ticket = self.store.get(ticket_id)
+            if keys is None or ticket is None or keys[-1] != ("onTrack",):
+                continue
+            new = self._keys_for(ticket, now)
+            if new[-1] == ("breached",):
+                self._apply(keys, new)
+                self._keys[ticket_id] = new
+                breached.append(ticket_id)
+        if breached:
+            self._changed()
+        return breached
+
+    def _changed(self):
+        self.version += 1
+        for listener in self._listeners:
+            listener()
+
+    def snapshot(self) -> dict:
+        self.advance()
+        result = {"total": len(self._keys), "version": self.version}
+        for dim, counter in self.counters.items():
+            result[dim] = dict(counter)
+        for name in WAITING_FLAGS.values():
+            result["checkpoints"].setdefault(name, 0)
+        return result
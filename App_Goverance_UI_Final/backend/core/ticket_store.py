@@ -0,0 +1,151 @@
+"""Live ticket store with change notification."""
+from collections.abc import MutableMapping
+from typing import Callable, Dict, List, Optional, Tuple
+
+# listener(ticket_id, ticket) -- ticket is None when the ticket was removed
+ChangeListener = Callable[[str, Optional[dict]], None]
+
+
+class TicketStore(MutableMapping):
+    """Frontend ticket dicts keyed by ticket id.
+
+    Behaves like the plain dict it replaces. Tickets are mutated in place
+    (ticket["status"] = ...), so code that edits a ticket calls
+    `touch(ticket_id)` afterwards; inserts and deletes notify automatically.
+    Listeners (serialization cache, indexes, counters) run synchronously.
+
+    Every change bumps a monotonically increasing store `version` and stamps
+    the ticket with it, which backs ETags and `changed_since` queries.
+
+    With a journal attached (see core.shared_state) versions are assigned by
+    the journal instead: local changes are recorded there and every change,
+    local or from another worker, comes back through `apply` in journal order.
+
+    Removals are remembered as tombstones for `changed_since`. Beyond
+    `max_tombstones` the oldest quarter is dropped and `tombstone_floor`
+    raised to the newest dropped version; a caller asking for changes since
+    an older version cannot be told every removal and needs a full snapshot
+    (see `complete_since`).
+    """
+
+    def __init__(self, max_tombstones: int = 10000):
+        self._tickets: Dict[str, dict] = {}
+        self._listeners: List[ChangeListener] = []
+        self.version = 0
+        # ticket id -> version of its last change, kept in change order
+        self._versions: Dict[str, int] = {}
+        # removed ticket id -> version it was removed at, kept in removal order
+        self._removed: Dict[str, int] = {}
+        self.max_tombstones = max(1, max_tombstones)
+        self.tombstone_floor = 0
+        self._journal = None
+
+    def set_journal(self, journal):
+        """Route changes through a shared journal with `record(ticket_id, ticket)`."""
+        self._journal = journal
+
+    def add_listener(self, listener: ChangeListener):
+        self._listeners.append(listener)
+
+    def ticket_version(self, ticket_id: str) -> Optional[int]:
+        return self._versions.get(ticket_id)
+
+    def complete_since(self, version: int) -> bool:
+        """Whether `changed_since(version)` reports every removal (no tombstone after it was dropped)."""
+        return version >= self.tombstone_floor
+
+    def changed_since(self, version: int) -> Tuple[List[str], List[str]]:
+        """Tickets changed and removed after `version`.
+
+        Returns:
+            tuple: (changed ticket ids, removed ticket ids), oldest change first
+        """
+        return self._after(self._versions, version), self._after(self._removed, version)
+
+    @staticmethod
+    def _after(versions: Dict[str, int], version: int) -> List[str]:
+        """Ids whose version is above `version`, scanning back from the newest"""
+        ids = []
+        for ticket_id in reversed(versions):
+            if versions[ticket_id] <= version:
+                break
+            ids.append(ticket_id)
+        ids.reverse()
+        return ids
+
+    def _prune_tombstones(self):
+        drop = len(self._removed) - self.max_tombstones * 3 // 4
+        dropped = list(self._removed.items())[:drop]
+        self.tombstone_floor = dropped[-1][1]
+        self._removed = dict(list(self._removed.items())[drop:])
+
+    def _notify(self, ticket_id: str, ticket: Optional[dict]):
+        if self._journal is not None:
+            self._journal.record(ticket_id, ticket)
+        else:
+            self._stamp(ticket_id, ticket, self.version + 1)
+
+    def _stamp(self, ticket_id: str, ticket: Optional[dict], version: int):
+        self.version = version
+        self._versions.pop(ticket_id, None)
+        if ticket is None:
+            self._removed.pop(ticket_id, None)
+            self._removed[ticket_id] = version
+            if len(self._removed) > self.max_tombstones:
+                self._prune_tombstones()
+        else:
+            self._versions[ticket_id] = version
+            self._removed.pop(ticket_id, None)
+        for listener in self._listeners:
+            listener(ticket_id, ticket)
+
+    def apply(self, ticket_id: str, ticket: Optional[dict], version: int, local: bool = False):
+        """Apply a journaled change at `version` (None removes the ticket).
+
+        `local` changes are already in the store and are only stamped.
+        """
+        if not local:
+            if ticket is None:
+                self._tickets.pop(ticket_id, None)
+            else:
+                self._tickets[ticket_id] = ticket
+        self._stamp(ticket_id, ticket, version)
+
+    def touch(self, ticket_id: str):
+        """Signal that a ticket was modified in place."""
+        ticket = self._tickets.get(ticket_id)
+        if ticket is not None:
+            self._notify(ticket_id, ticket)
+
+    def __getitem__(self, ticket_id: str) -> dict:
+        return self._tickets[ticket_id]
+
+    def __setitem__(self, ticket_id: str, ticket: dict):
+        self._tickets[ticket_id] = ticket
+        self._notify(ticket_id, ticket)
+
+    def __delitem__(self, ticket_id: str):
+        del self._tickets[ticket_id]
+        self._notify(ticket_id, None)
+
+    def __iter__(self):
+        return iter(self._tickets)
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __contains__(self, ticket_id) -> bool:
+        return ticket_id in self._tickets
+
+    # Direct dict views are much cheaper than the MutableMapping defaults
+    def get(self, ticket_id: str, default=None):
+        return self._tickets.get(ticket_id, default)
+
+    def keys(self):
+        return self._tickets.keys()
+
+    def values(self):
+        return self._tickets.values()
+
+    def items(self):
+        return self._tickets.items()
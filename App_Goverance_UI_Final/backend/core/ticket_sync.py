@@ -0,0 +1,80 @@
+"""Incremental, change-token based ticket synchronisation."""
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from backend.models.ticket_context import Ticket, TicketResponse
+
+
+def record_fingerprint(record: dict) -> str:
+    """Stable fingerprint of the Ticket fields of a raw ticket record."""
+    fields = {name: record.get(name) for name in Ticket.model_fields}
+    raw = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+
+@dataclass
+class SyncDelta:
+    new: List[Ticket] = field(default_factory=list)
+    changed: List[Ticket] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.new or self.changed or self.deleted)
+
+
+class TicketSync:
+    """Tracks what has been loaded from the ticket source and yields only deltas.
+
+    A poll of an unchanged source (same change token) costs nothing. A
+    changed file source has no per-record change tracking, so that poll
+    re-reads and fingerprints all N records: O(N) per source change, not
+    per poll. Only records whose fingerprint changed are validated into
+    Ticket models, merged and broadcast.
+    """
+
+    def __init__(self, fetcher):
+        self.fetcher = fetcher
+        self.change_token: Optional[str] = None
+        self._fingerprints: Dict[str, str] = {}
+
+    def prime(self, tickets: TicketResponse, change_token: Optional[str] = None):
+        """Record a full load as the sync baseline."""
+        for t in tickets.tickets:
+            record = t.model_dump()
+            self._fingerprints[record["ticket_id"]] = record_fingerprint(record)
+        self.change_token = change_token
+
+    def poll(self) -> SyncDelta:
+        """Fetch new/changed/deleted tickets since the last poll."""
+        records, token = self.fetcher.fetch_changes(self.change_token)
+        delta = SyncDelta()
+        if records is None:
+            return delta
+
+        seen = set()
+        for record in records:
+            ticket_id = record.get("ticket_id")
+            if not ticket_id:
+                continue
+            seen.add(ticket_id)
+            fingerprint = record_fingerprint(record)
+            previous = self._fingerprints.get(ticket_id)
+            if previous == fingerprint:
+                continue
+            try:
+                ticket = Ticket(**record)
+            except Exception as e:
+                print(f"Skipping invalid ticket record {ticket_id}: {e}")
+                continue
+            (delta.new if previous is None else delta.changed).append(ticket)
+            self._fingerprints[ticket_id] = fingerprint
+
+        # Keyed diff: anything we knew about that is gone from the source
+        for ticket_id in [tid for tid in self._fingerprints if tid not in seen]:
+            del self._fingerprints[ticket_id]
+            delta.deleted.append(ticket_id)
+
+        self.change_token = token
+        return delta
@@ -0,0 +1,130 @@
+"""Hierarchical timer wheel for many long-lived, rarely-firing timers.
+
+Time is counted in ticks of `tick` seconds. Level 0 has one slot per tick
+for the next `slots` ticks; each higher level has slots covering `slots`
+times the span of a slot below it. A timer is placed in the lowest level
+whose span reaches its due tick and is moved down (cascaded) when the wheel
+turns past the slot holding it, so scheduling, cancelling and firing are
+O(1) per timer regardless of how many timers are pending. Timers beyond
+the top level wait in an overflow set that is re-placed once per top-level
+slot.
+"""
+import math
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class TimerWheel:
+    """Timers keyed by a hashable key; scheduling an existing key replaces it."""
+
+    def __init__(self, start: float, tick: float = 1.0, slots: int = 64, levels: int = 4):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.current = math.floor(start / tick)
+        self._wheels: List[List[Dict[Hashable, None]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._overflow: Dict[Hashable, None] = {}
+        self._due: List[Hashable] = []  # scheduled at or before the current tick
+        self._timers: Dict[Hashable, Tuple[int, Any]] = {}  # key -> (due tick, payload)
+        self._where: Dict[Hashable, Optional[Dict[Hashable, None]]] = {}  # key -> bucket holding it
+        self.fired = 0
+        self.cascaded = 0
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def schedule(self, key: Hashable, when: float, payload: Any = None):
+        """Fire `key` with `payload` on the first `advance` at or after `when` (epoch seconds)."""
+        self.cancel(key)
+        due = math.ceil(when / self.tick)
+        self._timers[key] = (due, payload)
+        self._place(key, due)
+
+    def cancel(self, key: Hashable) -> bool:
+        if key not in self._timers:
+            return False
+        del self._timers[key]
+        bucket = self._where.pop(key)
+        if bucket is None:
+            self._due.remove(key)
+        else:
+            del bucket[key]
+        return True
+
+    def when(self, key: Hashable) -> Optional[float]:
+        timer = self._timers.get(key)
+        return None if timer is None else timer[0] * self.tick
+
+    def _place(self, key: Hashable, due: int):
+        delta = due - self.current
+        if delta <= 0:
+            self._due.append(key)
+            self._where[key] = None
+            return
+        span = 1
+        for level in range(self.levels):
+            if delta < span * self.slots:
+                bucket = self._wheels[level][(due // span) % self.slots]
+                break
+            span *= self.slots
+        else:
+            bucket = self._overflow
+        bucket[key] = None
+        self._where[key] = bucket
+
+    def _cascade(self, bucket: Dict[Hashable, None]):
+        keys = list(bucket)
+        bucket.clear()
+        for key in keys:
+            self._place(key, self._timers[key][0])
+        self.cascaded += len(keys)
+
+    def advance(self, now: float) -> List[Tuple[Hashable, Any]]:
+        """Turn the wheel up to `now` and remove the timers that came due.
+
+        Returns:
+            list: (key, payload) of fired timers, in due order
+        """
+        target = math.floor(now / self.tick)
+        fired = self._pop(self._due)
+        while self.current < target:
+            if not self._timers:
+                self.current = target  # nothing pending: skip the idle ticks
+                break
+            self.current += 1
+            span = self.slots
+            for level in range(1, self.levels):
+                if self.current % span:
+                    break
+                self._cascade(self._wheels[level][(self.current // span) % self.slots])
+                span *= self.slots
+            else:
+                if self._overflow:
+                    self._cascade(self._overflow)
+            fired += self._pop(self._due)  # cascaded timers that were already due
+            slot = self._wheels[0][self.current % self.slots]
+            if slot:
+                fired += self._pop(list(slot))
+                slot.clear()
+        self.fired += len(fired)
+        return fired
+
+    def _pop(self, keys: List[Hashable]) -> List[Tuple[Hashable, Any]]:
+        fired = []
+        for key in keys:
+            fired.append((key, self._timers.pop(key)[1]))
+            del self._where[key]
+        if keys is self._due:
+            self._due = []
+        return fired
+
+    def describe(self) -> dict:
+        return {
+            "pending": len(self._timers),
+            "fired": self.fired,
+            "cascaded": self.cascaded,
+            "tickSeconds": self.tick,
+            "horizonSeconds": self.tick * self.slots ** self.levels,
+        }
@@ -0,0 +1,75 @@
+"""Stand-in AppHQ service for local testing of the "http" AppHQ source.
+
+Serves records from an AppHQ JSON file (default data/apphq_data.json) on
+the API that core.apphq_client.HttpAppHQClient speaks, with optional
+injected latency, and counts the requests it receives:
+
+    python -m backend.mocks.apphq_server --port 8100 --latency 0.05
+
+then set "apphq": {"source": "http", "url": "http://127.0.0.1:8100"} in
+config/config.json.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+from typing import List
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from backend.agents.apphq_portal import load_apphq_index
+
+DEFAULT_DATA_FILE = Path(__file__).parent.parent.parent / "data" / "apphq_data.json"
+
+
+class LookupRequest(BaseModel):
+    ait_numbers: List[str]
+
+
+def create_app(index: dict, latency: float = 0.0, max_batch: int = 1000) -> FastAPI:
+    """Mock AppHQ app serving `index` (AIT number -> record)."""
+    app = FastAPI(title="Mock AppHQ")
+    app.state.stats = {"requests": 0, "aitsRequested": 0, "found": 0}
+
+    @app.post("/aits/lookup")
+    async def lookup(request: LookupRequest):
+        if len(request.ait_numbers) > max_batch:
+            raise HTTPException(status_code=413, detail=f"At most {max_batch} AITs per request")
+        if latency:
+            await asyncio.sleep(latency)
+        records = [index[ait] for ait in request.ait_numbers if ait in index]
+        stats = app.state.stats
+        stats["requests"] += 1
+        stats["aitsRequested"] += len(request.ait_numbers)
+        stats["found"] += len(records)
+        return {"records": records}
+
+    @app.get("/aits/{ait_number}")
+    async def get_ait(ait_number: str):
+        if ait_number not in index:
+            raise HTTPException(status_code=404, detail="Unknown AIT")
+        return index[ait_number]
+
+    @app.get("/stats")
+    async def get_stats():
+        return app.state.stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stand-in AppHQ service")
+    parser.add_argument("--data", default=str(DEFAULT_DATA_FILE), help="AppHQ JSON file to serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every lookup")
+    args = parser.parse_args()
+
+    import uvicorn
+    index = load_apphq_index(args.data)
+    print(f"Mock AppHQ serving {len(index)} AITs from {args.data} on {args.host}:{args.port}")
+    uvicorn.run(create_app(index, args.latency), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Stand-in OpenAI-compatible LLM endpoint for offline runs and benchmarks.
+
+Answers POST /v1/chat/completions (plain and `stream: true`) and
+GET /v1/models with scripted replies after an injected latency, and counts
+requests, concurrent requests and the TCP connections they arrived on, so
+connection reuse of core.llm_transport can be measured:
+
+    python -m backend.mocks.llm_server --port 8200 --latency 0.2 --script script.json
+
+then set "llm": {"base_url": "http://127.0.0.1:8200/v1"} in
+config/config.json (any API key is accepted).
+
+A script is a JSON file of rules tried in order against the text of the
+last message; the first rule whose `match` regex is found answers, else
+`default`:
+
+    {"responses": [{"match": "FilterIAMTickets", "tool_calls": [{"name": "FilterIAMTickets", "arguments": {}}]},
+                   {"match": "flaky", "status": 503, "latency": 1.0}],
+     "default": {"content": "OK"}}
+
+`latency` (seconds) overrides --latency for that rule, `status` answers with
+an OpenAI-style error instead of a completion.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from typing import List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEFAULT_SCRIPT = {"responses": [], "default": {"content": "OK"}}
+
+
+class Script:
+    """Scripted replies: ordered (regex, reply) rules plus a default reply."""
+
+    def __init__(self, script: Optional[dict] = None):
+        script = script or DEFAULT_SCRIPT
+        self.rules = [(re.compile(rule.get("match", "")), rule) for rule in script.get("responses", [])]
+        self.default = script.get("default", DEFAULT_SCRIPT["default"])
+
+    @classmethod
+    def load(cls, path: str) -> "Script":
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    def reply(self, text: str) -> dict:
+        for pattern, rule in self.rules:
+            if pattern.search(text):
+                return rule
+        return self.default
+
+
+def message_text(messages: List[dict]) -> str:
+    """Text of the last message (string content or a list of content parts)."""
+    if not messages:
+        return ""
+    content = messages[-1].get("content") or ""
+    if isinstance(content, list):
+        content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content
+
+
+def _tool_calls(reply: dict, request_id: int) -> List[dict]:
+    return [
+        {"id": f"call_mock_{request_id}_{i}", "type": "function",
+         "function": {"name": call["name"], "arguments": json.dumps(call.get("arguments", {}))}}
+        for i, call in enumerate(reply.get("tool_calls", []))
+    ]
+
+
+def create_app(script: Optional[Script] = None, latency: float = 0.0, jitter: float = 0.0) -> FastAPI:
+    """Mock OpenAI-compatible app answering from `script` after `latency` (+ up to `jitter`) seconds."""
+    script = script or Script()
+    app = FastAPI(title="Mock LLM")
+    app.state.stats = {"requests": 0, "connections": 0, "inFlight": 0, "maxInFlight": 0, "errors": 0,
+                       "promptTokens": 0, "completionTokens": 0}
+    seen_connections = set()
+
+    @app.middleware("http")
+    async def count_connections(request: Request, call_next):
+        # Each TCP connection has its own client (host, port); a port reused later counts once
+        client = request.scope.get("client")
+        if client is not None and tuple(client) not in seen_connections:
+            seen_connections.add(tuple(client))
+            app.state.stats["connections"] += 1
+        return await call_next(request)
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "mock", "object": "model", "created": 0, "owned_by": "mock"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats = app.state.stats
+        stats["requests"] += 1
+        request_id = stats["requests"]
+        text = message_text(body.get("messages", []))
+        reply = script.reply(text)
+
+        stats["inFlight"] += 1
+        stats["maxInFlight"] = max(stats["maxInFlight"], stats["inFlight"])
+        try:
+            delay = reply.get("latency", latency) + (random.uniform(0, jitter) if jitter else 0.0)
+            if delay:
+                await asyncio.sleep(delay)
+        finally:
+            stats["inFlight"] -= 1
+
+        if reply.get("status"):
+            stats["errors"] += 1
+            return JSONResponse(status_code=reply["status"], content={
+                "error": {"message": reply.get("content", "Scripted error"), "type": "mock_error", "code": reply["status"]}})
+
+        tool_calls = _tool_calls(reply, request_id)
+        content = reply.get("content", None if tool_calls else "")
+        usage = {"prompt_tokens": len(text.split()), "completion_tokens": len((content or "").split())}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        stats["promptTokens"] += usage["prompt_tokens"]
+        stats["completionTokens"] += usage["completion_tokens"]
+        completion_id = f"chatcmpl-mock-{request_id}"
+        model = body.get("model", "mock")
+        finish_reason = "tool_calls" if tool_calls else "stop"
+
+        if body.get("stream"):
+            def sse():
+                delta = {"role": "assistant", "content": content or ""}
+                if tool_calls:
+                    delta["tool_calls"] = [{"index": i, **call} for i, call in enumerate(tool_calls)]
+                for choice in ({"index": 0, "delta": delta, "finish_reason": None},
+                               {"index": 0, "delta": {}, "finish_reason": finish_reason}):
+                    chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                             "model": model, "choices": [choice]}
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(sse(), media_type="text/event-stream")
+
+        message = {"role": "assistant", "content": content}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": usage,
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return app.state.stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stand-in OpenAI-compatible LLM endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8200)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every completion")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds, uniformly random")
+    parser.add_argument("--script", help="JSON file of scripted replies (default: always 'OK')")
+    args = parser.parse_args()
+
+    import uvicorn
+    script = Script.load(args.script) if args.script else Script()
+    print(f"Mock LLM serving {len(script.rules)} scripted rule(s) on {args.host}:{args.port}")
+    uvicorn.run(create_app(script, args.latency, args.jitter), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
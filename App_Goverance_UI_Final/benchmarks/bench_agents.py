@@ -0,0 +1,194 @@
+"""Benchmark every pipeline agent and IAMOrchestrator.run on synthetic data.
+
+Each benchmark runs in its own process so the reported peak RSS belongs to
+that benchmark alone. Results are printed as a table and written as JSON:
+
+    python -m benchmarks.bench_agents --tickets 100000 --aits 5000 --json results.json
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.synthetic_data import write_dataset
+
+# Pipeline order; each agent is benchmarked on the output of the stages before it
+STAGES = [
+    "ticket_fetcher",
+    "category_checker",
+    "sla_prioritizer",
+    "apphq_resolver",
+    "app_owner_checker",
+    "evidence_collector",
+    "closer",
+]
+# orchestrator_run starts cold every repeat; orchestrator_rerun reuses the stage cache of a first run
+BENCHMARKS = STAGES + ["orchestrator_run", "orchestrator_rerun"]
+
+
+def peak_rss_mb():
+    """Peak resident set size of the current process in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def build_orchestrator(dataset: dict):
+    from backend.core.orchestrator import IAMOrchestrator
+
+    orch = IAMOrchestrator("benchmark-key", config_file=str(ROOT_DIR / "config" / "config.json"))
+    orch.fetcher.data_file = dataset["ticket_file"]
+    orch.ownership.data_file = dataset["apphq_file"]
+    return orch
+
+
+def _copy(tickets):
+    from backend.models.ticket_context import TicketResponse
+
+    return TicketResponse(tickets=[t.model_copy() for t in tickets.tickets])
+
+
+def _stage_call(orch, name):
+    return {
+        "category_checker": orch.categorizer.invoke,
+        "sla_prioritizer": orch.sla.invoke,
+        "apphq_resolver": orch.ownership.invoke,
+        "app_owner_checker": orch.app_space_checker.invoke,
+        "evidence_collector": lambda t: orch.evidence.invoke(t, send=False),
+        "closer": orch.closer.invoke,
+    }[name]
+
+
+def prepare_input(orch, name):
+    """Run (untimed) every stage before `name` and return its input."""
+    tickets = orch.fetcher.invoke()
+    for stage in STAGES[1:STAGES.index(name)]:
+        if stage == "evidence_collector":
+            continue  # returns emails, tickets pass through unchanged
+        tickets = _stage_call(orch, stage)(tickets)
+    return tickets
+
+
+def run_benchmark(name: str, dataset: dict, repeat: int) -> dict:
+    """Run one benchmark in the current process and return its measurements."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        orch = build_orchestrator(dataset)
+        base = None if name.startswith("orchestrator") or name == "ticket_fetcher" else prepare_input(orch, name)
+        if name == "orchestrator_rerun":
+            orch.run()
+
+        timings = []
+        items = 0
+        for _ in range(repeat):
+            if name == "ticket_fetcher":
+                call, arg, items = orch.fetcher.invoke, None, dataset["tickets"]
+            elif name == "orchestrator_run":
+                orch.stage_cache.clear()
+                call, arg, items = orch.run, None, dataset["tickets"]
+            elif name == "orchestrator_rerun":
+                call, arg, items = orch.run, None, dataset["tickets"]
+            else:
+                call, arg = _stage_call(orch, name), _copy(base)
+                items = len(arg.tickets)
+
+            start = time.perf_counter()
+            call() if arg is None else call(arg)
+            timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    return {
+        "name": name,
+        "items": items,
+        "repeat": repeat,
+        "seconds": [round(t, 6) for t in timings],
+        "best_seconds": round(best, 6),
+        "mean_seconds": round(sum(timings) / len(timings), 6),
+        "throughput_per_sec": round(items / best, 1) if best > 0 else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _child(name, dataset, repeat, queue):
+    try:
+        queue.put(run_benchmark(name, dataset, repeat))
+    except Exception as e:
+        queue.put({"name": name, "error": f"{type(e).__name__}: {e}"})
+
+
+def run_isolated(name: str, dataset: dict, repeat: int) -> dict:
+    """Run a benchmark in a fresh process so peak RSS is not shared between runs."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(name, dataset, repeat, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline agents on synthetic data")
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--aits", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", choices=BENCHMARKS, help="Subset of benchmarks to run")
+    parser.add_argument("--data-dir", help="Write the dataset here instead of a temp dir")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    parser.add_argument("--no-isolate", action="store_true", help="Run all benchmarks in this process")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-data-") as tmp:
+        data_dir = args.data_dir or tmp
+        print(f"Generating {args.tickets} tickets over {args.aits} AITs in {data_dir} ...")
+        start = time.perf_counter()
+        dataset = write_dataset(data_dir, args.tickets, args.aits, args.seed)
+        print(f"Dataset ready in {time.perf_counter() - start:.1f}s")
+
+        results = []
+        for name in args.only or BENCHMARKS:
+            result = run_benchmark(name, dataset, args.repeat) if args.no_isolate \
+                else run_isolated(name, dataset, args.repeat)
+            results.append(result)
+            if "error" in result:
+                print(f"{name:<20} ERROR {result['error']}")
+            else:
+                print(f"{name:<20} {result['items']:>9} items  best {result['best_seconds']:>9.4f}s  "
+                      f"{result['throughput_per_sec'] or 0:>12,.0f}/s  peak RSS {result['peak_rss_mb']} MB")
+
+    report = {
+        "benchmark": "agents",
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "dataset": {"tickets": args.tickets, "aits": args.aits, "seed": args.seed},
+        "results": results,
+    }
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.json_path}")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
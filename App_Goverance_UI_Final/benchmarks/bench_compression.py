@@ -0,0 +1,146 @@
+"""Bytes-on-the-wire and CPU cost of compressing ticket snapshots.
+
+Builds the exact payloads the API server sends (the /api/tickets body, the
+WebSocket initial_state snapshot and a single ticket_update) for synthetic
+tickets and measures every encoding the server can negotiate:
+
+    python -m benchmarks.bench_compression --tickets 5000 --json compression.json
+
+permessage-deflate is measured as a raw deflate stream with the settings
+websockets uses, both for a cold snapshot and for a ticket_update sent
+after the snapshot on the same connection (context takeover).
+"""
+import argparse
+import gzip
+import json
+import platform
+import sys
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.synthetic_data import generate_tickets
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def build_payloads(num_tickets: int) -> dict:
+    from backend.api_server import create_frontend_ticket
+    from backend.core.serialization import TicketJSONCache
+    from backend.core.ticket_store import TicketStore
+    from backend.models.ticket_context import Ticket
+
+    store = TicketStore()
+    cache = TicketJSONCache(store)
+    for rec in generate_tickets(num_tickets, max(1, num_tickets // 10)):
+        ticket = create_frontend_ticket(Ticket(**rec))
+        store[ticket["id"]] = ticket
+    first = next(iter(store.keys()))
+    return {
+        "list_body": cache.list_body(),
+        "initial_state": cache.message("initial_state", list(store.keys())),
+        "ticket_update": cache.ticket_message("ticket_update", first),
+    }
+
+
+def deflate_stream(level: int = 6):
+    # Raw deflate, as negotiated by permessage-deflate (websockets uses memLevel=5)
+    return zlib.compressobj(level, zlib.DEFLATED, -15, 5)
+
+
+def permessage_deflate(data: bytes, stream=None) -> bytes:
+    stream = stream or deflate_stream()
+    out = stream.compress(data) + stream.flush(zlib.Z_SYNC_FLUSH)
+    return out[:-4]  # the empty-block trailer is stripped on the wire
+
+
+def encoders():
+    result = {
+        "identity": lambda b: b,
+        "gzip-1": lambda b: gzip.compress(b, compresslevel=1, mtime=0),
+        "gzip-6": lambda b: gzip.compress(b, compresslevel=6, mtime=0),
+        "gzip-9": lambda b: gzip.compress(b, compresslevel=9, mtime=0),
+        "permessage-deflate": permessage_deflate,
+    }
+    if brotli is not None:
+        result["br-4"] = lambda b: brotli.compress(b, quality=4)
+        result["br-11"] = lambda b: brotli.compress(b, quality=11)
+    return result
+
+
+def measure(encode, data: bytes, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        out = encode(data)
+        timings.append(time.process_time() - start)
+    timings.sort()
+    return {
+        "bytes": len(out),
+        "ratio": round(len(data) / len(out), 2) if out else None,
+        "cpu_ms_median": round(timings[len(timings) // 2] * 1000, 3),
+    }
+
+
+def run(num_tickets: int, repeat: int) -> dict:
+    payloads = build_payloads(num_tickets)
+    results = {}
+    for name, data in payloads.items():
+        results[name] = {enc: measure(fn, data, repeat) for enc, fn in encoders().items()}
+
+    # ticket_update following initial_state on one connection reuses the deflate window
+    stream = deflate_stream()
+    permessage_deflate(payloads["initial_state"], stream)
+    warm = permessage_deflate(payloads["ticket_update"], stream)
+    results["ticket_update"]["permessage-deflate-after-snapshot"] = {
+        "bytes": len(warm),
+        "ratio": round(len(payloads["ticket_update"]) / len(warm), 2),
+        "cpu_ms_median": None,
+    }
+    return results
+
+
+def print_table(results: dict):
+    for payload, rows in results.items():
+        print(f"\n{payload}")
+        print(f"  {'encoding':36} {'bytes':>12} {'ratio':>8} {'cpu ms':>10}")
+        for enc, row in rows.items():
+            cpu = "-" if row["cpu_ms_median"] is None else f"{row['cpu_ms_median']:.3f}"
+            print(f"  {enc:36} {row['bytes']:>12} {row['ratio']:>8} {cpu:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark snapshot compression size and CPU cost")
+    parser.add_argument("--tickets", type=int, default=1000, help="Synthetic tickets in the snapshot")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per encoding")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    results = run(args.tickets, max(1, args.repeat))
+    print_table(results)
+    if not brotli:
+        print("\n(brotli not installed: pip install brotli to include br results)")
+
+    if args.json_path:
+        report = {
+            "benchmark": "compression",
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args),
+            "results": results,
+        }
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
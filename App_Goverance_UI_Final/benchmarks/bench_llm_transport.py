@@ -0,0 +1,155 @@
+"""Connection reuse and concurrency of the LLM HTTP transport, fully offline.
+
+Starts the mock OpenAI-compatible server (backend/mocks/llm_server.py) in
+process and sends chat completions through ChatOpenAI from a thread pool,
+like the stage executor does, with:
+
+  * shared       - one LLMTransport for every call (keep-alive pool)
+  * no_keepalive - one LLMTransport with max_keepalive_connections=0
+  * per_call     - a new ChatOpenAI with its own transport per call
+
+    python -m benchmarks.bench_llm_transport --requests 500 --concurrency 20 --latency 0.05 --json llm.json
+
+Reports throughput, latency percentiles and the TCP connections the server
+accepted per scenario.
+"""
+import argparse
+import json
+import platform
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+SCENARIOS = ("shared", "no_keepalive", "per_call")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_mock(latency: float, jitter: float):
+    """(uvicorn server, base URL, app) of a mock LLM served on a background thread"""
+    import uvicorn
+    from backend.mocks.llm_server import create_app
+
+    port = free_port()
+    app = create_app(latency=latency, jitter=jitter)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning",
+                                           timeout_keep_alive=30))
+    threading.Thread(target=server.run, name="mock-llm", daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}/v1", app
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 2)
+
+
+def run_scenario(name: str, llm_config: dict, num_requests: int, concurrency: int, app) -> dict:
+    from backend.core.llm_transport import create_llm_transport
+
+    shared = None
+    if name != "per_call":
+        config = llm_config
+        if name == "no_keepalive":
+            config = {**llm_config, "http": {**llm_config["http"], "max_keepalive_connections": 0}}
+        shared = create_llm_transport(config)
+        llm = shared.chat_model(config, "mock")
+
+    def call(i: int) -> float:
+        start = time.perf_counter()
+        if shared is None:
+            transport = create_llm_transport(llm_config)
+            try:
+                transport.chat_model(llm_config, "mock").invoke(f"request {i}")
+            finally:
+                transport.close()
+        else:
+            llm.invoke(f"request {i}")
+        return time.perf_counter() - start
+
+    before = dict(app.state.stats)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(call, range(num_requests)))
+    elapsed = time.perf_counter() - start
+    if shared is not None:
+        shared.close()
+    stats = app.state.stats
+    return {
+        "requests": stats["requests"] - before["requests"],
+        "connections": stats["connections"] - before["connections"],
+        "max_in_flight": stats["maxInFlight"],
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(num_requests / elapsed, 1),
+        "p50_ms": percentile(latencies, 0.5),
+        "p99_ms": percentile(latencies, 0.99),
+    }
+
+
+def run(num_requests: int, concurrency: int, latency: float, jitter: float, max_connections: int) -> dict:
+    server, base_url, app = start_mock(latency, jitter)
+    llm_config = {
+        "model": "mock", "temperature": 0, "base_url": base_url, "timeout_seconds": 30, "max_retries": 0,
+        "http": {"max_connections": max_connections, "max_keepalive_connections": max_connections},
+    }
+    results = {}
+    try:
+        run_scenario("per_call", llm_config, 2, 1, app)  # warm up imports and the server
+        for name in SCENARIOS:
+            app.state.stats["maxInFlight"] = 0
+            results[name] = run_scenario(name, llm_config, num_requests, concurrency, app)
+    finally:
+        server.should_exit = True
+    return results
+
+
+def print_table(results: dict, num_requests: int, concurrency: int):
+    print(f"\nLLM transport: {num_requests} completions, {concurrency} concurrent callers")
+    print(f"  {'scenario':14} {'connections':>12} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'max in flight':>14}")
+    for name in SCENARIOS:
+        row = results[name]
+        print(f"  {name:14} {row['connections']:>12} {row['requests_per_s']:>9} {row['p50_ms']:>9} "
+              f"{row['p99_ms']:>9} {row['max_in_flight']:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pooled LLM transport against a local mock LLM")
+    parser.add_argument("--requests", type=int, default=500, help="Chat completions per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent callers (threads)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock completion latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random mock latency, up to seconds")
+    parser.add_argument("--max-connections", type=int, default=20, help="Transport pool size")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    results = run(args.requests, max(1, args.concurrency), args.latency, args.jitter, args.max_connections)
+    print_table(results, args.requests, args.concurrency)
+
+    if args.json_path:
+        report = {
+            "benchmark": "llm_transport",
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args),
+            "results": results,
+        }
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Memory and CPU cost of per-ticket stage state: compact codes vs JSON dicts.
+
+Builds synthetic tickets, advances each to a random pipeline stage with the
+messages the pipeline writes, and compares the compact StageStates
+representation with the former list of eight {"id", "name", "status",
+"message"} dicts per ticket:
+
+    python -m benchmarks.bench_stage_state --tickets 100000 --json stage_state.json
+
+Reports traced memory of the stage state alone and of whole tickets, the
+time to serialize every ticket (the API boundary, where StageStates is
+expanded) and the time to read one stage status from every ticket.
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.synthetic_data import generate_tickets
+
+# Messages set_stage writes on the way through the pipeline: (completed, in progress) per stage
+STAGE_MESSAGES = (
+    ("Ticket fetched successfully", "Agent: Fetching ticket..."),
+    ("✅ Category validated", "Agent: Checking category..."),
+    ("✅ Priority confirmed", "⏸️ Waiting for priority confirmation..."),
+    ("✅ Ownership enriched", "Agent: Enriching ownership..."),
+    ("✅ App owner verified", "Agent: Checking app owner space..."),
+    ("✅ Evidence collected", "⏸️ Waiting for application team review..."),
+    ("✅ Ticket closed", "⏸️ Waiting for final closure confirmation..."),
+    ("✅ Logged successfully", "Agent: Logging results..."),
+)
+
+
+def build_tickets(num_tickets: int, seed: int, now: datetime = None) -> list:
+    from backend.api_server import create_frontend_ticket
+    from backend.models.ticket_context import Ticket
+
+    rng = random.Random(seed)
+    tickets = []
+    for rec in generate_tickets(num_tickets, max(1, num_tickets // 10), seed=seed, now=now):
+        ticket = create_frontend_ticket(Ticket(**rec))
+        current = rng.randrange(len(STAGE_MESSAGES))
+        for index in range(1, current):
+            ticket["stages"].set(index, "completed", STAGE_MESSAGES[index][0])
+        if current:
+            ticket["stages"].set(current, "in-progress", STAGE_MESSAGES[current][1])
+        ticket["currentStage"] = current
+        tickets.append(ticket)
+    return tickets
+
+
+def as_dicts(ticket: dict) -> dict:
+    """The ticket with the former list-of-dicts stage state"""
+    return {**ticket, "stages": ticket["stages"].to_json()}
+
+
+def traced(build) -> tuple:
+    """(result, bytes allocated by build() and still alive)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, current
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        timings.append(time.process_time() - start)
+    timings.sort()
+    return round(timings[len(timings) // 2] * 1000, 2)
+
+
+def run(num_tickets: int, repeat: int, seed: int) -> dict:
+    from backend.core.serialization import dumps
+    from backend.core.stage_state import StageStates
+
+    now = datetime.utcnow()  # both builds get identical tickets
+    build_tickets(1, seed, now)  # import everything before tracing
+    # Whole tickets as the store holds them, then the stage state on its own
+    compact, compact_ticket_bytes = traced(lambda: build_tickets(num_tickets, seed, now))
+    dicts, dict_ticket_bytes = traced(lambda: [as_dicts(t) for t in build_tickets(num_tickets, seed, now)])
+    _, compact_stage_bytes = traced(lambda: [StageStates.from_json(t["stages"]) for t in dicts])
+    _, dict_stage_bytes = traced(lambda: [t["stages"].to_json() for t in compact])
+    assert all(dumps(a) == dumps(b) for a, b in zip(compact, dicts))
+
+    results = {}
+    for name, tickets, stage_bytes, ticket_bytes, read in (
+        ("dicts", dicts, dict_stage_bytes, dict_ticket_bytes, lambda t: t["stages"][6]["status"]),
+        ("compact", compact, compact_stage_bytes, compact_ticket_bytes, lambda t: t["stages"].status(6)),
+    ):
+        results[name] = {
+            "stage_state_bytes": stage_bytes,
+            "ticket_bytes": ticket_bytes,
+            "stage_state_bytes_per_ticket": round(stage_bytes / num_tickets, 1),
+            "ticket_bytes_per_ticket": round(ticket_bytes / num_tickets, 1),
+            "serialize_all_ms": timed(lambda: [dumps(t) for t in tickets], repeat),
+            "read_status_all_ms": timed(lambda: [read(t) for t in tickets], repeat),
+        }
+    results["stage_state_reduction"] = round(dict_stage_bytes / compact_stage_bytes, 2)
+    results["ticket_reduction"] = round(dict_ticket_bytes / compact_ticket_bytes, 2)
+    return results
+
+
+def print_table(results: dict, num_tickets: int):
+    print(f"\nStage state for {num_tickets} tickets")
+    print(f"  {'representation':16} {'stage B/ticket':>15} {'ticket B/ticket':>16} {'serialize ms':>13} {'read ms':>9}")
+    for name in ("dicts", "compact"):
+        row = results[name]
+        print(f"  {name:16} {row['stage_state_bytes_per_ticket']:>15} {row['ticket_bytes_per_ticket']:>16} "
+              f"{row['serialize_all_ms']:>13} {row['read_status_all_ms']:>9}")
+    print(f"\n  stage state {results['stage_state_reduction']}x smaller, "
+          f"whole tickets {results['ticket_reduction']}x smaller")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compact stage state against per-ticket dicts")
+    parser.add_argument("--tickets", type=int, default=100000, help="Synthetic tickets")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    results = run(args.tickets, max(1, args.repeat), args.seed)
+    print_table(results, args.tickets)
+
+    if args.json_path:
+        report = {
+            "benchmark": "stage_state",
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args),
+            "results": results,
+        }
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
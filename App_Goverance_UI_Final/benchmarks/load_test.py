@@ -0,0 +1,365 @@
+"""Local load test for backend/api_server.py and its WebSocket fan-out.
+
+Starts the real FastAPI app in a child process with stub agents, connects N
+dashboard clients to /ws and drives M tickets through
+process -> confirm-priority -> approve-review -> confirm-closure:
+
+    python -m benchmarks.load_test --clients 50 --tickets 200 --in-flight 20 --json load.json
+
+Stub agent latency is a distribution (see backend/agents/stub_agents.py):
+`--latency fixed:0.5`, `--latency normal:0.5:0.1` (mean, stddev) or
+`--latency long_tail:0.3:4` (median, p99); `--error-rate` injects failures,
+which go through the server's stage retries and dead-letter queue.
+
+Every broadcast is stamped with the server send time so clients can measure
+broadcast-to-receive latency. Server CPU and RSS are sampled from /proc
+(Linux only; reported as null elsewhere).
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import websockets
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+# ----------------------------------------------------------------------------
+# Server side (child process)
+# ----------------------------------------------------------------------------
+
+class _PassThroughAgent:
+    """Returns its input (the synthetic tickets match no AppHQ or policy data)."""
+
+    def invoke(self, tickets, *args, **kwargs):
+        return tickets
+
+
+class _StubFetcher:
+    def __init__(self, num_tickets: int):
+        self.num_tickets = num_tickets
+
+    def invoke(self):
+        from benchmarks.synthetic_data import generate_tickets
+        from backend.models.ticket_context import Ticket, TicketResponse
+
+        tickets = []
+        for rec in generate_tickets(self.num_tickets, max(1, self.num_tickets // 10)):
+            rec["category"] = "IAM"
+            tickets.append(Ticket(**rec))
+        return TicketResponse(tickets=tickets)
+
+
+class StubOrchestrator:
+    """Drop-in for IAMOrchestrator with no LLM and no file/SMTP access."""
+
+    def __init__(self, num_tickets: int, stub_config: dict = None):
+        from backend.agents.stub_agents import STAGE_AGENTS, wrap_stub_agents
+
+        self.fetcher = _StubFetcher(num_tickets)
+        for name in STAGE_AGENTS:
+            setattr(self, name, _PassThroughAgent())
+        wrap_stub_agents(self, stub_config or {})
+
+
+def parse_latency(spec: str) -> dict:
+    """"fixed:0.5" / "normal:0.5:0.1" / "long_tail:0.3:4" -> latency config"""
+    name, *values = spec.split(":")
+    params = {"fixed": ["seconds"], "normal": ["mean", "stddev"], "long_tail": ["median", "p99", "max"]}[name]
+    return {"distribution": name, **dict(zip(params, map(float, values)))}
+
+
+def serve(port: int, num_tickets: int, stub_config: dict):
+    """Child process entry point: run api_server with stub agents on localhost."""
+    import uvicorn
+    from backend import api_server
+
+    api_server.orchestrator = StubOrchestrator(num_tickets, stub_config)
+
+    original_send = api_server.manager.send_payload
+
+    async def stamped_send(payload: bytes, connections):
+        # Every message is a JSON object; prepend the send timestamp
+        await original_send(b'{"_sentAt":%f,' % time.time() + payload[1:], connections)
+
+    api_server.manager.send_payload = stamped_send
+
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull  # the pipeline prints per stage
+        uvicorn.run(api_server.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+# ----------------------------------------------------------------------------
+# Server resource sampling
+# ----------------------------------------------------------------------------
+
+class ProcSampler:
+    """Samples CPU time and RSS of a pid from /proc at a fixed interval."""
+
+    def __init__(self, pid: int, interval: float = 0.25):
+        self.pid = pid
+        self.interval = interval
+        self.cpu_percent = []
+        self.rss_mb = []
+        self._clk = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+    def _read(self):
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            cpu = (int(fields[11]) + int(fields[12])) / self._clk  # utime + stime
+            with open(f"/proc/{self.pid}/status") as f:
+                rss = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+            return cpu, rss / 1024
+        except (OSError, StopIteration, IndexError, ValueError):
+            return None
+
+    async def run(self):
+        last = self._read()
+        if last is None:
+            return
+        last_t = time.monotonic()
+        while True:
+            await asyncio.sleep(self.interval)
+            sample = self._read()
+            if sample is None:
+                return
+            now = time.monotonic()
+            self.cpu_percent.append(100 * (sample[0] - last[0]) / (now - last_t))
+            self.rss_mb.append(sample[1])
+            last, last_t = sample, now
+
+    def summary(self):
+        if not self.cpu_percent:
+            return {"cpu_percent_avg": None, "cpu_percent_max": None, "rss_mb_peak": None}
+        return {
+            "cpu_percent_avg": round(sum(self.cpu_percent) / len(self.cpu_percent), 1),
+            "cpu_percent_max": round(max(self.cpu_percent), 1),
+            "rss_mb_peak": round(max(self.rss_mb), 1),
+        }
+
+
+# ----------------------------------------------------------------------------
+# Client side
+# ----------------------------------------------------------------------------
+
+def percentiles(values, points=(50, 90, 99)):
+    if not values:
+        return {f"p{p}": None for p in points} | {"max": None}
+    ordered = sorted(values)
+    result = {f"p{p}": round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 3) for p in points}
+    result["max"] = round(ordered[-1], 3)
+    return result
+
+
+class DashboardClient:
+    """One WebSocket dashboard; records per-message latency and volume."""
+
+    def __init__(self, url: str, on_message=None):
+        self.url = url
+        self.on_message = on_message
+        self.latencies_ms = []
+        self.messages = 0
+        self.bytes = 0
+
+    async def run(self, ready: asyncio.Event, stop: asyncio.Event):
+        async with websockets.connect(self.url, max_size=None) as ws:
+            await ws.recv()  # initial_state
+            ready.set()
+            while not stop.is_set():
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    continue
+                received = time.time()
+                data = json.loads(raw)
+                self.messages += 1
+                self.bytes += len(raw)
+                if "_sentAt" in data:
+                    self.latencies_ms.append((received - data["_sentAt"]) * 1000)
+                if self.on_message:
+                    self.on_message(data)
+
+
+class TicketDriver:
+    """Walks tickets through every human checkpoint as soon as it is reached."""
+
+    CHECKPOINTS = [
+        ("waitingForPriorityConfirmation", "confirm-priority"),
+        ("waitingForReview", "approve-review"),
+        ("waitingForClosureConfirmation", "confirm-closure"),
+    ]
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.events = {}
+        self.durations = []
+        self.completed = 0
+        self.failed = 0
+        self.dead_lettered = 0
+
+    def _event(self, ticket_id, key):
+        return self.events.setdefault((ticket_id, key), asyncio.Event())
+
+    def on_message(self, data: dict):
+        tickets = data.get("tickets") if data.get("type") == "tickets_update" else [data.get("ticket")]
+        for ticket in tickets:
+            if not ticket:
+                continue
+            for flag, _ in self.CHECKPOINTS:
+                if ticket.get(flag):
+                    self._event(ticket["id"], flag).set()
+            if ticket.get("status") == "completed":
+                self._event(ticket["id"], "completed").set()
+            if ticket.get("deadLettered"):
+                self._event(ticket["id"], "deadLettered").set()
+
+    async def _reach(self, ticket_id, key, timeout: float):
+        """Wait for a checkpoint event; False if the ticket was dead-lettered first."""
+        reached = asyncio.ensure_future(self._event(ticket_id, key).wait())
+        dead = asyncio.ensure_future(self._event(ticket_id, "deadLettered").wait())
+        done, pending = await asyncio.wait({reached, dead}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        if not done:
+            raise asyncio.TimeoutError
+        return reached in done
+
+    async def drive(self, client: httpx.AsyncClient, ticket_id: str, timeout: float):
+        start = time.perf_counter()
+        try:
+            await client.post(f"{self.base_url}/api/tickets/{ticket_id}/process")
+            for flag, action in self.CHECKPOINTS:
+                if not await self._reach(ticket_id, flag, timeout):
+                    self.dead_lettered += 1
+                    return
+                await client.post(f"{self.base_url}/api/tickets/{ticket_id}/{action}")
+            if not await self._reach(ticket_id, "completed", timeout):
+                self.dead_lettered += 1
+                return
+            self.durations.append((time.perf_counter() - start) * 1000)
+            self.completed += 1
+        except asyncio.TimeoutError:
+            self.failed += 1
+
+
+async def run_load(args, port: int, server_pid: int) -> dict:
+    base_url = f"http://127.0.0.1:{port}"
+    ws_url = f"ws://127.0.0.1:{port}/ws"
+
+    async with httpx.AsyncClient(timeout=30) as client:
+        # Wait for startup (ticket load happens in the startup hook)
+        for _ in range(200):
+            try:
+                if (await client.get(f"{base_url}/")).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+        ticket_ids = [t["id"] for t in (await client.get(f"{base_url}/api/tickets")).json()["tickets"]]
+
+        driver = TicketDriver(base_url)
+        clients = [DashboardClient(ws_url, driver.on_message if i == 0 else None)
+                   for i in range(max(1, args.clients))]
+        stop = asyncio.Event()
+        ready = [asyncio.Event() for _ in clients]
+        client_tasks = [asyncio.create_task(c.run(r, stop)) for c, r in zip(clients, ready)]
+        await asyncio.gather(*(r.wait() for r in ready))
+
+        sampler = ProcSampler(server_pid)
+        sampler_task = asyncio.create_task(sampler.run())
+
+        semaphore = asyncio.Semaphore(args.in_flight)
+
+        async def bounded(ticket_id):
+            async with semaphore:
+                await driver.drive(client, ticket_id, args.timeout)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(bounded(t) for t in ticket_ids[:args.tickets]))
+        elapsed = time.perf_counter() - start
+
+        await asyncio.sleep(0.5)  # drain trailing broadcasts
+        stop.set()
+        await asyncio.gather(*client_tasks, return_exceptions=True)
+        sampler_task.cancel()
+
+    latencies = [lat for c in clients for lat in c.latencies_ms]
+    messages = sum(c.messages for c in clients)
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "tickets": {
+            "completed": driver.completed,
+            "timed_out": driver.failed,
+            "dead_lettered": driver.dead_lettered,
+            "per_sec": round(driver.completed / elapsed, 2) if elapsed else None,
+            "pipeline_ms": percentiles(driver.durations),
+        },
+        "broadcast_latency_ms": percentiles(latencies),
+        "messages": {
+            "received_total": messages,
+            "received_per_sec": round(messages / elapsed, 1) if elapsed else None,
+            "per_client_avg": round(messages / len(clients), 1),
+            "bytes_total": sum(c.bytes for c in clients),
+        },
+        "server": sampler.summary(),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API server and WebSocket fan-out")
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent WebSocket dashboards")
+    parser.add_argument("--tickets", type=int, default=100, help="Tickets driven through the pipeline")
+    parser.add_argument("--in-flight", type=int, default=10, help="Max tickets in the pipeline at once")
+    parser.add_argument("--latency", type=parse_latency, default="fixed:0",
+                        help="Stub agent latency: fixed:S, normal:MEAN:STDDEV or long_tail:MEDIAN:P99[:MAX]")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability a stub agent call fails")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for stub latency and failures")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-checkpoint timeout in seconds")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    port = _free_port()
+    ctx = multiprocessing.get_context("spawn")
+    stub_config = {"seed": args.seed, "default": {"latency": args.latency, "error_rate": args.error_rate}}
+    server = ctx.Process(target=serve, args=(port, args.tickets, stub_config), daemon=True)
+    server.start()
+    try:
+        results = asyncio.run(run_load(args, port, server.pid))
+    finally:
+        server.terminate()
+        server.join()
+
+    report = {
+        "benchmark": "load_test",
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": vars(args),
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
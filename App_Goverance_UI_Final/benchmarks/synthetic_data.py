@@ -0,0 +1,186 @@
+"""Synthetic ticket / AppHQ dataset generator for benchmarks.
+
+Produces files with the same shape as data/ticket_data.json and
+data/apphq_data.json, at any scale, e.g.:
+
+    python -m benchmarks.synthetic_data --tickets 1000000 --aits 50000 --out-dir /tmp/bench
+"""
+import argparse
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Relative weights of ticket categories (IAM dominates the real backlog)
+CATEGORY_MIX = {"IAM": 0.55, "APP": 0.20, "SECURITY": 0.15, "DATA": 0.10}
+
+# (weight, min_days, max_days) of the SLA deadline relative to "now".
+# Buckets line up with SLAPrioritizerAgent's High/Medium/Low thresholds.
+DEADLINE_MIX = [
+    (0.05, -10, -1),   # already breached
+    (0.15, 0, 2),      # High
+    (0.20, 3, 5),      # Medium
+    (0.60, 6, 60),     # Low
+]
+
+# Share of application owners that are outside our space and get filtered out
+FOREIGN_OWNER_RATE = 0.10
+# Share of tickets that reference an AIT unknown to AppHQ
+UNKNOWN_AIT_RATE = 0.02
+
+FIRST_NAMES = [
+    "alice", "bob", "carol", "david", "eva", "frank", "grace", "henry", "iris",
+    "jack", "kate", "leo", "mary", "nathan", "olivia", "paul", "quinn", "rachel",
+    "sam", "tina", "uma", "victor", "wendy", "xavier", "yara", "zack",
+]
+APP_WORDS = [
+    "Finance", "HR", "CRM", "Authentication", "Marketing", "Customer", "ERP",
+    "Employee", "Cloud", "Sales", "Database", "Payments", "Treasury", "Risk",
+    "Analytics", "Billing", "Identity", "Trading", "Lending", "Compliance",
+]
+APP_SUFFIXES = ["Portal", "System", "Service", "Platform", "Directory", "Gateway", "Hub"]
+DESCRIPTIONS = {
+    "IAM": [
+        "Ensure ARM auto-provisioning for role {role} is enabled and evidence captured.",
+        "Update access control policies for {team} team resources.",
+        "Implement role-based access control for {app}.",
+        "Revoke access for terminated employees across {app} immediately.",
+        "Configure single sign-on integration for {app}.",
+        "Quarterly access review of privileged accounts on {app}.",
+    ],
+    "APP": [
+        "Enable multi-factor authentication for {app}.",
+        "Upgrade runtime dependencies of {app} to supported versions.",
+    ],
+    "SECURITY": [
+        "Patch critical vulnerability in {app} (CVE-{year}-{num}).",
+        "Rotate service credentials used by {app}.",
+    ],
+    "DATA": [
+        "Implement data encryption for customer PII in {app}.",
+        "Apply retention policy to archived records of {app}.",
+    ],
+}
+
+
+def _weighted(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _email(rng: random.Random, domain: str = "example.com") -> str:
+    return f"{rng.choice(FIRST_NAMES)}.{rng.randrange(100000)}@{domain}"
+
+
+def generate_apphq_records(num_aits: int, seed: int = 42):
+    """Yield AppHQ records for AIT-1 .. AIT-<num_aits>."""
+    rng = random.Random(seed)
+    for i in range(1, num_aits + 1):
+        domain = "external.test" if rng.random() < FOREIGN_OWNER_RATE else "example.com"
+        owner = _email(rng, domain)
+        ait_owner = _email(rng)
+        lob_owner = _email(rng)
+        yield {
+            "ait_number": f"AIT-{i}",
+            "arm_id": f"ARM-{i}",
+            "application_name": f"{rng.choice(APP_WORDS)} {rng.choice(APP_SUFFIXES)} {i}",
+            "application_owner": owner,
+            "ait_owner": ait_owner,
+            "lob_owner": lob_owner,
+            "contacts": [owner, ait_owner, lob_owner],
+        }
+
+
+def generate_tickets(num_tickets: int, num_aits: int, seed: int = 42, now: datetime = None):
+    """Yield ticket records referencing AITs with a skewed (hot-app) distribution."""
+    rng = random.Random(seed + 1)
+    now = now or datetime.utcnow()
+    buckets = [(lo, hi) for _, lo, hi in DEADLINE_MIX]
+    bucket_weights = [w for w, _, _ in DEADLINE_MIX]
+
+    for i in range(1, num_tickets + 1):
+        category = _weighted(rng, CATEGORY_MIX)
+        if rng.random() < UNKNOWN_AIT_RATE:
+            ait = f"AIT-UNKNOWN-{i}"
+        else:
+            # paretovariate gives a long tail: a few apps own most deliverables
+            ait = f"AIT-{min(num_aits, int(rng.paretovariate(1.2)))}" if rng.random() < 0.3 \
+                else f"AIT-{rng.randint(1, num_aits)}"
+        lo, hi = rng.choices(buckets, weights=bucket_weights)[0]
+        deadline = now + timedelta(days=rng.randint(lo, hi), hours=rng.randint(0, 23))
+        created = deadline - timedelta(days=rng.randint(7, 45))
+        description = rng.choice(DESCRIPTIONS[category]).format(
+            role=f"R{rng.randrange(1000)}",
+            team=rng.choice(APP_WORDS).lower(),
+            app=f"{rng.choice(APP_WORDS)} {rng.choice(APP_SUFFIXES)}",
+            year=rng.randint(2019, 2026),
+            num=rng.randint(1000, 99999),
+        )
+        yield {
+            "ticket_id": f"REQ{i:07d}",
+            "jira_story": f"JIRA-{100000 + i}",
+            "ait_number": ait,
+            "deliverableType": f"{category} Category",
+            "category": category,
+            "risk_level": "Unknown",
+            "sla_deadline": deadline.isoformat(timespec="seconds"),
+            "created_on": created.date().isoformat(),
+            "description": description,
+            "arm_id": f"ARM-{rng.randrange(1, num_aits + 1)}",
+            "application_name": "",
+            "application_owner": _email(rng),
+            "lob_owner": "",
+            "ait_owner": "",
+            "contacts": [],
+        }
+
+
+def _write_json_array(path: Path, records) -> int:
+    """Stream records into a JSON array file without holding them in memory."""
+    count = 0
+    with open(path, "w") as f:
+        f.write("[\n")
+        for rec in records:
+            if count:
+                f.write(",\n")
+            f.write(json.dumps(rec))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+def write_dataset(out_dir, num_tickets: int, num_aits: int, seed: int = 42) -> dict:
+    """Write ticket_data.json and apphq_data.json into out_dir.
+
+    Returns:
+        dict: Paths and record counts of the generated files
+    """
+    out_dir = Path(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    ticket_file = out_dir / "ticket_data.json"
+    apphq_file = out_dir / "apphq_data.json"
+    n_aits = _write_json_array(apphq_file, generate_apphq_records(num_aits, seed))
+    n_tickets = _write_json_array(ticket_file, generate_tickets(num_tickets, num_aits, seed))
+    return {
+        "ticket_file": str(ticket_file),
+        "apphq_file": str(apphq_file),
+        "tickets": n_tickets,
+        "aits": n_aits,
+        "seed": seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic ticket and AppHQ data")
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--aits", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out-dir", default="benchmarks/data")
+    args = parser.parse_args()
+
+    info = write_dataset(args.out_dir, args.tickets, args.aits, args.seed)
+    print(json.dumps(info, indent=2))
+
+
+if __name__ == "__main__":
+    main()
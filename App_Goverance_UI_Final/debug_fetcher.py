@@ -9,8 +9,8 @@ sys.path.append(os.getcwd())
 load_dotenv()
 
 from backend.agents.ticket_fetcher import TicketFetcherAgent
-from backend.core.orchestrator import IAMOrchestrator
-from langchain_openai import ChatOpenAI
+from backend.core.config import load_config
+from backend.core.llm_transport import create_llm_transport
 
 def test_fetcher():
     print("Initializing LLM...")
@@ -19,12 +19,10 @@ def test_fetcher():
         print("Error: OPEN_ROUTER_KEY_ORIGINAL not found")
         return
 
-    llm = ChatOpenAI(
-        model="gpt-3.5-turbo",
-        temperature=0,
-        api_key=api_key,
-        base_url="https://openrouter.ai/api/v1"
-    )
+    # Same model, endpoint and pooled transport as the orchestrator
+    llm_config = load_config()["llm"]
+    transport = create_llm_transport(llm_config)
+    llm = transport.chat_model(llm_config, api_key)
 
     print("Initializing Agent...")
     agent = TicketFetcherAgent(llm=llm)
@@ -37,6 +35,8 @@ def test_fetcher():
             print(f"- {t.ticket_id}: {t.description[:30]}...")
     except Exception as e:
         print(f"Error invoking agent: {e}")
+    finally:
+        transport.close()
 
 if __name__ == "__main__":
     test_fetcher()
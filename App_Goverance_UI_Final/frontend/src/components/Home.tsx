@@ -34,6 +34,14 @@ interface Ticket {
   deliverableType?: string;
   category?: string;
   slaDeadline?: string;
+  slaBreached?: boolean;
+  evidenceEmail?: {
+    status: 'queued' | 'retrying' | 'sent' | 'failed';
+    attempts: number;
+    to?: string;
+    error?: string | null;
+    digest?: { id: string; tickets: number };
+  };
   armId?: string;
   applicationName?: string;
   lobOwner?: string;
@@ -41,6 +49,18 @@ interface Ticket {
   contacts?: string[];
 }
 
+// Server-maintained aggregates (GET /api/stats, stats_update messages)
+interface TicketStats {
+  total: number;
+  byStatus: Record<string, number>;
+  byStage: Record<string, number>;
+  byRisk: Record<string, number>;
+  byCategory: Record<string, number>;
+  byLob: Record<string, number>;
+  checkpoints: Record<string, number>;
+  sla: Record<string, number>;
+}
+
 export default function Home({ currentUser, onSignOut }: HomeProps) {
   const navigate = useNavigate();
   const { ticketId } = useParams();
@@ -56,6 +76,15 @@ export default function Home({ currentUser, onSignOut }: HomeProps) {
   const [showStepsModal, setShowStepsModal] = useState(false);
   const [emailTemplate, setEmailTemplate] = useState<{ to: string, subject: string, body: string } | null>(null);
   const [showSuccessToast, setShowSuccessToast] = useState(false);
+  const [stats, setStats] = useState<TicketStats | null>(null);
+
+  // The WebSocket handlers outlive renders, so they read the filter through a ref
+  const showAllTicketsRef = useRef(showAllTickets);
+  showAllTicketsRef.current = showAllTickets;
+
+  // Same filter as the /api/tickets/iam endpoint used by the initial load
+  const matchesFilter = (ticket: Ticket) =>
+    showAllTicketsRef.current || (ticket.category ?? '').toUpperCase() === 'IAM';
 
 
   // WebSocket connection
@@ -75,6 +104,9 @@ export default function Home({ currentUser, onSignOut }: HomeProps) {
 
         switch (data.type) {
           case 'initial_state':
+            if (data.stats) {
+              setStats(data.stats);
+            }
             // Don't set tickets from WebSocket - let HTTP fetch handle initial load
             // This ensures the filter (IAM vs All) is respected
             console.log('WebSocket connected, initial state received');
@@ -83,6 +115,9 @@ export default function Home({ currentUser, onSignOut }: HomeProps) {
           case 'ticket_update':
             setTickets((prev) => {
               const index = prev.findIndex((t) => t.id === data.ticket.id);
+              if (!matchesFilter(data.ticket)) {
+                return index >= 0 ? prev.filter((t) => t.id !== data.ticket.id) : prev;
+              }
               if (index >= 0) {
                 const updated = [...prev];
                 updated[index] = data.ticket;
@@ -98,6 +133,31 @@ export default function Home({ currentUser, onSignOut }: HomeProps) {
             }
             break;
 
+          case 'tickets_update':
+            // Batched deltas (incremental sync, bulk actions)
+            setTickets((prev) => {
+              const changed = new Map<string, Ticket>(data.tickets.map((t: Ticket) => [t.id, t]));
+              const updated = prev.map((t) => changed.get(t.id) ?? t).filter(matchesFilter);
+              prev.forEach((t) => changed.delete(t.id));
+              return [...updated, ...Array.from(changed.values()).filter(matchesFilter)];
+            });
+
+            if (selectedTicket) {
+              const match = data.tickets.find((t: Ticket) => t.id === selectedTicket.id);
+              if (match) {
+                setSelectedTicket(match);
+              }
+            }
+            break;
+
+          case 'stats_update':
+            setStats(data.stats);
+            break;
+
+          case 'tickets_removed':
+            setTickets((prev) => prev.filter((t) => !data.ticketIds.includes(t.id)));
+            break;
+
           case 'processing_start':
             setStatusMessage(data.message);
             break;
@@ -446,6 +506,20 @@ export default function Home({ currentUser, onSignOut }: HomeProps) {
             </div>
           </div>
 
+          {/* Aggregates pushed by the server */}
+          {stats && (
+            <div className="flex flex-wrap gap-4 text-sm text-gray-600">
+              <span>{stats.byStatus['in-progress'] ?? 0} in progress</span>
+              <span>{stats.byStatus['completed'] ?? 0} completed</span>
+              <span>
+                {Object.values(stats.checkpoints).reduce((sum, n) => sum + n, 0)} awaiting approval
+              </span>
+              <span className={stats.sla['breached'] ? 'text-red-600' : ''}>
+                {stats.sla['breached'] ?? 0} SLA breached
+              </span>
+            </div>
+          )}
+
           {/* Status Message */}
           {statusMessage && (
             <div className="bg-blue-50 border border-blue-200 text-blue-700 px-4 py-3 rounded-lg">
@@ -492,6 +566,11 @@ export default function Home({ currentUser, onSignOut }: HomeProps) {
                           {ticket.priority === 'urgent' && (
                             <AlertCircle className="w-4 h-4 text-red-600" />
                           )}
+                          {ticket.slaBreached && ticket.status !== 'completed' && (
+                            <span className="px-2 py-1 rounded text-xs bg-red-100 text-red-700 border border-red-200">
+                              SLA breached
+                            </span>
+                          )}
                           {ticket.waitingForReview && (
                             <span className="px-2 py-1 rounded text-xs bg-yellow-100 text-yellow-700 border border-yellow-200">
                               ⏸️ Review
@@ -722,6 +801,20 @@ export default function Home({ currentUser, onSignOut }: HomeProps) {
                         <p className="text-gray-900 font-medium">{selectedTicket.slaDeadline}</p>
                       </div>
                     )}
+                    {selectedTicket.evidenceEmail && (
+                      <div>
+                        <span className="text-gray-500 text-xs uppercase tracking-wider font-semibold flex items-center gap-1 mb-1">
+                          <FileText className="w-3 h-3" /> Evidence Email
+                        </span>
+                        <p className={`font-medium capitalize ${selectedTicket.evidenceEmail.status === 'failed' ? 'text-red-700' : 'text-gray-900'}`}
+                          title={selectedTicket.evidenceEmail.error || undefined}>
+                          {selectedTicket.evidenceEmail.status}
+                          {selectedTicket.evidenceEmail.attempts > 1 && ` (${selectedTicket.evidenceEmail.attempts} attempts)`}
+                          {selectedTicket.evidenceEmail.digest && selectedTicket.evidenceEmail.digest.tickets > 1 &&
+                            ` · digest of ${selectedTicket.evidenceEmail.digest.tickets}`}
+                        </p>
+                      </div>
+                    )}
                   </div>
                 </div>
 
@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+@pytest.fixture
+def make_ticket():
+    """Ticket model with placeholder source fields"""
+    from backend.models.ticket_context import Ticket
+
+    def make(ticket_id, owner="", category="IAM"):
+        return Ticket(ticket_id=ticket_id, jira_story="J-1", ait_number="AIT-1", deliverableType="",
+                      category=category, risk_level="Low", sla_deadline="2026-01-01", created_on="2025-12-01",
+                      description="", arm_id="ARM-1", application_name="App", application_owner=owner,
+                      lob_owner="LOB", ait_owner="Owner", contacts=[])
+    return make
@@ -0,0 +1,54 @@
+import json
+
+import httpx
+import pytest
+
+from backend.core.apphq_client import AppHQError, AppHQLookup, HttpAppHQClient
+
+RECORDS = {"AIT-1": {"ait_number": "AIT-1", "lob_owner": "Finance LOB"}}
+
+
+def make_lookup(requests, fail=False, batch_size=100):
+    def handler(request):
+        asked = json.loads(request.content)["ait_numbers"]
+        requests.append(asked)
+        if fail:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"records": [RECORDS[a] for a in asked if a in RECORDS]})
+
+    source = HttpAppHQClient("http://apphq", batch_size=batch_size, transport=httpx.MockTransport(handler))
+    return AppHQLookup(source, ttl=60.0, negative_ttl=60.0, linger=0.01)
+
+
+def test_records_and_misses_are_cached():
+    requests = []
+    lookup = make_lookup(requests)
+    try:
+        assert lookup.lookup_sync(["AIT-1", "AIT-404"]) == {"AIT-1": RECORDS["AIT-1"], "AIT-404": None}
+        assert lookup.lookup_sync(["AIT-1", "AIT-404"]) == {"AIT-1": RECORDS["AIT-1"], "AIT-404": None}
+        assert len(requests) == 1
+        assert lookup.describe()["negativeHits"] == 1
+    finally:
+        lookup.close()
+
+
+def test_misses_are_split_into_batches():
+    requests = []
+    lookup = make_lookup(requests, batch_size=2)
+    try:
+        lookup.lookup_sync([f"AIT-{i}" for i in range(5)])
+        assert sorted(len(r) for r in requests) == [1, 2, 2]
+    finally:
+        lookup.close()
+
+
+def test_service_errors_raise_apphq_error_and_are_not_cached():
+    requests = []
+    lookup = make_lookup(requests, fail=True)
+    try:
+        for _ in range(2):
+            with pytest.raises(AppHQError):
+                lookup.lookup_sync(["AIT-1"])
+        assert len(requests) == 2
+    finally:
+        lookup.close()
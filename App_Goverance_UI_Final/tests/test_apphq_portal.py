@@ -0,0 +1,42 @@
+import json
+
+from backend.agents.apphq_portal import AppHQResolverAgent, diff_apphq_index
+
+
+def write(path, records):
+    path.write_text(json.dumps(records))
+
+
+def test_diff_reports_upserts_and_deletes():
+    old = {"AIT-1": {"ait_number": "AIT-1", "lob_owner": "A"}, "AIT-2": {"ait_number": "AIT-2"}}
+    new = {"AIT-1": {"ait_number": "AIT-1", "lob_owner": "B"}, "AIT-3": {"ait_number": "AIT-3"}}
+    upserts, deletes = diff_apphq_index(old, new)
+    assert set(upserts) == {"AIT-1", "AIT-3"}
+    assert deletes == ["AIT-2"]
+
+
+def test_hot_reload_diffs_against_the_last_applied_snapshot(tmp_path):
+    path = tmp_path / "apphq.json"
+    write(path, [{"ait_number": "AIT-1", "lob_owner": "Old"}, {"ait_number": "AIT-2", "lob_owner": "Gone"}])
+    resolver = AppHQResolverAgent(data_file=str(path))
+    resolver.enable_hot_reload()
+
+    write(path, [{"ait_number": "AIT-1", "lob_owner": "New owner and a longer file"}])
+    # A stage run before the watcher callback still sees the applied snapshot
+    assert resolver.records(["AIT-1"])["AIT-1"]["lob_owner"] == "Old"
+
+    index, upserts, deletes, token = resolver.diff_index()
+    assert upserts["AIT-1"]["lob_owner"] == "New owner and a longer file"
+    assert deletes == ["AIT-2"]
+
+    resolver.swap_index(index, token)
+    assert resolver.records(["AIT-1", "AIT-2"]) == {"AIT-1": upserts["AIT-1"], "AIT-2": None}
+
+
+def test_without_hot_reload_the_index_follows_the_file(tmp_path):
+    path = tmp_path / "apphq.json"
+    write(path, [{"ait_number": "AIT-1", "lob_owner": "Old"}])
+    resolver = AppHQResolverAgent(data_file=str(path))
+    assert resolver.records(["AIT-1"])["AIT-1"]["lob_owner"] == "Old"
+    write(path, [{"ait_number": "AIT-1", "lob_owner": "New owner"}])
+    assert resolver.records(["AIT-1"])["AIT-1"]["lob_owner"] == "New owner"
@@ -0,0 +1,25 @@
+import gzip
+
+from backend.core.compression import SnapshotCompressor, StreamCompressor, negotiate_encoding
+
+
+def test_negotiation_honours_q_values():
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("deflate, gzip;q=0.5") == "gzip"
+    assert negotiate_encoding("*") is not None
+
+
+def test_stream_chunks_decode_as_one_gzip_body():
+    compressor = StreamCompressor("gzip")
+    chunks = [b'{"tickets":[', b'{"id":"A"}', b"]}"]
+    body = b"".join(compressor.compress(c) for c in chunks) + compressor.finish()
+    assert gzip.decompress(body) == b"".join(chunks)
+
+
+def test_snapshot_is_compressed_once_per_key():
+    snapshots = SnapshotCompressor()
+    first = snapshots.get(1, b"x" * 1000, "gzip")
+    assert snapshots.get(1, b"ignored", "gzip") is first
+    assert gzip.decompress(snapshots.get(2, b"y" * 10, "gzip")) == b"y" * 10
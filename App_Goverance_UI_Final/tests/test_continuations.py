@@ -0,0 +1,34 @@
+from backend.core.continuations import ContinuationStore
+from backend.core.dead_letters import DeadLetterQueue
+
+
+def test_outputs_saved_at_earlier_checkpoints_are_kept(make_ticket):
+    store = ContinuationStore()
+    store.save("A", make_ticket("A"), "confirm-priority")
+    store.save("A", make_ticket("A"), "approve-review", outputs={"evidence": {"to": ["x@example.com"]}})
+    store.save("A", make_ticket("A"), "confirm-closure")
+
+    continuation = store.get("A")
+    assert continuation.checkpoint == "confirm-closure"
+    assert continuation.outputs["evidence"] == {"to": ["x@example.com"]}
+
+
+def test_update_ticket_edits_the_paused_ticket(make_ticket):
+    store = ContinuationStore()
+    store.save("A", make_ticket("A"), "confirm-priority")
+    store.update_ticket("A", risk_level="High")
+    store.update_ticket("missing", risk_level="High")
+    assert store.get("A").ticket.risk_level == "High"
+    store.discard("A")
+    assert "A" not in store
+
+
+def test_dead_letters_keep_the_latest_failure_per_ticket():
+    letters = DeadLetterQueue()
+    letters.add("A", 2, "category", "boom", 3)
+    letters.add("B", 4, "ownership", "boom", 3)
+    letters.add("A", 5, "evidence", "smtp", 3)
+    assert letters.ids() == ["B", "A"]
+    assert letters.get("A").stage == 5
+    assert letters.pop("A").stage_name == "evidence"
+    assert len(letters) == 1
@@ -0,0 +1,52 @@
+import asyncio
+import csv
+import io
+import json
+
+from backend.core.export import ExportFilter, TicketExporter
+from backend.core.serialization import TicketJSONCache
+from backend.core.stage_state import StageStates
+from backend.core.ticket_store import TicketStore
+
+
+def make_store():
+    store = TicketStore()
+    for i, (status, category) in enumerate([("completed", "IAM"), ("in-progress", "IAM"), ("completed", "HR")]):
+        stages = StageStates()
+        stages.set(0, "completed", "fetched")
+        store[f"T{i}"] = {"id": f"T{i}", "status": status, "category": category, "stages": stages,
+                          "contacts": ["a@example.com", "b@example.com"], "logs": ["one", "two"]}
+    return store
+
+
+def collect(exporter, fmt, **kwargs):
+    async def run():
+        return b"".join([chunk async for chunk in exporter.stream(fmt, **kwargs)])
+    return asyncio.run(run())
+
+
+def test_ndjson_rows_carry_the_store_version():
+    store = make_store()
+    exporter = TicketExporter(store, TicketJSONCache(store).fragment, chunk_size=2)
+    rows = [json.loads(line) for line in collect(exporter, "ndjson").splitlines()]
+    assert [r["id"] for r in rows] == ["T0", "T1", "T2"]
+    assert [r["version"] for r in rows] == [store.ticket_version(r["id"]) for r in rows]
+    assert rows[0]["stages"][0]["message"] == "fetched"
+
+
+def test_filters_and_column_options_apply_to_csv():
+    exporter = TicketExporter(make_store(), chunk_size=1)
+    body = collect(exporter, "csv", matches=ExportFilter(status=["Completed"], category=["iam"]),
+                   include_logs=False)
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert [r["id"] for r in rows] == ["T0"]
+    assert rows[0]["stage1Message"] == "fetched"
+    assert rows[0]["contacts"] == "a@example.com; b@example.com"
+    assert "logs" not in rows[0]
+
+
+def test_ticket_ids_limit_the_export():
+    exporter = TicketExporter(make_store())
+    rows = collect(exporter, "ndjson", ticket_ids=["T2", "missing"], include_stages=False).splitlines()
+    assert [json.loads(r)["id"] for r in rows] == ["T2"]
+    assert "stages" not in json.loads(rows[0])
@@ -0,0 +1,26 @@
+import asyncio
+
+from backend.core.file_watcher import FileWatcher
+
+
+def test_polling_reports_changes_of_watched_files_only(tmp_path):
+    watched = tmp_path / "tickets.json"
+    other = tmp_path / "other.json"
+    watched.write_text("[]")
+    other.write_text("[]")
+    changes = []
+
+    async def on_change(path):
+        changes.append(path)
+
+    async def main():
+        watcher = FileWatcher([str(watched)], on_change, poll_interval=0.01, use_inotify=False)
+        task = asyncio.create_task(watcher.run())
+        await asyncio.sleep(0.05)
+        other.write_text("[1]")
+        watched.write_text("[1, 2]")
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+    asyncio.run(main())
+    assert changes == [str(watched.resolve())]
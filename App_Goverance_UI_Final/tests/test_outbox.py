@@ -0,0 +1,114 @@
+import asyncio
+from email import message_from_bytes
+from email.message import EmailMessage
+
+from backend.core.outbox import EmailOutbox, OutboxSpooler, message_id
+from backend.core.retry import RetryPolicy
+
+
+def email(to="owner@example.com", subject="Evidence"):
+    msg = EmailMessage()
+    msg["To"] = to
+    msg["Subject"] = subject
+    msg.set_content("body")
+    return msg
+
+
+def render(recipient, items):
+    return email(recipient, f"{len(items)} tickets")
+
+
+def test_enqueue_is_idempotent_per_ticket_and_kind(tmp_path):
+    outbox = EmailOutbox(str(tmp_path / "outbox.db"))
+    first = outbox.enqueue("T1", "evidence", email())
+    again = outbox.enqueue("T1", "evidence", email())
+    other = outbox.enqueue("T1", "closure", email())
+
+    assert first[1] is True
+    assert again == (first[0], False)
+    assert other[1] is True
+    assert outbox.describe()["counts"]["pending"] == 2
+
+
+def test_message_id_is_derived_from_ticket_and_kind(tmp_path):
+    ids = []
+    for name in ("a.db", "b.db"):
+        msg = email()
+        EmailOutbox(str(tmp_path / name)).enqueue("T1", "evidence", msg)
+        ids.append(msg["Message-ID"])
+    assert ids[0] == ids[1]
+    assert ids[0].endswith("@ticket-portal>")
+
+
+def test_claim_marks_rows_sending_and_expired_leases_are_reclaimed(tmp_path):
+    outbox = EmailOutbox(str(tmp_path / "outbox.db"), lease_seconds=0.0)
+    outbox.enqueue("T1", "evidence", email())
+    claimed = outbox.claim(10)
+    assert [row["ticket_id"] for row in claimed] == ["T1"]
+    assert outbox.get(claimed[0]["id"])["status"] == "sending"
+
+    # Lease of 0s: the row is claimable again as soon as it is "sending"
+    reclaimed = outbox.claim(10)
+    assert [row["id"] for row in reclaimed] == [claimed[0]["id"]]
+    assert reclaimed[0]["attempts"] == 2
+
+
+def test_failed_digest_is_reclaimed_with_the_same_digest_and_message_id(tmp_path):
+    outbox = EmailOutbox(str(tmp_path / "outbox.db"))
+    for ticket_id in ("T1", "T2", "T3"):
+        outbox.enqueue(ticket_id, "evidence", email(), digest_key="owner@example.com", item={"ticket": ticket_id})
+    attempts = []
+
+    def send(raw):
+        attempts.append(message_from_bytes(raw)["Message-ID"])
+        if len(attempts) == 1:
+            raise ConnectionError("smtp down")
+
+    spooler = OutboxSpooler(outbox, send, retry=RetryPolicy(max_attempts=3, base_delay=0.0, jitter=0.0),
+                            render_digest=render, digest_window=0.0)
+
+    async def deliver_once():
+        digest = outbox.claim_digests(1, window=0.0, max_items=10)[0]
+        await spooler._deliver_digest(digest)
+        return digest
+
+    first = asyncio.run(deliver_once())
+    second = asyncio.run(deliver_once())
+
+    assert first["digest_id"] == second["digest_id"]
+    assert sorted(r["id"] for r in first["rows"]) == sorted(r["id"] for r in second["rows"])
+    assert attempts == [message_id(f"digest-{first['digest_id']}")] * 2
+    assert outbox.describe()["counts"]["sent"] == 3
+
+
+def test_digest_waits_for_its_window(tmp_path):
+    outbox = EmailOutbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue("T1", "evidence", email(), digest_key="owner@example.com", item={})
+    assert outbox.claim_digests(1, window=60.0, max_items=10) == []
+    assert outbox.claim(10) == []  # digest rows are never sent on their own
+    assert len(outbox.claim_digests(1, window=60.0, max_items=1)) == 1
+
+
+def test_spooler_retries_then_marks_failed(tmp_path):
+    outbox = EmailOutbox(str(tmp_path / "outbox.db"))
+    row_id, _ = outbox.enqueue("T1", "evidence", email())
+    statuses = []
+
+    async def on_status(ticket_id, state):
+        statuses.append(state["status"])
+
+    def send(raw):
+        raise ConnectionError("smtp down")
+
+    spooler = OutboxSpooler(outbox, send, retry=RetryPolicy(max_attempts=2, base_delay=0.0, jitter=0.0),
+                            on_status=on_status)
+
+    async def run():
+        for _ in range(2):
+            await spooler._deliver(outbox.claim(1)[0])
+
+    asyncio.run(run())
+    assert statuses == ["retrying", "failed"]
+    assert outbox.get(row_id)["status"] == "failed"
+    assert outbox.requeue(row_id)
+    assert outbox.get(row_id)["status"] == "pending"
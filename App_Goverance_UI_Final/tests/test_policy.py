@@ -0,0 +1,47 @@
+import pytest
+
+from backend.core.policy import PolicyEngine
+
+OWNER_SPACE = {
+    "rules": [
+        {"name": "allowed-space", "field": "application_owner", "in": ["IAM-Space"]},
+        {"name": "demo-email", "field": "application_owner", "regex": "@example\\.com$", "ignore_case": True},
+    ],
+    "set": {"deliverableType": "Owner Verified"},
+}
+
+
+def test_rules_are_ored_and_set_applies_to_selected_tickets(make_ticket):
+    policy = PolicyEngine({"owner_space": OWNER_SPACE}).get("owner_space")
+    tickets = [make_ticket("A", "IAM-Space"), make_ticket("B", "Bob@Example.com"), make_ticket("C", "HR-Space"), make_ticket("D")]
+
+    selected = policy.select(tickets)
+
+    assert [t.ticket_id for t in selected] == ["A", "B"]
+    assert all(t.deliverableType == "Owner Verified" for t in selected)
+    assert tickets[2].deliverableType == ""
+    assert policy.describe()["unmatched"] == 2
+
+
+def test_default_category_policy_ignores_case(make_ticket):
+    policy = PolicyEngine().get("category")
+    assert policy.evaluate([make_ticket("A", category="iam"), make_ticket("B", category="HR")]) == [True, False]
+
+
+def test_reload_keeps_hit_counters_and_changes_the_fingerprint(make_ticket):
+    engine = PolicyEngine({"owner_space": OWNER_SPACE})
+    engine.get("owner_space").evaluate([make_ticket("A", "IAM-Space")])
+    before = engine.get("owner_space").fingerprint
+
+    engine.reload({"owner_space": {**OWNER_SPACE, "set": {}}})
+
+    assert engine.get("owner_space").hits["allowed-space"] == 1
+    assert engine.get("owner_space").fingerprint != before
+
+
+def test_invalid_config_leaves_current_policies_in_place():
+    engine = PolicyEngine({"owner_space": OWNER_SPACE})
+    current = engine.get("owner_space")
+    with pytest.raises(ValueError):
+        engine.reload({"owner_space": {"rules": [{"name": "broken", "field": "category"}]}})
+    assert engine.get("owner_space") is current
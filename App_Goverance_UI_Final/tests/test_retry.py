@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.core.retry import RetryPolicy, StageFailed, StageTimeout, run_with_retry
+
+
+def test_delay_doubles_and_is_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=0.0)
+    assert [policy.delay(a) for a in range(1, 5)] == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_stage_timeouts_override_the_default():
+    policy = RetryPolicy.from_config({"timeout_seconds": 10, "stage_timeouts": {"logger": 2}})
+    assert policy.timeout_for("logger") == 2
+    assert policy.timeout_for("sla") == 10
+
+
+def test_failures_are_retried_until_success():
+    calls = []
+    retries = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("down")
+        return "ok"
+
+    async def on_retry(attempt, error, delay):
+        retries.append((attempt, type(error).__name__))
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0, jitter=0.0)
+    assert asyncio.run(run_with_retry("stage", flaky, policy=policy, on_retry=on_retry)) == "ok"
+    assert retries == [(1, "ConnectionError"), (2, "ConnectionError")]
+
+
+def test_every_attempt_failing_raises_stage_failed():
+    def broken():
+        raise ValueError("bad")
+
+    policy = RetryPolicy(max_attempts=2, base_delay=0.0, jitter=0.0)
+    with pytest.raises(StageFailed) as info:
+        asyncio.run(run_with_retry("category", broken, policy=policy))
+    assert info.value.attempts == 2
+    assert isinstance(info.value.error, ValueError)
+
+
+def test_hung_calls_time_out():
+    policy = RetryPolicy(max_attempts=1, timeout=0.05)
+    with pytest.raises(StageFailed) as info:
+        asyncio.run(run_with_retry("logger", time.sleep, 0.5, policy=policy))
+    assert isinstance(info.value.error, StageTimeout)
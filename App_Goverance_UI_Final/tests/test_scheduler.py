@@ -0,0 +1,77 @@
+import asyncio
+
+from backend.core.scheduler import TicketScheduler, deadline_timestamp
+
+
+def test_naive_deadlines_are_read_as_utc():
+    assert deadline_timestamp("2026-01-01T00:00:00") == deadline_timestamp("2026-01-01T00:00:00+00:00")
+    assert deadline_timestamp("2026-01-01") == 1767225600.0
+    assert deadline_timestamp(None) == float("inf")
+    assert deadline_timestamp("not a date") == float("inf")
+
+
+def test_jobs_run_earliest_deadline_first_then_by_risk():
+    order = []
+
+    async def runner(job_id):
+        order.append(job_id)
+
+    async def main():
+        scheduler = TicketScheduler(runner, workers=1)
+        await scheduler.submit("late", "2026-03-01", "critical")
+        await scheduler.submit("low", "2026-01-01", "low")
+        await scheduler.submit("high", "2026-01-01", "high")
+        await scheduler.submit("none")
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+    asyncio.run(main())
+    assert order == ["high", "low", "late", "none"]
+
+
+def test_ticket_in_a_running_batch_waits_for_the_batch():
+    events = []
+
+    async def runner(job_id):
+        events.append(("start", job_id))
+        await asyncio.sleep(0.05)
+        events.append(("end", job_id))
+
+    async def main():
+        scheduler = TicketScheduler(runner, workers=4)
+        scheduler.start()
+        await scheduler.submit("batch-1", ticket_ids=["A", "B"])
+        await asyncio.sleep(0.01)
+        await scheduler.submit("A")
+        await scheduler.submit("C")
+        await asyncio.sleep(0.02)
+        assert scheduler.metrics()["blocked"] == 1
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+    asyncio.run(main())
+    assert events.index(("start", "A")) > events.index(("end", "batch-1"))
+    assert events.index(("start", "C")) < events.index(("end", "batch-1"))
+
+
+def test_resubmitting_a_running_job_reruns_it_after():
+    runs = []
+
+    async def runner(job_id):
+        runs.append(job_id)
+        await asyncio.sleep(0.02)
+
+    async def main():
+        scheduler = TicketScheduler(runner, workers=2)
+        scheduler.start()
+        await scheduler.submit("A")
+        await asyncio.sleep(0.005)
+        await scheduler.submit("A")
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        return scheduler.metrics()
+
+    metrics = asyncio.run(main())
+    assert runs == ["A", "A"]
+    assert metrics["completed"] == 2
@@ -0,0 +1,38 @@
+from backend.core.search_index import TicketSearchIndex, tokenize
+from backend.core.ticket_store import TicketStore
+
+
+def make_store():
+    store = TicketStore()
+    store["REQ001"] = {"id": "REQ001", "armId": "ARM-7788", "applicationName": "Finance Portal",
+                       "description": "Enable auto-provisioning for role XYZ"}
+    store["REQ002"] = {"id": "REQ002", "armId": "ARM-1234", "applicationName": "HR Portal",
+                       "description": "Finance review of access"}
+    return store
+
+
+def test_tokenize_splits_alphanumeric_runs():
+    assert tokenize("ARM-1234 Finance_Portal") == ["arm", "1234", "finance", "portal"]
+
+
+def test_terms_are_anded_and_prefixes_match():
+    index = TicketSearchIndex(make_store())
+    assert [t for t, _ in index.search("portal hr")] == ["REQ002"]
+    assert [t for t, _ in index.search("provision")] == ["REQ001"]
+    assert index.search("portal missing") == []
+
+
+def test_field_weights_rank_matches():
+    index = TicketSearchIndex(make_store())
+    # "finance" is the application name of REQ001 but only in REQ002's description
+    assert [t for t, _ in index.search("finance")] == ["REQ001", "REQ002"]
+
+
+def test_index_follows_store_changes():
+    store = make_store()
+    index = TicketSearchIndex(store)
+    store["REQ001"]["applicationName"] = "Payroll"
+    store.touch("REQ001")
+    del store["REQ002"]
+    assert [t for t, _ in index.search("payroll")] == ["REQ001"]
+    assert index.search("hr") == []
@@ -0,0 +1,58 @@
+import json
+
+from backend.core.serialization import TicketJSONCache, dumps, loads
+from backend.core.stage_state import StageStates
+from backend.core.ticket_store import TicketStore
+
+
+def make_store(count=3, **kwargs):
+    store = TicketStore(**kwargs)
+    for i in range(count):
+        store[f"T{i}"] = {"id": f"T{i}", "status": "not-started", "stages": StageStates()}
+    return store
+
+
+def test_fragment_is_refreshed_after_a_touch():
+    store = make_store()
+    cache = TicketJSONCache(store)
+    assert loads(cache.fragment("T0"))["status"] == "not-started"
+
+    store["T0"]["status"] = "completed"
+    store.touch("T0")
+
+    assert loads(cache.fragment("T0"))["status"] == "completed"
+
+
+def test_stage_states_serialize_as_the_frontend_list():
+    stages = StageStates()
+    stages.set(0, "completed", "done")
+    body = loads(dumps({"stages": stages}))
+    assert body["stages"][0] == {"id": 1, "name": "Ticket Fetching", "status": "completed", "message": "done"}
+    assert len(body["stages"]) == 8
+
+
+def test_changes_body_is_a_delta_above_the_tombstone_floor():
+    store = make_store()
+    cache = TicketJSONCache(store)
+    since = store.version
+    del store["T1"]
+
+    body = json.loads(cache.changes_body(since))
+
+    assert body["full"] is False
+    assert body["tickets"] == []
+    assert body["removed"] == ["T1"]
+    assert body["version"] == store.version
+
+
+def test_changes_body_is_a_full_snapshot_below_the_tombstone_floor():
+    store = make_store(count=12, max_tombstones=4)
+    cache = TicketJSONCache(store)
+    for i in range(8):
+        del store[f"T{i}"]
+
+    body = json.loads(cache.changes_body(0))
+
+    assert body["full"] is True
+    assert sorted(t["id"] for t in body["tickets"]) == sorted(store.keys())
+    assert body["removed"] == []
@@ -0,0 +1,67 @@
+import asyncio
+
+from backend.core.shared_state import LocalSharedState, SQLiteSharedState, create_shared_state
+from backend.core.ticket_store import TicketStore
+
+
+async def deliver(payload):
+    pass
+
+
+def test_workers_converge_on_the_same_tickets_and_versions(tmp_path):
+    async def main():
+        workers = []
+        for _ in range(2):
+            state = SQLiteSharedState(str(tmp_path / "shared.db"), socket_dir=str(tmp_path / "sockets"))
+            store = TicketStore()
+            state.attach(store, deliver)
+            workers.append((state, store))
+        (a, store_a), (b, store_b) = workers
+
+        store_a["A"] = {"id": "A", "status": "not-started"}
+        store_a["B"] = {"id": "B", "status": "not-started"}
+        store_a["A"]["status"] = "in-progress"
+        store_a.touch("A")
+        await a.flush()
+        b._pull()
+        del store_b["B"]
+        await b.flush()
+        a._pull()
+
+        for state, _ in workers:
+            await state.close()
+        return store_a, store_b
+
+    store_a, store_b = asyncio.run(main())
+    assert dict(store_a) == dict(store_b) == {"A": {"id": "A", "status": "in-progress"}}
+    assert store_a.version == store_b.version
+    assert store_a.ticket_version("A") == store_b.ticket_version("A")
+
+
+def test_changes_in_one_tick_are_journaled_once(tmp_path):
+    async def main():
+        state = SQLiteSharedState(str(tmp_path / "shared.db"), socket_dir=str(tmp_path / "sockets"))
+        store = TicketStore()
+        state.attach(store, deliver)
+        store["A"] = {"id": "A", "n": 0}
+        for n in range(1, 50):
+            store["A"]["n"] = n
+            store.touch("A")
+        await state.flush()
+        rows = state.conn.execute("SELECT COUNT(*) FROM tickets").fetchone()[0]
+        seq = state.conn.execute("SELECT seq FROM tickets WHERE id = 'A'").fetchone()[0]
+        await state.close()
+        return store, rows, seq
+
+    store, rows, seq = asyncio.run(main())
+    assert rows == 1
+    assert seq == 1
+    assert store["A"]["n"] == 49
+
+
+def test_config_selects_the_backend(tmp_path):
+    assert isinstance(create_shared_state({}), LocalSharedState)
+    state = create_shared_state({"backend": "sqlite", "path": "shared.db"}, base_dir=tmp_path)
+    assert isinstance(state, SQLiteSharedState)
+    assert state.db_path == str(tmp_path / "shared.db")
+    asyncio.run(state.close())
@@ -0,0 +1,56 @@
+from backend.agents.sla_prioritizer import sla_crossings, sla_risk_level
+from backend.core.sla_monitor import SLAMonitor
+from backend.core.ticket_store import TicketStore
+from datetime import datetime
+
+DAY = 86400.0
+DEADLINE = "2026-01-10T00:00:00+00:00"
+DEADLINE_TS = 1768003200.0
+
+
+def make_monitor(now):
+    clock = [now]
+    store = TicketStore()
+    return store, SLAMonitor(store, tick=60.0, clock=lambda: clock[0]), clock
+
+
+def test_crossings_and_risk_level_agree_on_naive_deadlines():
+    crossings = sla_crossings("2026-01-10")
+    assert [tier for _, tier in crossings] == ["Medium", "High", "Breached"]
+    assert crossings[-1][0] == DEADLINE_TS
+    assert sla_risk_level("2026-01-10", now=datetime(2026, 1, 8)) == "High"
+    assert sla_risk_level("2026-01-10", now=datetime(2026, 1, 5)) == "Medium"
+
+
+def test_crossings_fire_as_deadlines_approach():
+    store, monitor, clock = make_monitor(DEADLINE_TS - 10 * DAY)
+    store["A"] = {"id": "A", "status": "in-progress", "slaDeadline": DEADLINE}
+    assert monitor.advance() == []
+
+    assert monitor.advance(DEADLINE_TS - 5 * DAY) == [("A", "Medium")]
+    assert monitor.advance(DEADLINE_TS - 2 * DAY) == [("A", "High")]
+    assert monitor.advance(DEADLINE_TS + 60) == [("A", "Breached")]
+    assert monitor.advance(DEADLINE_TS + DAY) == []
+
+
+def test_ticket_registered_past_crossings_reports_its_current_tier():
+    store, monitor, _ = make_monitor(DEADLINE_TS - 2 * DAY)
+    store["inside"] = {"id": "inside", "status": "in-progress", "slaDeadline": DEADLINE}
+    store["past"] = {"id": "past", "status": "in-progress", "slaDeadline": "2025-01-01T00:00:00+00:00"}
+
+    crossed = monitor.advance()
+
+    assert ("inside", "High") in crossed
+    assert ("past", "High") in crossed and ("past", "Breached") in crossed
+    assert ("inside", "Medium") not in crossed
+
+
+def test_completed_and_removed_tickets_stop_being_tracked():
+    store, monitor, _ = make_monitor(DEADLINE_TS - 10 * DAY)
+    store["A"] = {"id": "A", "status": "in-progress", "slaDeadline": DEADLINE}
+    store["B"] = {"id": "B", "status": "in-progress", "slaDeadline": DEADLINE}
+    store["A"]["status"] = "completed"
+    store.touch("A")
+    del store["B"]
+    assert monitor.advance(DEADLINE_TS + DAY) == []
+    assert monitor.describe()["tracked"] == 0
@@ -0,0 +1,35 @@
+from backend.core.stage_cache import MISS, RunSummary, StageCache, chain_key, content_hash
+
+
+def test_cache_hits_only_for_the_same_input_key():
+    cache = StageCache()
+    key = chain_key(content_hash({"ticket": "A"}), "sla")
+    cache.put("A", "sla", key, "High")
+
+    assert cache.get("A", "sla", key) == "High"
+    assert cache.get("A", "sla", chain_key(content_hash({"ticket": "A2"}), "sla")) is MISS
+    assert cache.get("B", "sla", key) is MISS
+
+
+def test_chain_key_depends_on_every_part():
+    base = content_hash({"ticket": "A"})
+    assert chain_key(base, "ownership", "v1") != chain_key(base, "ownership", "v2")
+    assert chain_key(base, "ownership") != chain_key(base, "sla")
+
+
+def test_retain_drops_tickets_the_source_no_longer_returns():
+    cache = StageCache()
+    cache.put("A", "sla", "k", 1)
+    cache.put("B", "sla", "k", 1)
+    cache.retain(["A"])
+    assert len(cache) == 1
+
+
+def test_run_summary_counts_skipped_tickets():
+    summary = RunSummary(3)
+    summary.record("category", skipped=1, ran=["A", "B"])
+    summary.record("sla", skipped=2, ran=["A"])
+    assert summary.as_dict() == {
+        "tickets": 3, "skippedTickets": 1, "skippedStages": 3,
+        "stages": {"category": {"run": 2, "skipped": 1}, "sla": {"run": 1, "skipped": 2}},
+    }
@@ -0,0 +1,31 @@
+from backend.core.stage_state import StageStates, compact_ticket
+
+
+def test_round_trip_through_the_frontend_json():
+    stages = StageStates()
+    stages.set(0, "completed", "✅ Fetched")
+    stages.set(1, "in-progress")
+
+    restored = StageStates.from_json(stages.to_json())
+
+    assert restored == stages
+    assert restored.status(1) == "in-progress"
+    assert restored.message(0) == "✅ Fetched"
+    assert restored.message(1) == ""
+
+
+def test_messages_are_only_allocated_when_needed():
+    stages = StageStates()
+    stages.set(2, "error")
+    assert stages.messages is None
+    stages.set(2, "error", "boom")
+    stages.set(2, "completed")
+    assert stages.message(2) == ""
+
+
+def test_compact_ticket_converts_stage_lists_in_place():
+    ticket = {"id": "A", "stages": [{"status": "completed", "message": "ok"}]}
+    compact_ticket(ticket)
+    assert isinstance(ticket["stages"], StageStates)
+    assert ticket["stages"].status(0) == "completed"
+    assert ticket["stages"].status(7) == "pending"
@@ -0,0 +1,58 @@
+from backend.core.subscriptions import SubscriptionIndex, normalize_topic, ticket_topics
+from backend.core.ticket_store import TicketStore
+
+
+def iam_ticket(ticket_id, **fields):
+    return {"id": ticket_id, "status": "in-progress", "category": "IAM", "lobOwner": "Finance LOB", **fields}
+
+
+def test_topics_are_normalized_except_ticket_ids():
+    assert normalize_topic(" Category:IAM ") == "category:iam"
+    assert normalize_topic("ticket:REQ001") == "ticket:REQ001"
+    assert normalize_topic("ALL") == "all"
+
+
+def test_ticket_topics_include_waiting_and_approver():
+    topics = ticket_topics(iam_ticket("A", waitingForReview=True))
+    assert {"all", "ticket:A", "category:iam", "lob:finance lob", "waiting:review", "waiting:any",
+            "approver:finance lob"} <= topics
+
+
+def test_update_reaches_subscribers_of_previous_and_current_topics():
+    index = SubscriptionIndex()
+    index.subscribe("reviewer", ["waiting:review"])
+    index.subscribe("other", ["category:hr"])
+    assert index.route({"A": iam_ticket("A", waitingForReview=True)}) == {"reviewer": ["A"]}
+
+    # The ticket leaves the review checkpoint: the reviewer still hears about it
+    assert index.route({"A": iam_ticket("A")}) == {"reviewer": ["A"]}
+    assert index.route({"A": iam_ticket("A")}) == {}
+
+
+def test_removal_of_a_never_broadcast_ticket_reaches_all_ticket_and_last_topics():
+    store = TicketStore()
+    store["A"] = iam_ticket("A")
+    index = SubscriptionIndex(store)
+    index.subscribe("everything", ["all"])
+    index.subscribe("iam", ["category:iam"])
+    index.subscribe("watcher", ["ticket:A"])
+    index.subscribe("hr", ["category:hr"])
+
+    del store["A"]
+    routes = index.route({"A": None})
+
+    assert set(routes) == {"everything", "iam", "watcher"}
+    assert all(ids == ["A"] for ids in routes.values())
+
+
+def test_removal_without_a_store_still_reaches_all_subscribers():
+    index = SubscriptionIndex()
+    index.subscribe("everything", ["all"])
+    assert index.route({"A": None}) == {"everything": ["A"]}
+
+
+def test_remove_client_drops_its_topics():
+    index = SubscriptionIndex()
+    index.subscribe("c", ["all", "stats"])
+    index.remove("c")
+    assert index.topic_counts() == {}
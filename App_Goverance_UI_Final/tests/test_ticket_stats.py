@@ -0,0 +1,55 @@
+from backend.core.ticket_stats import TicketStats
+from backend.core.ticket_store import TicketStore
+
+DEADLINE = "2025-11-20T00:00:00+00:00"
+DEADLINE_TS = 1763596800.0
+
+
+def make_stats(now=DEADLINE_TS - 100):
+    clock = [now]
+    store = TicketStore()
+    stats = TicketStats(store, clock=lambda: clock[0])
+    return store, stats, clock
+
+
+def test_completion_after_the_deadline_counts_as_breached():
+    store, stats, _ = make_stats()
+    store["late"] = {"id": "late", "status": "completed", "slaDeadline": DEADLINE,
+                     "completedAt": "2025-11-21T09:00:00+00:00"}
+    store["on-time"] = {"id": "on-time", "status": "completed", "slaDeadline": DEADLINE,
+                        "completedAt": "2025-11-19T09:00:00+00:00"}
+    store["no-deadline"] = {"id": "no-deadline", "status": "completed", "completedAt": "2025-11-19T09:00:00+00:00"}
+
+    assert stats.snapshot()["sla"] == {"breached": 1, "met": 2}
+
+
+def test_naive_deadlines_are_utc():
+    store, stats, _ = make_stats()
+    store["A"] = {"id": "A", "status": "completed", "slaDeadline": "2025-11-20",
+                  "completedAt": "2025-11-19T23:59:00+00:00"}
+    assert stats.snapshot()["sla"] == {"met": 1}
+
+
+def test_open_ticket_moves_to_breached_when_its_deadline_passes():
+    store, stats, clock = make_stats()
+    store["A"] = {"id": "A", "status": "in-progress", "slaDeadline": DEADLINE}
+    assert stats.snapshot()["sla"] == {"onTrack": 1}
+
+    clock[0] = DEADLINE_TS + 1
+    assert stats.advance() == ["A"]
+    assert stats.snapshot()["sla"] == {"breached": 1}
+
+
+def test_counters_follow_changes_and_removals():
+    store, stats, _ = make_stats()
+    store["A"] = {"id": "A", "status": "not-started", "category": "IAM", "waitingForReview": True}
+    store["A"]["status"] = "in-progress"
+    store.touch("A")
+    snapshot = stats.snapshot()
+    assert snapshot["byStatus"] == {"in-progress": 1}
+    assert snapshot["checkpoints"]["review"] == 1
+
+    del store["A"]
+    snapshot = stats.snapshot()
+    assert snapshot["total"] == 0
+    assert snapshot["byStatus"] == {}
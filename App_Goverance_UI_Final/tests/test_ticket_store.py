@@ -0,0 +1,59 @@
+from backend.core.ticket_store import TicketStore
+
+
+def ticket(ticket_id, **fields):
+    return {"id": ticket_id, **fields}
+
+
+def test_changed_since_reports_changes_after_a_version_oldest_first():
+    store = TicketStore()
+    store["A"] = ticket("A")
+    store["B"] = ticket("B")
+    since = store.version
+    store["C"] = ticket("C")
+    store["A"]["status"] = "in-progress"
+    store.touch("A")
+    del store["B"]
+
+    changed, removed = store.changed_since(since)
+
+    assert changed == ["C", "A"]
+    assert removed == ["B"]
+    assert store.changed_since(store.version) == ([], [])
+
+
+def test_readding_a_removed_ticket_clears_its_tombstone():
+    store = TicketStore()
+    store["A"] = ticket("A")
+    del store["A"]
+    store["A"] = ticket("A")
+
+    assert store.changed_since(0) == (["A"], [])
+
+
+def test_listeners_see_inserts_touches_and_removals():
+    store = TicketStore()
+    seen = []
+    store.add_listener(lambda ticket_id, t: seen.append((ticket_id, t is None)))
+    store["A"] = ticket("A")
+    store.touch("A")
+    del store["A"]
+
+    assert seen == [("A", False), ("A", False), ("A", True)]
+
+
+def test_tombstones_beyond_the_limit_raise_the_floor():
+    store = TicketStore(max_tombstones=8)
+    for i in range(20):
+        store[str(i)] = ticket(str(i))
+    for i in range(12):
+        del store[str(i)]
+
+    assert len(store._removed) <= 8
+    assert store.tombstone_floor > 0
+    assert not store.complete_since(0)
+    assert store.complete_since(store.tombstone_floor)
+    # Every removal after the floor is still reported
+    _, removed = store.changed_since(store.tombstone_floor)
+    assert removed == [t for t in map(str, range(12)) if store._removed.get(t, 0) > store.tombstone_floor]
+    assert removed[-1] == "11"
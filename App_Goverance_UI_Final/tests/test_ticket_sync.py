@@ -0,0 +1,44 @@
+import json
+
+from backend.agents.ticket_fetcher import TicketFetcherAgent, fetch_all_tickets
+from backend.core.ticket_sync import TicketSync, record_fingerprint
+
+
+def record(ticket_id, **fields):
+    return {"ticket_id": ticket_id, "jira_story": "J-1", "ait_number": "AIT-1", "deliverableType": "",
+            "category": "IAM", "risk_level": "Low", "sla_deadline": "2026-01-01", "created_on": "2025-12-01",
+            "description": "", "arm_id": "ARM-1", "application_name": "App", "application_owner": "Owner",
+            "lob_owner": "LOB", "ait_owner": "Owner", "contacts": [], **fields}
+
+
+def make_sync(tmp_path, records):
+    path = tmp_path / "tickets.json"
+    path.write_text(json.dumps(records))
+    fetcher = TicketFetcherAgent(data_file=str(path))
+    token = fetcher.change_token()
+    sync = TicketSync(fetcher)
+    sync.prime(fetch_all_tickets(str(path)), token)
+    return sync, path
+
+
+def test_unchanged_source_is_not_read_after_prime(tmp_path, monkeypatch):
+    sync, _ = make_sync(tmp_path, [record("A")])
+    monkeypatch.setattr("builtins.open", lambda *a, **k: (_ for _ in ()).throw(AssertionError("source re-read")))
+    assert not sync.poll()
+
+
+def test_poll_yields_new_changed_and_deleted_tickets(tmp_path):
+    sync, path = make_sync(tmp_path, [record("A"), record("B"), record("C")])
+    path.write_text(json.dumps([record("A", description="edited"), record("C"), record("D")]))
+
+    delta = sync.poll()
+
+    assert [t.ticket_id for t in delta.new] == ["D"]
+    assert [t.ticket_id for t in delta.changed] == ["A"]
+    assert delta.deleted == ["B"]
+    assert not sync.poll()
+
+
+def test_fingerprint_ignores_fields_outside_the_ticket_model():
+    assert record_fingerprint(record("A")) == record_fingerprint({**record("A"), "extra": 1})
+    assert record_fingerprint(record("A")) != record_fingerprint(record("A", description="x"))
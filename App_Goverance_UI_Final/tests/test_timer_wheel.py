@@ -0,0 +1,39 @@
+from backend.core.timer_wheel import TimerWheel
+
+
+def test_timers_fire_in_due_order_once():
+    wheel = TimerWheel(0, tick=1.0, slots=8, levels=2)
+    wheel.schedule("b", 5, "B")
+    wheel.schedule("a", 3, "A")
+    assert wheel.advance(2) == []
+    assert wheel.advance(10) == [("a", "A"), ("b", "B")]
+    assert wheel.advance(20) == []
+    assert len(wheel) == 0
+
+
+def test_far_timers_cascade_down_and_overflow_is_replaced():
+    wheel = TimerWheel(0, tick=1.0, slots=4, levels=2)  # levels cover 16 ticks
+    wheel.schedule("near", 10)
+    wheel.schedule("far", 100)
+    fired = []
+    for now in range(1, 101):
+        fired += [(now, key) for key, _ in wheel.advance(now)]
+    assert fired == [(10, "near"), (100, "far")]
+    assert wheel.cascaded > 0
+
+
+def test_reschedule_and_cancel():
+    wheel = TimerWheel(0, tick=1.0)
+    wheel.schedule("a", 5)
+    wheel.schedule("a", 8)
+    assert wheel.when("a") == 8
+    assert wheel.advance(6) == []
+    assert wheel.cancel("a")
+    assert not wheel.cancel("a")
+    assert wheel.advance(10) == []
+
+
+def test_timer_already_due_fires_on_next_advance():
+    wheel = TimerWheel(100, tick=1.0)
+    wheel.schedule("past", 50, "P")
+    assert wheel.advance(100) == [("past", "P")]